@@ -7,38 +7,73 @@ macOS applications such as Contacts, Notes, Mail, Messages, Reminders,
 Calendar, and Maps using FastMCP.
 """
 
+import asyncio
+import functools
+import importlib
+from contextlib import asynccontextmanager
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
-from datetime import datetime, timedelta
 
 from mcp.server.fastmcp import FastMCP
-from utils.contacts import ContactsModule
-from utils.notes import NotesModule
-from utils.message import MessageModule
-from utils.mail import MailModule
-from utils.reminders import RemindersModule
-from utils.calendar import CalendarModule
-from utils.maps import MapsModule
+from utils.applescript import prewarm_applescript, batch_compiled_scripts, register_script, AppleScriptError
 
 VERSION = "0.0.2"
 
+@asynccontextmanager
+async def lifespan(server: FastMCP):
+    """Start the osascript interpreters in the background while the server starts"""
+    warmup = asyncio.create_task(prewarm_applescript())
+    try:
+        yield
+    finally:
+        warmup.cancel()
+
 # Initialize FastMCP server
 mcp = FastMCP(
     "Apple MCP",
     dependencies=[
         "pydantic>=2.0.0",
         "httpx>=0.24.0",
-    ]
+    ],
+    lifespan=lifespan
 )
 
-# Initialize utility modules
-contacts_module = ContactsModule()
-notes_module = NotesModule()
-message_module = MessageModule()
-mail_module = MailModule()
-reminders_module = RemindersModule()
-calendar_module = CalendarModule()
-maps_module = MapsModule()
+# Utility modules are imported and created on first use, so a session only
+# pays for the applications (and frameworks such as EventKit) it touches
+@functools.cache
+def _contacts():
+    from utils.contacts import ContactsModule
+    return ContactsModule()
+
+@functools.cache
+def _notes():
+    from utils.notes import NotesModule
+    return NotesModule()
+
+@functools.cache
+def _messages():
+    from utils.message import MessageModule
+    return MessageModule()
+
+@functools.cache
+def _mail():
+    from utils.mail import MailModule
+    return MailModule()
+
+@functools.cache
+def _reminders():
+    from utils.reminders import RemindersModule
+    return RemindersModule()
+
+@functools.cache
+def _calendar():
+    from utils.calendar import CalendarModule
+    return CalendarModule()
+
+@functools.cache
+def _maps():
+    from utils.maps import MapsModule
+    return MapsModule()
 
 # Models for request/response types
 class Contact(BaseModel):
@@ -81,45 +116,86 @@ class Location(BaseModel):
     name: str
     address: str
 
+# Applications reported by check_app_access: the module defining the probe
+# script, the name the script is registered under, the module factory and
+# the name of the module's access check
+_ACCESS_CHECKS = {
+    "Messages": ("utils.message", "messages.check_access", _messages, "check_messages_access"),
+    "Notes": ("utils.notes", "notes.check_access", _notes, "check_notes_access"),
+    "Reminders": ("utils.reminders", "reminders.check_access", _reminders, "check_reminders_access"),
+}
+
+# Access Tools
+@mcp.tool()
+async def check_app_access() -> Dict[str, bool]:
+    """Check whether Messages, Notes and Reminders can be automated"""
+    access = {}
+    pending = []
+    for app, (module_name, script_name, factory, check_name) in _ACCESS_CHECKS.items():
+        # Modules that were not used yet are not created just for this check;
+        # their probe scripts are registered the same way the modules would
+        module = factory() if factory.cache_info().currsize else None
+        if module is not None and module.access_confirmed:
+            access[app] = True
+            continue
+        if module is None:
+            register_script(script_name, importlib.import_module(module_name).CHECK_ACCESS_SCRIPT)
+        pending.append((app, script_name, module, check_name))
+
+    # Applications not yet confirmed are probed together in one osascript call
+    if pending:
+        try:
+            results = await batch_compiled_scripts([script_name for _, script_name, _, _ in pending])
+        except AppleScriptError:
+            results = [None] * len(pending)
+        for (app, _, module, check_name), result in zip(pending, results):
+            granted = isinstance(result, str) and result.strip().lower() == "true"
+            if module is not None:
+                granted = await getattr(module, check_name)(probe_result=granted)
+            access[app] = granted
+
+    return {app: access[app] for app in _ACCESS_CHECKS}
+
 # Contacts Tools
 @mcp.tool()
 async def find_contact(name: Optional[str] = None) -> List[Contact]:
     """Search for contacts by name. If no name is provided, returns all contacts."""
     if name:
-        phones = await contacts_module.find_number(name)
-        return [Contact(name=name, phones=phones)]
+        phones = await _contacts().find_number(name)
+        return [Contact.model_construct(name=name, phones=phones)]
     else:
-        contacts_dict = await contacts_module.get_all_numbers()
-        return [Contact(name=name, phones=phones) for name, phones in contacts_dict.items()]
+        contacts_dict = await _contacts().get_all_numbers()
+        # Rows come from our own modules, so skip re-validating them
+        return [Contact.model_construct(name=name, phones=phones) for name, phones in contacts_dict.items()]
 
 # Notes Tools
 @mcp.tool()
 async def create_note(note: Note) -> str:
     """Create a new note in Apple Notes"""
-    return await notes_module.create_note(note.title, note.content, note.folder)
+    return await _notes().create_note(note.title, note.content, note.folder)
 
 @mcp.tool()
 async def search_notes(query: str) -> List[Note]:
     """Search for notes containing the given text"""
-    notes = await notes_module.search_notes(query)
-    return [Note(title=note['title'], content=note['content']) for note in notes]
+    notes = await _notes().search_notes(query)
+    return [Note.model_construct(title=note['title'], content=note['content']) for note in notes]
 
 # Messages Tools
 @mcp.tool()
 async def send_message(message: Message) -> str:
     """Send an iMessage"""
-    return await message_module.send_message(message.to, message.content, message.scheduled_time)
+    return await _messages().send_message(message.to, message.content, message.scheduled_time)
 
 @mcp.tool()
 async def read_messages(phone_number: str, limit: int = 10) -> List[Dict[str, Any]]:
     """Read recent messages from a specific contact"""
-    return await message_module.read_messages(phone_number, limit)
+    return await _messages().read_messages(phone_number, limit)
 
 # Mail Tools
 @mcp.tool()
 async def send_email(email: Email) -> str:
     """Send an email using Apple Mail"""
-    return await mail_module.send_email(
+    return await _mail().send_email(
         to=email.to,
         subject=email.subject,
         body=email.body,
@@ -130,13 +206,18 @@ async def send_email(email: Email) -> str:
 @mcp.tool()
 async def search_emails(query: str, limit: int = 10) -> List[Dict[str, Any]]:
     """Search emails containing the given text"""
-    return await mail_module.search_emails(query, limit)
+    return await _mail().search_mails(query, limit)
+
+@mcp.tool()
+async def get_email_body(message_id: str, account: Optional[str] = None, mailbox: Optional[str] = None) -> Optional[str]:
+    """Get the body of an email listed by search_emails, using its id, account and mailbox"""
+    return await _mail().get_mail_body(message_id, account, mailbox)
 
 # Reminders Tools
 @mcp.tool()
 async def create_reminder(reminder: Reminder) -> str:
     """Create a new reminder"""
-    return await reminders_module.create_reminder(
+    return await _reminders().create_reminder(
         name=reminder.title,
         notes=reminder.notes,
         due_date=reminder.due_date,
@@ -146,33 +227,43 @@ async def create_reminder(reminder: Reminder) -> str:
 @mcp.tool()
 async def list_reminder_lists() -> List[Dict[str, Any]]:
     """Get all reminder lists with their reminder counts"""
-    return await reminders_module.get_all_lists()
+    return await _reminders().get_all_lists()
 
 @mcp.tool()
 async def list_reminders(limit: int = 50, list_name: Optional[str] = None, include_completed: bool = False) -> List[Dict[str, Any]]:
     """Get reminders. By default returns incomplete reminders only (faster with large lists)."""
-    return await reminders_module.get_all_reminders(limit=limit, list_name=list_name, include_completed=include_completed)
+    return await _reminders().get_all_reminders(limit=limit, list_name=list_name, include_completed=include_completed)
 
 @mcp.tool()
 async def search_reminders(query: str) -> List[Dict[str, Any]]:
     """Search for reminders containing the given text in name or notes"""
-    return await reminders_module.search_reminders(query)
+    return await _reminders().search_reminders(query)
 
 @mcp.tool()
 async def get_reminder_stats(list_name: Optional[str] = None) -> Dict[str, Any]:
     """Get count of completed vs incomplete reminders in a list"""
-    return await reminders_module.get_completed_count(list_name)
+    return await _reminders().get_completed_count(list_name)
+
+@mcp.tool()
+async def get_all_reminder_stats() -> List[Dict[str, Any]]:
+    """Get count of completed vs incomplete reminders for every list"""
+    return await _reminders().get_stats_for_all_lists()
+
+@mcp.tool()
+async def reminders_overview(limit: int = 10) -> Dict[str, Any]:
+    """Get all reminder lists with their counts and the first incomplete reminders of the default list, in one call"""
+    return await _reminders().snapshot(limit)
 
 @mcp.tool()
 async def delete_completed_reminders(list_name: Optional[str] = None, batch_size: int = 10) -> Dict[str, Any]:
     """Delete completed reminders in batches. Use repeatedly to clear large backlogs."""
-    return await reminders_module.delete_completed_reminders(list_name, batch_size)
+    return await _reminders().delete_completed_reminders(list_name, batch_size)
 
 # Calendar Tools
 @mcp.tool()
 async def create_event(event: CalendarEvent) -> str:
     """Create a new calendar event"""
-    return await calendar_module.create_event(
+    return await _calendar().create_event(
         title=event.title,
         start_date=event.start_date,
         end_date=event.end_date,
@@ -185,24 +276,19 @@ async def create_event(event: CalendarEvent) -> str:
 @mcp.tool()
 async def search_events(query: str, from_date: Optional[str] = None, to_date: Optional[str] = None) -> List[Dict[str, Any]]:
     """Search for calendar events"""
-    if not from_date:
-        from_date = datetime.now().strftime("%Y-%m-%d")
-    if not to_date:
-        to_date = (datetime.now().replace(hour=23, minute=59, second=59) + timedelta(days=7)).strftime("%Y-%m-%d")
-    
-    return await calendar_module.search_events(query, from_date, to_date)
+    return await _calendar().search_events(query, from_date=from_date, to_date=to_date)
 
 # Maps Tools
 @mcp.tool()
 async def search_locations(query: str, limit: int = 5) -> List[Location]:
     """Search for locations in Apple Maps"""
-    locations = await maps_module.search_locations(query, limit)
-    return [Location(name=loc['name'], address=loc['address']) for loc in locations]
+    result = await _maps().search_locations(query, limit)
+    return [Location.model_construct(name=loc['name'], address=loc['address']) for loc in result["locations"]]
 
 @mcp.tool()
 async def get_directions(from_address: str, to_address: str, transport_type: str = "driving") -> str:
     """Get directions between two locations"""
-    return await maps_module.get_directions(from_address, to_address, transport_type)
+    return await _maps().get_directions(from_address, to_address, transport_type)
 
 if __name__ == "__main__":
     mcp.run()
\ No newline at end of file
@@ -13,7 +13,15 @@ from utils.applescript import (
     escape_string,
     format_applescript_value,
     configure_logging,
-    log_execution_time
+    log_execution_time,
+    AppleScriptWorker,
+    AppleScriptPool,
+    AppleScriptError,
+    batch_applescript,
+    run_record_script,
+    applescript_call,
+    _ListItemSplitter,
+    _clean_list_item
 )
 
 @pytest_asyncio.fixture(scope="module")
@@ -43,6 +51,19 @@ def test_parse_applescript_list():
     
     # Mixed list
     assert parse_applescript_list('{1, "two", 3}') == ['1', 'two', '3']
+    
+    # Escapes inside quoted items are undone
+    assert parse_applescript_list('{"say \\"hi\\"", "C:\\\\dir"}') == ['say "hi"', 'C:\\dir']
+    
+    # Commas inside quotes and nested records do not split items
+    assert parse_applescript_list('{"a, b", "c"}') == ['a, b', 'c']
+    records = parse_applescript_list('{{name:"Ann", phones:{"1", "2"}}, {name:"Bo", phones:{}}}')
+    assert records == ['{name:"Ann", phones:{"1", "2"}}', '{name:"Bo", phones:{}}']
+    
+    # Deeper nesting and unterminated strings are split on top-level commas
+    assert parse_applescript_list('{{1, {2, {3}}}, "x"}') == ['{1, {2, {3}}}', 'x']
+    assert parse_applescript_list('{"a", "b, c}') == ['a', '"b, c']
+    assert parse_applescript_list('{"a", , 3,}\n') == ['a', '', '3']
 
 def test_parse_applescript_record():
     """Test parsing AppleScript records with logging."""
@@ -61,6 +82,41 @@ def test_parse_applescript_record():
     # Our current implementation just keeps the string representation of nested records
     assert isinstance(record["person"], str)
     assert "name:=" in record["person"]  # Just checking it contains the expected string
+    
+    # Plain osascript record syntax with nested lists
+    record = parse_applescript_record('{name:"Smith, Ann", phones:{"555-1234", "555-9876"}}')
+    assert record == {"name": "Smith, Ann", "phones": ["555-1234", "555-9876"]}
+    
+    # Values nested deeper than the field pattern handles fall back to the full scan
+    record = parse_applescript_record('{a:{1, {2, {3}}}, b:"x, \\"y\\""}')
+    assert record == {"a": ["1", "{2, {3}}"], "b": 'x, "y"'}
+    
+    # Escaped quotes and backslashes in strings are undone
+    record = parse_applescript_record('{path:"C:\\\\dir", note:"say \\"hi\\""}')
+    assert record == {"path": "C:\\dir", "note": 'say "hi"'}
+    
+    # Keys of separately parsed records are the same interned string
+    first = parse_applescript_record('{name:"A", phones:{}}')
+    second = parse_applescript_record('{name:"B", phones:{}}')
+    assert next(iter(first)) is next(iter(second))
+
+def test_list_item_splitter():
+    """Test splitting a list into items when it arrives in arbitrary chunks."""
+    text = '{{name:"Smith, \\"Ann\\"", phones:{"555-1234", "555-9876"}}, "a, b", 42}\n'
+    expected = ['{name:"Smith, \\"Ann\\"", phones:{"555-1234", "555-9876"}}', '"a, b"', '42']
+    
+    for size in (1, 2, 7, len(text)):
+        splitter = _ListItemSplitter()
+        items = []
+        for start in range(0, len(text), size):
+            items.extend(splitter.feed(text[start:start + size]))
+        assert [item.strip() for item in items] == expected
+    
+    # Items keep their source form until cleaned, which removes quotes and escapes
+    assert _clean_list_item('"Smith, \\"Ann\\""') == 'Smith, "Ann"'
+    assert _clean_list_item('"a\\\\b"') == 'a\\b'
+    
+    assert _ListItemSplitter().feed("{}\n") == []
 
 def test_parse_value():
     """Test value parsing with logging."""
@@ -70,6 +126,12 @@ def test_parse_value():
     # Numeric values
     assert parse_value("42") == 42
     assert parse_value("3.14") == 3.14
+    assert parse_value("-7") == -7
+    assert parse_value("1.0E+6") == 1000000.0
+    
+    # Text that float() would accept is still text
+    assert parse_value("nan") == "nan"
+    assert parse_value("12 Main St") == "12 Main St"
     
     # Boolean values
     assert parse_value("true") is True
@@ -84,7 +146,9 @@ def test_parse_value():
 def test_escape_string():
     """Test string escaping."""
     assert escape_string('test"with"quotes') == 'test\\"with\\"quotes'
-    assert escape_string("test'with'quotes") == "test\\'with\\'quotes"
+    assert escape_string("test'with'quotes") == "test'with'quotes"
+    assert escape_string('C:\\dir\\') == 'C:\\\\dir\\\\'
+    assert format_applescript_value('say \\"hi\\"') == '"say \\\\\\"hi\\\\\\""'
 
 def test_format_applescript_value():
     """Test formatting Python values for AppleScript."""
@@ -102,6 +166,9 @@ def test_format_applescript_value():
     # String value
     assert format_applescript_value("Hello") == '"Hello"'
     
+    # Quotes, backslashes and control characters are escaped; apostrophes are left alone
+    assert format_applescript_value('O\'Brien "a\\b"\n\t\r') == '"O\'Brien \\"a\\\\b\\"\\n\\t\\r"'
+    
     # List value
     assert format_applescript_value([1, 2, 3]) == "{1, 2, 3}"
     
@@ -139,4 +206,322 @@ async def test_run_applescript_async_mock(monkeypatch):
     
     # Run the function
     result = await run_applescript_async('tell application "System Events" to return "hello"')
-    assert result == "test output"
\ No newline at end of file
+    assert result == "test output"
+
+class FakeInteractiveProcess:
+    """Minimal stand-in for an ``osascript -i`` process."""
+
+    def __init__(self, result, crash=False, hang=False, dead=False):
+        self.result = result
+        self.crash = crash
+        self.hang = hang
+        self.dead = dead
+        self.pid = 0
+        self.returncode = None
+        self.requests = []
+        self._lines = asyncio.Queue()
+        self.stdin = self
+        self.stdout = self
+
+    def write(self, data):
+        if self.dead and b"run script" in data:
+            # The interpreter exited before the script could be sent
+            self.returncode = 1
+            raise BrokenPipeError("pipe closed")
+        for line in data.decode().splitlines():
+            self.requests.append(line)
+            if line.startswith("run script"):
+                if self.hang:
+                    # Never answer this script or its end marker
+                    return
+                if self.crash:
+                    self.returncode = 1
+                    self._lines.put_nowait(b"")
+                    return
+                self._lines.put_nowait(f"=> {self.result}\n".encode())
+            else:
+                self._lines.put_nowait(f">> => {line.strip(chr(34))}\n".encode())
+
+    async def drain(self):
+        pass
+
+    async def readline(self):
+        return await self._lines.get()
+
+
+@pytest.mark.asyncio
+async def test_applescript_worker_reuses_process(monkeypatch):
+    """Test that the persistent worker frames results and reuses its process."""
+    spawned = []
+
+    async def mock_create_subprocess_exec(*args, **kwargs):
+        process = FakeInteractiveProcess("worker output")
+        spawned.append((args, process))
+        return process
+
+    monkeypatch.setattr(asyncio, "create_subprocess_exec", mock_create_subprocess_exec)
+
+    worker = AppleScriptWorker()
+    assert await worker.run('return "one"') == "worker output"
+    assert await worker.run('return "two"') == "worker output"
+
+    assert len(spawned) == 1
+    assert spawned[0][0] == ("osascript", "-i")
+    worker._process = None
+
+
+@pytest.mark.asyncio
+async def test_applescript_pool_prewarm(monkeypatch):
+    """Test that prewarming starts min_idle interpreters before any script runs."""
+    spawned = []
+
+    async def mock_create_subprocess_exec(*args, **kwargs):
+        process = FakeInteractiveProcess("")
+        spawned.append(process)
+        return process
+
+    monkeypatch.setattr(asyncio, "create_subprocess_exec", mock_create_subprocess_exec)
+
+    pool = AppleScriptPool(size=4, min_idle=2)
+    await pool.prewarm()
+    assert len(spawned) == 2
+
+    for worker in pool._workers:
+        worker._process = None
+
+
+@pytest.mark.asyncio
+async def test_applescript_pool_respawns_dead_worker(monkeypatch):
+    """Test that a worker found dead before the script is sent is replaced and the call retried."""
+    spawned = []
+
+    async def mock_create_subprocess_exec(*args, **kwargs):
+        process = FakeInteractiveProcess("retried", dead=not spawned)
+        spawned.append(process)
+        return process
+
+    monkeypatch.setattr(asyncio, "create_subprocess_exec", mock_create_subprocess_exec)
+
+    pool = AppleScriptPool(size=1, min_idle=0)
+    assert await pool.run('return "x"') == "retried"
+    assert len(spawned) == 2
+
+    for worker in pool._workers:
+        worker._process = None
+
+
+@pytest.mark.asyncio
+async def test_applescript_script_is_not_rerun_after_worker_crash(monkeypatch):
+    """Test that a worker dying after the script was sent raises instead of running it again."""
+    import utils.applescript as applescript
+    spawned = []
+    one_shot = []
+
+    async def mock_create_subprocess_exec(*args, **kwargs):
+        process = FakeInteractiveProcess("second call", crash=not spawned)
+        spawned.append(process)
+        return process
+
+    async def mock_one_shot(script, language="AppleScript"):
+        one_shot.append(script)
+        return "one-shot"
+
+    monkeypatch.setattr(asyncio, "create_subprocess_exec", mock_create_subprocess_exec)
+    monkeypatch.setattr(applescript, "_run_osascript", mock_one_shot)
+    pool = AppleScriptPool(size=1, min_idle=0)
+    monkeypatch.setattr(applescript, "_pool", pool)
+
+    with pytest.raises(AppleScriptError, match="failed while running"):
+        await applescript.run_applescript_async('tell application "Messages" to send "hi"')
+    assert len(spawned) == 1
+    assert one_shot == []
+
+    # The next call starts a fresh interpreter
+    assert await pool.run('return "x"') == "second call"
+    assert len(spawned) == 2
+
+    for worker in pool._workers:
+        worker._process = None
+
+
+@pytest.mark.asyncio
+async def test_applescript_worker_times_out_hung_script(monkeypatch):
+    """Test that a hung script raises and the interpreter is replaced."""
+    import os
+    spawned = []
+    killed = []
+
+    async def mock_create_subprocess_exec(*args, **kwargs):
+        process = FakeInteractiveProcess("worker output", hang=not spawned)
+        spawned.append(process)
+        return process
+
+    monkeypatch.setattr(asyncio, "create_subprocess_exec", mock_create_subprocess_exec)
+    monkeypatch.setattr(os, "kill", lambda pid, sig: killed.append(pid))
+
+    worker = AppleScriptWorker()
+    worker.SCRIPT_TIMEOUT = 0.05
+    with pytest.raises(AppleScriptError, match="timed out"):
+        await worker.run("delay 600")
+    assert killed
+
+    assert await worker.run('return "ok"') == "worker output"
+    assert len(spawned) == 2
+
+@pytest.mark.asyncio
+async def test_batch_applescript(monkeypatch):
+    """Test that a batch runs in one call and reports failures per snippet."""
+    import utils.applescript as applescript
+    
+    scripts = []
+    
+    async def mock_run(script, language="AppleScript"):
+        scripts.append(script)
+        separator = script.split("text item delimiters to \"")[1].split("\"")[0]
+        return separator.join(["0true", "042", "1Reminders got an error"])
+    
+    monkeypatch.setattr(applescript, "run_applescript_async", mock_run)
+    
+    results = await batch_applescript(['return true', 'return 42', 'error "x"'])
+    assert len(scripts) == 1
+    assert results[:2] == ["true", "42"]
+    assert isinstance(results[2], AppleScriptError)
+    assert await batch_applescript([]) == []
+
+@pytest.mark.asyncio
+async def test_batch_compiled_scripts(monkeypatch):
+    """Test that registered scripts are batched as run script calls in one round trip."""
+    import utils.applescript as applescript
+    from utils.applescript import batch_compiled_scripts, register_script
+    
+    batches = []
+    
+    async def mock_batch(scripts):
+        batches.append(scripts)
+        return ["true", "false"]
+    
+    async def no_compiled_path(name):
+        return None
+    
+    register_script("test.batch_one", "on run argv\nreturn true\nend run")
+    register_script("test.batch_two", "on run argv\nreturn false\nend run")
+    monkeypatch.setattr(applescript, "_compiled_path", no_compiled_path)
+    monkeypatch.setattr(applescript, "batch_applescript", mock_batch)
+    
+    assert await batch_compiled_scripts(["test.batch_one", "test.batch_two"]) == ["true", "false"]
+    assert len(batches) == 1
+    assert batches[0][0].startswith('run script "on run argv')
+    assert batches[0][0].endswith('in "AppleScript" with parameters {}')
+
+@pytest.mark.asyncio
+async def test_run_record_script_parses_text_output(monkeypatch):
+    """Test that a record script is parsed from its source-form output without NSAppleScript."""
+    import utils.applescript as applescript
+    
+    async def mock_run(name, *args):
+        return '{success:true, message:"Created \\"A, B\\"", id:"x-coredata://1"}'
+    
+    monkeypatch.setattr(applescript, "NATIVE_SCRIPTS_AVAILABLE", False)
+    monkeypatch.setattr(applescript, "run_source_script", mock_run)
+    
+    assert await run_record_script("notes.create", "title") == {"success": True, "message": 'Created "A, B"', "id": "x-coredata://1"}
+
+@pytest.mark.asyncio
+async def test_run_source_script_asks_for_source_form(monkeypatch):
+    """Test that source-form results come from a one-shot osascript run with "-s s"."""
+    import utils.applescript as applescript
+    from utils.applescript import register_script, run_source_script
+    commands = []
+    
+    class MockProcess:
+        returncode = 0
+        async def communicate(self):
+            return b'{status:"ok", message:"Saved \\"A, B\\""}\n', b""
+    
+    async def mock_create_subprocess_exec(*args, **kwargs):
+        commands.append(args)
+        return MockProcess()
+    
+    async def no_compiled_path(name):
+        return None
+    
+    register_script("test.source_form", "on run argv\nreturn item 1 of argv\nend run")
+    monkeypatch.setattr(applescript, "_compiled_path", no_compiled_path)
+    monkeypatch.setattr(asyncio, "create_subprocess_exec", mock_create_subprocess_exec)
+    
+    output = await run_source_script("test.source_form", "x")
+    assert commands[0][:3] == ("osascript", "-s", "s")
+    assert commands[0][-1] == "x"
+    assert parse_applescript_record(output) == {"status": "ok", "message": 'Saved "A, B"'}
+
+@pytest.mark.asyncio
+async def test_run_native_script_times_out(monkeypatch):
+    """Test that an in-process script that never returns raises instead of waiting forever."""
+    import threading
+    import utils.applescript as applescript
+    from utils.applescript import run_native_script
+    release = threading.Event()
+    
+    async def no_compiled_path(name):
+        return None
+    
+    monkeypatch.setattr(applescript, "NATIVE_SCRIPTS_AVAILABLE", True)
+    monkeypatch.setattr(applescript, "_compiled_path", no_compiled_path)
+    monkeypatch.setattr(applescript, "_run_native", lambda name, path, args: release.wait(5))
+    monkeypatch.setattr(AppleScriptWorker, "SCRIPT_TIMEOUT", 0.05)
+    
+    try:
+        with pytest.raises(AppleScriptError, match="timed out"):
+            await run_native_script("test.native")
+    finally:
+        release.set()
+
+@pytest.mark.asyncio
+async def test_applescript_call_returns_default_and_resets_access():
+    """Test that a failed script call resets the module's access cache and returns the default."""
+    class Access:
+        resets = 0
+        def reset(self):
+            self.resets += 1
+    
+    class Module:
+        _access = Access()
+        
+        @applescript_call(lambda e: {"success": False, "message": str(e)}, "Error running")
+        async def run(self, fail):
+            if fail:
+                raise AppleScriptError("denied")
+            return {"success": True}
+    
+    module = Module()
+    assert await module.run(False) == {"success": True}
+    assert await module.run(True) == {"success": False, "message": "denied"}
+    assert module._access.resets == 1
+
+@pytest.mark.asyncio
+async def test_concurrent_first_calls_compile_once(monkeypatch):
+    """Test that concurrent first calls of a registered script share one compilation."""
+    import utils.applescript as applescript
+    from pathlib import Path
+    from utils.applescript import register_script, run_compiled_script
+    
+    compiled = []
+    scripts = []
+    
+    async def mock_compile(name):
+        compiled.append(name)
+        await asyncio.sleep(0)
+        return Path("/tmp/test.concurrent.scpt")
+    
+    async def mock_run(script, language="AppleScript"):
+        scripts.append(script)
+        return "ok"
+    
+    monkeypatch.setattr(applescript, "_compile_script", mock_compile)
+    monkeypatch.setattr(applescript, "run_applescript_async", mock_run)
+    register_script("test.concurrent", "on run argv\nreturn item 1 of argv\nend run")
+    
+    results = await asyncio.gather(*(run_compiled_script("test.concurrent", i) for i in range(3)))
+    assert results == ["ok", "ok", "ok"]
+    assert compiled == ["test.concurrent"]
+    assert all("test.concurrent.scpt" in script for script in scripts)
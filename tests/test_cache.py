@@ -0,0 +1,162 @@
+"""Tests for the TTL cache used by read-only module methods."""
+
+import asyncio
+import pytest
+from utils.cache import AccessCache, TTLCache, cache, ttl_cache
+
+def test_ttl_cache_get_set_and_expiry(monkeypatch):
+    """Test storing, expiring and invalidating entries."""
+    now = [100.0]
+    monkeypatch.setattr("utils.cache.time.monotonic", lambda: now[0])
+
+    store = TTLCache()
+    store.set(("cal:events:search", "a"), [1], ttl_seconds=30)
+    store.set(("cal:access",), True, ttl_seconds=None)
+    assert store.get(("cal:events:search", "a")) == [1]
+
+    now[0] += 31
+    assert store.get(("cal:events:search", "a")) is None
+    assert store.get(("cal:access",)) is True
+
+    store.set(("cal:events:range", None), [2], ttl_seconds=30)
+    store.invalidate_prefix("cal:events")
+    assert store.get(("cal:events:range", None)) is None
+    assert store.get(("cal:access",)) is True
+
+def test_ttl_cache_evicts_oldest():
+    """Test that the cache stays within its size bound."""
+    store = TTLCache(maxsize=2)
+    store.set(("a",), 1, ttl_seconds=None)
+    store.set(("b",), 2, ttl_seconds=None)
+    store.set(("c",), 3, ttl_seconds=None)
+    assert store.get(("a",)) is None
+    assert store.get(("c",)) == 3
+
+@pytest.mark.asyncio
+async def test_ttl_cache_decorator():
+    """Test that the decorator caches results but not failures."""
+    cache.clear()
+    calls = []
+
+    class Module:
+        @ttl_cache(ttl=30, key=lambda self, query, limit: ("test:search", query, limit))
+        async def search(self, query, limit=5):
+            calls.append(query)
+            return [] if query == "missing" else [query]
+
+    module = Module()
+    assert await module.search("x") == ["x"]
+    assert await module.search("x", limit=5) == ["x"]
+    assert calls == ["x"]
+
+    assert await module.search("missing") == []
+    assert await module.search("missing") == []
+    assert calls == ["x", "missing", "missing"]
+    cache.clear()
+
+@pytest.mark.asyncio
+async def test_ttl_cache_single_flight():
+    """Test that concurrent calls with the same key share one call."""
+    cache.clear()
+    calls = []
+    release = asyncio.Event()
+
+    class Module:
+        @ttl_cache(ttl=30, key=lambda self, query: ("test:slow", query))
+        async def search(self, query):
+            calls.append(query)
+            await release.wait()
+            return [query]
+
+    module = Module()
+    pending = asyncio.gather(*(module.search("x") for _ in range(3)))
+    await asyncio.sleep(0)
+    release.set()
+    assert await pending == [["x"], ["x"], ["x"]]
+    assert calls == ["x"]
+    cache.clear()
+
+@pytest.mark.asyncio
+async def test_ttl_cache_returns_copies():
+    """Test that changing a returned value does not change later cache hits."""
+    cache.clear()
+
+    class Module:
+        @ttl_cache(ttl=30, key=lambda self: ("test:lists",))
+        async def lists(self):
+            return [{"name": "Home"}]
+
+    module = Module()
+    first = await module.lists()
+    first[0]["name"] = "Changed"
+    first.append({"name": "Extra"})
+    assert await module.lists() == [{"name": "Home"}]
+    cache.clear()
+
+@pytest.mark.asyncio
+async def test_ttl_cache_invalidation_during_load():
+    """Test that a load overlapping an invalidation is neither cached nor joined."""
+    cache.clear()
+    calls = []
+    release = asyncio.Event()
+
+    class Module:
+        @ttl_cache(ttl=30, key=lambda self: ("test:lists",))
+        async def lists(self):
+            calls.append(len(calls))
+            if len(calls) == 1:
+                await release.wait()
+                return ["old"]
+            return ["new"]
+
+    module = Module()
+    stale = asyncio.ensure_future(module.lists())
+    await asyncio.sleep(0)
+    cache.invalidate_prefix("test:")
+    assert await module.lists() == ["new"]
+    release.set()
+    assert await stale == ["old"]
+    assert await module.lists() == ["new"]
+    assert calls == [0, 1]
+    cache.clear()
+
+@pytest.mark.asyncio
+async def test_access_cache_expires_confirmed_access(monkeypatch):
+    """Test that a confirmed access is probed again after max_age and after reset."""
+    now = [100.0]
+    monkeypatch.setattr("utils.cache.time.monotonic", lambda: now[0])
+    probes = []
+
+    async def probe():
+        probes.append(now[0])
+        return True
+
+    access = AccessCache(max_age=300)
+    assert await access.check(probe) is True
+    now[0] += 299
+    assert await access.check(probe) is True
+    assert len(probes) == 1
+
+    now[0] += 1
+    assert access.granted is False
+    assert await access.check(probe) is True
+    assert len(probes) == 2
+
+    access.reset()
+    assert await access.check(probe) is True
+    assert len(probes) == 3
+
+@pytest.mark.asyncio
+async def test_access_cache_records_probe_results():
+    """Test that a result probed elsewhere is stored, and a confirmed access is not undone by it."""
+    access = AccessCache()
+    assert access.max_age == 300
+
+    assert await access.record(False) is False
+    assert await access.record(True) is True
+    assert await access.record(False) is True
+
+    async def probe():
+        raise AssertionError("a confirmed access is not probed again")
+
+    assert await access.check(probe) is True
@@ -57,4 +57,150 @@ async def test_calendar_interface(mock_calendar):
     )
     
     all_events = await mock_calendar.get_events()
-    assert isinstance(all_events, list)
\ No newline at end of file
+    assert isinstance(all_events, list)
+
+def test_split_date_range():
+    """Test that long date ranges are split into non-overlapping windows."""
+    from utils.calendar import _split_date_range
+
+    assert _split_date_range("2025-04-01", "2025-04-05") == [("2025-04-01", "2025-04-05")]
+
+    windows = _split_date_range("2025-04-01", "2025-04-20")
+    assert windows == [
+        ("2025-04-01 00:00:00", "2025-04-07 23:59:59"),
+        ("2025-04-08 00:00:00", "2025-04-14 23:59:59"),
+        ("2025-04-15 00:00:00", "2025-04-20"),
+    ]
+
+    # Start times and other spellings are accepted; unknown text is not split
+    windows = _split_date_range("2025-04-01 09:00", "4/20/2025")
+    assert windows[0] == ("2025-04-01 09:00:00", "2025-04-08 08:59:59")
+    assert windows[-1] == ("2025-04-15 09:00:00", "4/20/2025")
+    assert _split_date_range("next monday", "2025-04-20") == [("next monday", "2025-04-20")]
+
+
+def test_parse_date():
+    """Test that dates are read in the forms the event script accepts."""
+    from utils.calendar import _parse_date
+
+    assert _parse_date("2025-04-01") == datetime(2025, 4, 1)
+    assert _parse_date("2025-04-01", end_of_day=True) == datetime(2025, 4, 1, 23, 59, 59)
+    assert _parse_date("2025-04-01T09:30") == datetime(2025, 4, 1, 9, 30)
+    assert _parse_date("2025-04-01 09:30:15", end_of_day=True) == datetime(2025, 4, 1, 9, 30, 15)
+    assert _parse_date("4/1/2025") == datetime(2025, 4, 1)
+    assert _parse_date("April 1, 2025") == datetime(2025, 4, 1)
+    assert _parse_date("2025-13-01") is None
+    assert _parse_date("tomorrow") is None
+
+
+def test_parse_event_line():
+    """Test parsing the one-JSON-object-per-event lines logged by the event scripts."""
+    from utils.calendar import _parse_event_line
+
+    line = '{"title": "Standup", "start_date": "2025-04-01 09:00:00", "end_date": "2025-04-01 09:15:00", "location": null, "notes": "Line 1\\nLine 2", "calendar": "Work"}'
+    event = _parse_event_line(line)
+    assert event["title"] == "Standup"
+    assert event["location"] is None
+    assert event["notes"] == "Line 1\nLine 2"
+    assert event["calendar"] == "Work"
+
+    assert _parse_event_line("execution error: Calendar got an error (-1728)") is None
+
+
+def test_default_date_range():
+    """Test the default range spans seven days and is reused within a second."""
+    from datetime import datetime
+    from utils.calendar import _default_date_range
+
+    from_date, to_date = _default_date_range()
+    start = datetime.strptime(from_date, "%Y-%m-%d")
+    end = datetime.strptime(to_date, "%Y-%m-%d")
+    assert (end - start).days == 7
+    assert _default_date_range() is _default_date_range()
+
+
+@pytest.mark.asyncio
+async def test_check_calendar_access_is_cached():
+    """Test that concurrent checks share one probe and only successes are kept."""
+    module = CalendarModule()
+    module._probe_calendar_access = mock.AsyncMock(return_value=True)
+
+    results = await asyncio.gather(*(module.check_calendar_access() for _ in range(3)))
+    assert results == [True, True, True]
+    assert module._probe_calendar_access.await_count == 1
+
+    module._access.reset()
+    module._probe_calendar_access.return_value = False
+    assert await module.check_calendar_access() is False
+    assert await module.check_calendar_access() is False
+    assert module._probe_calendar_access.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_eventkit_reads_dates_like_the_event_script(monkeypatch):
+    """Test that EventKit queries accept times and other date spellings and reject unknown text."""
+    from utils.cache import cache
+
+    class FakeStore:
+        def __init__(self):
+            self.ranges = []
+
+        def predicateForEventsWithStartDate_endDate_calendars_(self, start, end, calendars):
+            self.ranges.append((start, end))
+            return None
+
+        def eventsMatchingPredicate_(self, predicate):
+            return []
+
+    module = CalendarModule()
+    module.store = FakeStore()
+    monkeypatch.setattr(CalendarModule, "_to_nsdate", staticmethod(lambda value: value))
+    module._eventkit_ready = mock.AsyncMock(return_value=True)
+    cache.clear()
+
+    assert await module.get_events(from_date="2025-04-01 09:00", to_date="2025-04-02") == []
+    assert await module.search_events("x", from_date="4/1/2025", to_date="4/3/2025 17:00") == []
+    assert module.store.ranges == [
+        (datetime(2025, 4, 1, 9), datetime(2025, 4, 3)),
+        (datetime(2025, 4, 1), datetime(2025, 4, 3, 17, 0, 1)),
+    ]
+
+    assert await module.get_events(from_date="soon", to_date="2025-04-02") == []
+    assert len(module.store.ranges) == 2
+    cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_event_windows_are_bounded_and_stop_at_the_limit(monkeypatch):
+    """Test that long ranges run a few windows at a time and stop once enough events are found."""
+    import utils.calendar as calendar_module
+    from utils.cache import cache
+
+    started = []
+    running = []
+    peak = []
+
+    async def fake_stream(name, search_text, start, end, limit):
+        started.append((start, limit))
+        running.append(start)
+        peak.append(len(running))
+        await asyncio.sleep(0)
+        running.remove(start)
+        for index in range(2):
+            yield f'{{"title": "{start} #{index}"}}'
+
+    monkeypatch.setattr(calendar_module, "stream_compiled_script", fake_stream)
+    module = CalendarModule()
+    module._eventkit_ready = mock.AsyncMock(return_value=False)
+    cache.clear()
+
+    events = await module.get_events(limit=10, from_date="2025-01-01", to_date="2025-12-31")
+
+    assert max(peak) == calendar_module.MAX_CONCURRENT_WINDOWS
+    assert [event["title"] for event in events][:2] == ["2025-01-01 00:00:00 #0", "2025-01-01 00:00:00 #1"]
+    assert len(events) == 10
+    # Four windows ran with the full limit, then four more for the last two
+    # events; none of the year's remaining windows were started
+    assert len(started) == 8
+    assert started[4] == ("2025-01-29 00:00:00", 2)
+    cache.clear()
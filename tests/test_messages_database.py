@@ -0,0 +1,114 @@
+"""Tests for reading Messages history from chat.db."""
+
+import sqlite3
+
+import pytest
+
+import utils.message as message_module
+from utils.message import MessageModule
+
+pytestmark = pytest.mark.asyncio
+
+# 2024-01-01 00:00:00 UTC in chat.db nanoseconds
+JAN_1_2024 = 725846400 * 10**9
+
+def archived_body(text):
+    """An attributedBody value holding text, laid out like the typedstream Messages writes"""
+    encoded = text.encode()
+    length = bytes([len(encoded)]) if len(encoded) < 0x80 else b"\x81" + len(encoded).to_bytes(2, "little")
+    return b"\x04\x0bstreamtyped\x81\xe8\x03\x84\x01@\x84\x84\x84\x12NSAttributedString\x00\x84\x84\x08NSObject\x00\x85\x92\x84\x84\x84\x08NSString\x01\x94\x84\x01+" + length + encoded + b"\x86\x84\x02iI"
+
+@pytest.fixture
+def chat_db(tmp_path, monkeypatch):
+    """A minimal chat.db with one chat of three messages."""
+    path = tmp_path / "chat.db"
+    connection = sqlite3.connect(path)
+    connection.executescript('''
+        CREATE TABLE handle (ROWID INTEGER PRIMARY KEY, id TEXT);
+        CREATE TABLE chat (ROWID INTEGER PRIMARY KEY, chat_identifier TEXT);
+        CREATE TABLE message (ROWID INTEGER PRIMARY KEY, text TEXT, attributedBody BLOB, handle_id INTEGER, date INTEGER, is_from_me INTEGER, is_read INTEGER);
+        CREATE TABLE chat_message_join (chat_id INTEGER, message_id INTEGER);
+        INSERT INTO handle VALUES (1, '+15551234567');
+        INSERT INTO chat VALUES (1, '+15551234567');
+    ''')
+    rows = [
+        (1, "first", None, 1, JAN_1_2024, 0, 1),
+        (2, "reply", None, 0, JAN_1_2024 + 60 * 10**9, 1, 1),
+        (3, None, archived_body("latest"), 1, JAN_1_2024 + 120 * 10**9, 0, 0),
+    ]
+    connection.executemany("INSERT INTO message VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+    connection.executemany("INSERT INTO chat_message_join VALUES (1, ?)", [(row[0],) for row in rows])
+    connection.commit()
+    connection.close()
+    monkeypatch.setattr(message_module, "MESSAGES_DB_PATH", path)
+    return path
+
+async def test_read_messages_from_database(chat_db):
+    """Messages of a chat come back newest first, limited and shaped like the AppleScript records."""
+    messages = await MessageModule().read_messages("+15551234567", limit=2)
+
+    assert [message["content"] for message in messages] == ["latest", "reply"]
+    assert messages[0]["sender"] == "+15551234567"
+    assert messages[0]["is_from_me"] is False
+    assert messages[1]["is_from_me"] is True
+    assert isinstance(messages[0]["date"], str)
+
+async def test_read_messages_matches_formatted_numbers(chat_db):
+    """A number written without the country code or with punctuation finds the chat."""
+    messages = await MessageModule().read_messages("555-123-4567", limit=1)
+
+    assert [message["content"] for message in messages] == ["latest"]
+
+async def test_read_messages_falls_back_when_no_chat_matches(chat_db, monkeypatch):
+    """A handle the database does not know is resolved by Messages instead."""
+    async def fake_run(name, *args):
+        assert (name, args) == ("messages.read", ("someone@example.com", 10))
+        return "1\x1efalse\x1fsomeone@example.com\x1fhi\x1ftoday"
+
+    monkeypatch.setattr(message_module, "run_compiled_script", fake_run)
+
+    messages = await MessageModule().read_messages("someone@example.com")
+
+    assert [message["content"] for message in messages] == ["hi"]
+
+async def test_attributed_body_text_reads_long_bodies():
+    """Bodies of 128 bytes or more use the two byte length form."""
+    text = "x" * 300
+    assert message_module._attributed_body_text(archived_body(text)) == text
+    assert message_module._attributed_body_text(b"no archive") is None
+
+async def test_unread_messages_from_database(chat_db):
+    """Only unread messages from other people are returned."""
+    messages = await MessageModule().get_unread_messages()
+
+    assert [message["content"] for message in messages] == ["latest"]
+
+async def test_read_messages_falls_back_to_applescript(tmp_path, monkeypatch):
+    """Without a readable chat.db the AppleScript path is used."""
+    monkeypatch.setattr(message_module, "MESSAGES_DB_PATH", tmp_path / "missing.db")
+
+    async def fake_run(name, *args):
+        assert name == "messages.read"
+        return "2\x1efalse\x1f+15551234567\x1fhi\x1ftoday\x1etrue\x1fme\x1f\x1ftoday"
+
+    monkeypatch.setattr(message_module, "run_compiled_script", fake_run)
+
+    messages = await MessageModule().read_messages("+15551234567")
+
+    assert messages == [
+        {"content": "hi", "sender": "+15551234567", "date": "today", "is_from_me": False},
+        {"content": "", "sender": "me", "date": "today", "is_from_me": True},
+    ]
+
+async def test_read_messages_rejects_incomplete_script_output(tmp_path, monkeypatch):
+    """Output missing announced rows or fields is logged and treated as no messages."""
+    monkeypatch.setattr(message_module, "MESSAGES_DB_PATH", tmp_path / "missing.db")
+    outputs = iter(["0", "2\x1efalse\x1fme\x1fhi\x1ftoday", "1\x1efalse\x1fme\x1fhi", ""])
+
+    async def fake_run(name, *args):
+        return next(outputs)
+
+    monkeypatch.setattr(message_module, "run_compiled_script", fake_run)
+
+    for _ in range(4):
+        assert await MessageModule().read_messages("+15551234567") == []
@@ -0,0 +1,121 @@
+"""Tests for reading reminder lists through the AppleScript path."""
+
+import asyncio
+
+import pytest
+
+import utils.reminders as reminders_module
+from utils.cache import cache
+from utils.reminders import RemindersModule
+
+pytestmark = pytest.mark.asyncio
+
+@pytest.fixture
+def script_output(monkeypatch):
+    """Answer the reminder list script with the text in the returned dictionary."""
+    replies = {}
+
+    async def fake_run(name, *args):
+        assert name == "reminders.all_lists"
+        return replies["output"]
+
+    monkeypatch.setattr(reminders_module, "run_compiled_script", fake_run)
+    monkeypatch.setattr(reminders_module, "EKEventStore", None)
+    cache.clear()
+    yield replies
+    cache.clear()
+
+async def test_get_all_lists_decodes_script_output(script_output):
+    """Each list comes back with its name, id and reminder count."""
+    script_output["output"] = '2\x1dHome, "Shared"\x1eWork\x1dL1\x1eL2\x1d2\x1e0'
+
+    assert await RemindersModule().get_all_lists() == [
+        {"name": 'Home, "Shared"', "id": "L1", "reminder_count": 2},
+        {"name": "Work", "id": "L2", "reminder_count": 0},
+    ]
+
+async def test_get_all_lists_keeps_empty_names(script_output):
+    """A list with an empty name at either end does not shift the other columns."""
+    script_output["output"] = '2\x1d\x1eWork\x1dL1\x1eL2\x1d2\x1e0'
+
+    assert await RemindersModule().get_all_lists() == [
+        {"name": "", "id": "L1", "reminder_count": 2},
+        {"name": "Work", "id": "L2", "reminder_count": 0},
+    ]
+
+async def test_get_all_lists_without_lists(script_output):
+    """An account without lists returns an empty list."""
+    script_output["output"] = "0"
+
+    assert await RemindersModule().get_all_lists() == []
+
+async def test_get_all_lists_returns_empty_on_bad_output(script_output):
+    """Output that does not hold the announced lists is logged and treated as no lists."""
+    for output in ("", '1\x1dHome\x1dL1', '2\x1dHome\x1dL1\x1d1'):
+        script_output["output"] = output
+        assert await RemindersModule().get_all_lists() == []
+
+async def test_get_stats_for_all_lists_counts_lists_concurrently(script_output, monkeypatch):
+    """Every list is counted, and the counts run at the same time."""
+    script_output["output"] = '2\x1dHome\x1eWork\x1dL1\x1eL2\x1d2\x1e0'
+    running = []
+    peak = []
+
+    async def fake_count(self, list_name=None):
+        running.append(list_name)
+        peak.append(len(running))
+        await asyncio.sleep(0)
+        running.remove(list_name)
+        return {"success": True, "completed": len(list_name), "incomplete": 0}
+
+    monkeypatch.setattr(RemindersModule, "get_completed_count", fake_count)
+
+    assert await RemindersModule().get_stats_for_all_lists() == [
+        {"name": "Home", "id": "L1", "success": True, "completed": 4, "incomplete": 0},
+        {"name": "Work", "id": "L2", "success": True, "completed": 4, "incomplete": 0},
+    ]
+    assert max(peak) == 2
+
+async def test_snapshot_uses_one_script(monkeypatch):
+    """The overview of lists and reminders comes from a single script call."""
+    calls = []
+
+    async def fake_run(name, *args):
+        calls.append((name, args))
+        return '{"lists": [{"name": "Home", "id": "L1", "reminder_count": 3, "completed": 1, "incomplete": 2}], "reminders": [{"name": "Milk"}]}'
+
+    monkeypatch.setattr(reminders_module, "run_compiled_script", fake_run)
+    monkeypatch.setattr(reminders_module, "EKEventStore", None)
+
+    snapshot = await RemindersModule().snapshot(limit=5)
+
+    assert calls == [("reminders.snapshot", (5,))]
+    assert snapshot["lists"][0]["incomplete"] == 2
+    assert snapshot["reminders"] == [{"name": "Milk"}]
+
+async def test_reads_are_cached_until_a_write(monkeypatch):
+    """Repeated list reads reuse the result until a reminder is created."""
+    calls = []
+
+    async def fake_run(name, *args):
+        calls.append(name)
+        return "1\x1dHome\x1dL1\x1d1"
+
+    async def fake_record(name, *args):
+        calls.append(name)
+        return {"success": True, "message": "Created", "id": "r1"}
+
+    monkeypatch.setattr(reminders_module, "run_compiled_script", fake_run)
+    monkeypatch.setattr(reminders_module, "run_record_script", fake_record)
+    monkeypatch.setattr(reminders_module, "EKEventStore", None)
+    cache.clear()
+    reminders = RemindersModule()
+
+    first = await reminders.get_all_lists()
+    assert await reminders.get_all_lists() == first
+    assert calls == ["reminders.all_lists"]
+
+    await reminders.create_reminder("Milk")
+    await reminders.get_all_lists()
+    assert calls == ["reminders.all_lists", "reminders.create", "reminders.all_lists"]
+    cache.clear()
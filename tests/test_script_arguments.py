@@ -0,0 +1,143 @@
+"""Tests that user input reaches the Messages, Notes and Reminders scripts unchanged."""
+
+import pytest
+
+import utils.message as message_module
+import utils.notes as notes_module
+import utils.reminders as reminders_module
+from utils.message import MessageModule
+from utils.notes import NotesModule
+from utils.cache import cache
+from utils.reminders import RemindersModule
+
+pytestmark = pytest.mark.asyncio
+
+TRICKY_TEXT = 'O\'Brien" says "hi\\\nthere'
+
+@pytest.fixture
+def recorded(monkeypatch, tmp_path):
+    """Record every registered script call instead of running osascript."""
+    calls = []
+
+    async def fake_run(name, *args):
+        calls.append((name, args))
+        if name.endswith((".find", ".all", ".all_reminders", ".search")):
+            return "[]"
+        if name.endswith(".list_reminders"):
+            return "{}"
+        return "SUCCESS:done"
+
+    async def fake_record(name, *args):
+        calls.append((name, args))
+        return {"success": True, "message": "done", "id": "new-id"}
+
+    for module in (message_module, notes_module, reminders_module):
+        monkeypatch.setattr(module, "run_compiled_script", fake_run)
+    for module in (notes_module, reminders_module):
+        monkeypatch.setattr(module, "run_record_script", fake_record)
+    # Force the AppleScript paths
+    monkeypatch.setattr(message_module, "MESSAGES_DB_PATH", tmp_path / "missing.db")
+    monkeypatch.setattr(reminders_module, "EKEventStore", None)
+    cache.clear()
+    return calls
+
+async def test_user_input_is_passed_as_arguments(recorded):
+    """Text with quotes, backslashes and newlines is passed through argv, never spliced into source."""
+    messages = MessageModule()
+    notes = NotesModule()
+    reminders = RemindersModule()
+
+    assert await messages.send_message(TRICKY_TEXT, TRICKY_TEXT) is True
+    await messages.read_messages(TRICKY_TEXT)
+    assert (await messages.schedule_message(TRICKY_TEXT, TRICKY_TEXT, "tomorrow"))["success"] is True
+    await notes.find_note(TRICKY_TEXT)
+    assert (await notes.create_note(TRICKY_TEXT, TRICKY_TEXT, TRICKY_TEXT))["note"]["id"] == "new-id"
+    await reminders.search_reminders(TRICKY_TEXT)
+    assert (await reminders.open_reminder(TRICKY_TEXT))["success"] is True
+    assert (await reminders.create_reminder(TRICKY_TEXT, TRICKY_TEXT, TRICKY_TEXT))["id"] == "new-id"
+
+    assert len(recorded) == 8
+    for name, args in recorded:
+        assert TRICKY_TEXT in args, name
+
+async def test_list_reminders_fields_are_passed_as_arguments(recorded):
+    """The list id and requested properties are passed through argv with their JXA names."""
+    await RemindersModule().get_reminders_from_list_by_id(TRICKY_TEXT, ["name", "notes", "due_date"])
+
+    assert recorded == [
+        ("reminders.list_reminders", (TRICKY_TEXT, "name:name", "notes:body", "due_date:dueDate"))
+    ]
+
+async def test_open_reminder_reuses_found_id(monkeypatch):
+    """A reminder found once is reopened by id; a failed reopen searches again."""
+    calls = []
+    replies = {
+        "reminders.open": "SUCCESS:Opened reminder: Milk\nx-apple-reminder://1",
+        "reminders.open_by_id": "SUCCESS:Opened reminder: Milk",
+    }
+
+    async def fake_run(name, *args):
+        calls.append((name, args))
+        return replies[name]
+
+    monkeypatch.setattr(reminders_module, "run_compiled_script", fake_run)
+    reminders = RemindersModule()
+
+    first = await reminders.open_reminder("Mil")
+    second = await reminders.open_reminder("Mil")
+    assert first["message"] == second["message"] == "Opened reminder: Milk"
+    assert calls == [("reminders.open", ("Mil",)), ("reminders.open_by_id", ("x-apple-reminder://1",))]
+
+    replies["reminders.open_by_id"] = "ERROR:Can't get reminder id"
+    assert (await reminders.open_reminder("Mil"))["success"] is True
+    assert [name for name, _ in calls[2:]] == ["reminders.open_by_id", "reminders.open"]
+
+async def test_create_reminders_batch_uses_one_script(monkeypatch):
+    """Every reminder is created by one script call and results keep the input order."""
+    calls = []
+
+    async def fake_run(name, *args):
+        calls.append((name, args))
+        return '{{success:true, message:"Created", id:"r1"}, {success:false, message:"Bad list", id:""}}'
+
+    monkeypatch.setattr(reminders_module, "run_source_script", fake_run)
+    monkeypatch.setattr(reminders_module, "NATIVE_SCRIPTS_AVAILABLE", False)
+
+    results = await RemindersModule().create_reminders_batch([
+        {"name": TRICKY_TEXT, "notes": "n"},
+        {"name": "Two", "list_name": "Missing"},
+    ])
+
+    assert calls == [("reminders.create_batch", (TRICKY_TEXT, "Reminders", "n", "", "Two", "Missing", "", ""))]
+    assert results == [
+        {"success": True, "message": "Created", "id": "r1"},
+        {"success": False, "message": "Bad list", "id": None},
+    ]
+
+async def test_list_reminders_columns_become_records(monkeypatch):
+    """Columns returned by the list script are zipped into one record per reminder."""
+    async def fake_run(name, *args):
+        return '{"name": ["Milk", "Bread"], "completed": [false, true]}'
+
+    monkeypatch.setattr(reminders_module, "run_compiled_script", fake_run)
+    monkeypatch.setattr(reminders_module, "EKEventStore", None)
+
+    reminders = await RemindersModule().get_reminders_from_list_by_id("L1", ["name", "completed"])
+
+    assert reminders == [
+        {"name": "Milk", "completed": False},
+        {"name": "Bread", "completed": True},
+    ]
+
+async def test_get_all_notes_is_empty_when_the_stream_fails(monkeypatch):
+    """A script failing after some notes were read does not return a partial list."""
+    async def fake_stream(name, *args):
+        yield '{"title": "First"}'
+        raise notes_module.AppleScriptError("Notes got an error")
+
+    monkeypatch.setattr(notes_module, "stream_compiled_script", fake_stream)
+    notes = NotesModule()
+    notes._access.granted = True
+
+    assert await notes.get_all_notes() == []
+    assert not notes._access.granted
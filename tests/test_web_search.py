@@ -0,0 +1,54 @@
+"""Tests for the DuckDuckGo web search."""
+
+import httpx
+import pytest
+
+from utils.web_search import WebSearchModule
+
+pytestmark = pytest.mark.asyncio
+
+ANSWER = b'''{
+    "Heading": "Python",
+    "AbstractURL": "https://en.wikipedia.org/wiki/Python",
+    "Results": [],
+    "RelatedTopics": [
+        {"Text": "Python (language)", "FirstURL": "https://duckduckgo.com/Python_(language)"},
+        {"Name": "Animals", "Topics": [{"Text": "Pythonidae", "FirstURL": "https://duckduckgo.com/Pythonidae"}]}
+    ]
+}'''
+
+async def test_web_search_reuses_one_client():
+    """Results are flattened from the answer and every search goes through the same client."""
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, content=ANSWER)
+
+    module = WebSearchModule()
+    module._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    client = module._client
+
+    first = await module.web_search("python")
+    await module.web_search("python")
+
+    assert first == {
+        "query": "python",
+        "results": [
+            {"title": "Python", "url": "https://en.wikipedia.org/wiki/Python"},
+            {"title": "Python (language)", "url": "https://duckduckgo.com/Python_(language)"},
+            {"title": "Pythonidae", "url": "https://duckduckgo.com/Pythonidae"},
+        ],
+    }
+    assert module._client is client
+    assert requests[0].url.params["q"] == "python"
+    assert requests[0].url.params["format"] == "json"
+    await module.close()
+
+async def test_web_search_returns_no_results_on_error():
+    """HTTP errors are logged and reported as an empty result list."""
+    module = WebSearchModule()
+    module._client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(503)))
+
+    assert await module.web_search("python") == {"query": "python", "results": []}
+    await module.close()
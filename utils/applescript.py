@@ -6,12 +6,34 @@ and handling their results with comprehensive logging.
 """
 
 import subprocess
+import asyncio
+import atexit
+import codecs
+import hashlib
+import os
+import re
+import signal
+import sys
+import uuid
 import logging
 import json
 import time
 import functools
 import inspect
-from typing import Any, Dict, List, Optional, Union, Callable, TypeVar, cast
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple, Union, Callable, TypeVar, cast
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from Foundation import NSAppleEventDescriptor, NSAppleScript, NSURL
+except ImportError:
+    NSAppleScript = None
 
 # Configure logger
 logger = logging.getLogger(__name__)
@@ -35,6 +57,16 @@ def log_execution_time(func: Callable[..., T]) -> Callable[..., T]:
     @functools.wraps(func)
     def wrapper(*args: Any, **kwargs: Any) -> T:
         func_name = func.__name__
+        if not logger.isEnabledFor(logging.DEBUG):
+            # Skip building the debug messages; the parsers run once per record
+            start_time = time.time()
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                execution_time = time.time() - start_time
+                logger.error(f"{func_name} raised {type(e).__name__} after {execution_time:.4f}s: {str(e)}")
+                raise
+        
         # Generate a unique ID for this call
         call_id = str(id(args[0]))[:8] if args else str(id(func))[:8]
         
@@ -82,6 +114,43 @@ class AppleScriptError(Exception):
     """Exception raised when an AppleScript execution fails"""
     pass
 
+def applescript_call(
+    default: Callable[[Exception], Any],
+    message: str,
+    errors: tuple = (AppleScriptError,)
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Decorator that turns a failed script call of a module method into a default result
+    
+    The decorated coroutine method runs unchanged; when it raises one of
+    ``errors``, the module's confirmed access (``self._access``) is reset,
+    the error is logged and the default is returned instead.
+    
+    Args:
+        default: Called with the error to build the result returned on failure
+        message: Log message prefix, such as "Error reading messages"
+        errors: Exception types that are turned into the default result
+        
+    Returns:
+        The decorator
+    """
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        # Errors are logged under the decorated method's module
+        func_logger = logging.getLogger(func.__module__)
+        
+        @functools.wraps(func)
+        async def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+            try:
+                return await func(self, *args, **kwargs)
+            except errors as e:
+                access = getattr(self, "_access", None)
+                if access is not None:
+                    access.reset()
+                func_logger.error(f"{message}: {e}")
+                return default(e)
+        return wrapper
+    return decorator
+
 @log_execution_time
 def run_applescript(script: str) -> str:
     """
@@ -116,12 +185,340 @@ def run_applescript(script: str) -> str:
         logger.error(error_msg)
         raise AppleScriptError(error_msg)
 
-async def run_applescript_async(script: str) -> str:
+class WorkerUnavailableError(Exception):
+    """Raised when the persistent osascript worker cannot serve a request"""
+    pass
+
+def _applescript_literal(text: str) -> str:
+    """
+    Quote a Python string as an AppleScript string literal
+    
+    Args:
+        text: The text to quote
+        
+    Returns:
+        The text wrapped in double quotes with backslashes, quotes, line breaks and tabs escaped
+    """
+    escaped = (
+        text.replace("\\", "\\\\")
+        .replace('"', '\\"')
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+        .replace("\t", "\\t")
+    )
+    return f'"{escaped}"'
+
+class AppleScriptWorker:
+    """
+    A long-running ``osascript -i`` process that executes scripts over a pipe.
+    
+    Interactive osascript reads one statement per line, so each script is sent
+    as a single ``run script "..."`` line followed by a sentinel line. Output is
+    read until the sentinel comes back, which frames the result of the call.
+    Errors raised by the script are caught inside the wrapper and reported with
+    an error marker so the session survives them.
+    """
+    
+    # Seconds to wait for a freshly started interpreter to answer its first ping
+    STARTUP_TIMEOUT = 10.0
+    
+    # Seconds a script may run before the interpreter is killed and replaced;
+    # matches the default timeout AppleScript applies to an Apple Event
+    SCRIPT_TIMEOUT = 120.0
+    
+    def __init__(self):
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._disabled = False
+    
+    @property
+    def available(self) -> bool:
+        """Whether the worker can still be used (it is disabled after a failed start)"""
+        return not self._disabled
+    
+    @property
+    def started(self) -> bool:
+        """Whether the interpreter process is running"""
+        return self._process is not None and self._process.returncode is None
+    
+    def _bind_loop(self) -> asyncio.Lock:
+        """Return the lock for the running loop, dropping state bound to an old loop"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self.close()
+            self._loop = loop
+            self._lock = asyncio.Lock()
+        return self._lock
+    
+    async def _read_until(self, marker: str) -> List[str]:
+        """Read output lines until a line containing ``marker`` is seen"""
+        lines = []
+        while True:
+            raw = await self._process.stdout.readline()
+            if not raw:
+                raise WorkerUnavailableError("osascript worker exited unexpectedly")
+            line = raw.decode().rstrip("\n")
+            # Interactive mode decorates output with ">> " prompts and "=> " results
+            while line.startswith(">> "):
+                line = line[3:]
+            if line.startswith("=> "):
+                line = line[3:]
+            if marker in line:
+                return lines
+            if "<<<END:" in line or "<<<READY:" in line:
+                # A marker from another request means output is no longer framed correctly
+                raise WorkerUnavailableError("osascript worker output is out of sync")
+            lines.append(line)
+    
+    async def _start(self) -> None:
+        """Launch the interpreter and wait until it answers a ping"""
+        try:
+            self._process = await asyncio.create_subprocess_exec(
+                "osascript", "-i",
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL
+            )
+            marker = f"<<<READY:{uuid.uuid4().hex}>>>"
+            self._process.stdin.write(f'"{marker}"\n'.encode())
+            await self._process.stdin.drain()
+            await asyncio.wait_for(self._read_until(marker), self.STARTUP_TIMEOUT)
+            logger.debug(f"Started osascript worker (pid {self._process.pid})")
+        except Exception as e:
+            logger.warning(f"Persistent osascript worker unavailable, falling back to one-shot processes: {e}")
+            self.close()
+            self._disabled = True
+            raise WorkerUnavailableError(str(e))
+    
+    async def run(self, script: str, language: str = "AppleScript") -> str:
+        """
+        Execute a script on the persistent interpreter
+        
+        Args:
+            script: The script source to execute
+            language: OSA language of the script ("AppleScript" or "JavaScript")
+            
+        Returns:
+            The output of the script as a string
+            
+        Raises:
+            AppleScriptError: If the script fails, or the interpreter fails
+                after the script was sent to it
+            WorkerUnavailableError: If the interpreter could not be used and
+                the script was not sent, so it is safe to run it elsewhere
+        """
+        if self._disabled:
+            raise WorkerUnavailableError("osascript worker is disabled")
+        
+        async with self._bind_loop():
+            if self._process is None or self._process.returncode is not None:
+                await self._start()
+            
+            token = uuid.uuid4().hex
+            end_marker = f"<<<END:{token}>>>"
+            error_marker = f"<<<ERR:{token}>>>"
+            wrapper = (
+                "try\n"
+                f"set __result to run script {_applescript_literal(script)} in {_applescript_literal(language)}\n"
+                "on error errMsg number errNum\n"
+                f'return "{error_marker}" & errMsg & " (" & errNum & ")"\n'
+                "end try\n"
+                "try\n"
+                "return __result\n"
+                "on error\n"
+                'return ""\n'
+                "end try"
+            )
+            request = f"run script {_applescript_literal(wrapper)}\n\"{end_marker}\"\n"
+            
+            try:
+                self._process.stdin.write(request.encode())
+                await self._process.stdin.drain()
+            except OSError as e:
+                # The script never reached the interpreter, so it may be retried
+                self.close()
+                raise WorkerUnavailableError(str(e))
+            
+            try:
+                lines = await asyncio.wait_for(self._read_until(end_marker), self.SCRIPT_TIMEOUT)
+            except asyncio.TimeoutError:
+                # The script may have had side effects, so it is not retried;
+                # the next call starts a fresh interpreter
+                self.close()
+                raise AppleScriptError(f"AppleScript timed out after {self.SCRIPT_TIMEOUT:.0f}s")
+            except (WorkerUnavailableError, OSError) as e:
+                # The script was sent and may already have run (sent a message,
+                # created a note), so it is not retried either
+                self.close()
+                raise AppleScriptError(f"osascript worker failed while running the script: {e}")
+            
+            output = "\n".join(lines).strip()
+            if output.startswith(error_marker):
+                raise AppleScriptError(f"AppleScript error: {output[len(error_marker):]}")
+            return output
+    
+    async def warm(self) -> None:
+        """Start the interpreter and run a no-op so it is ready for the next script"""
+        try:
+            await self.run('return ""')
+        except (AppleScriptError, WorkerUnavailableError) as e:
+            logger.debug(f"Could not warm osascript worker: {e}")
+    
+    def close(self) -> None:
+        """Terminate the interpreter process if it is running"""
+        if self._process is not None and self._process.returncode is None:
+            try:
+                os.kill(self._process.pid, signal.SIGTERM)
+            except (ProcessLookupError, OSError):
+                pass
+        self._process = None
+
+class AppleScriptPool:
+    """
+    A bounded pool of persistent osascript workers.
+    
+    Idle workers are handed out through an asyncio queue, so independent
+    scripts run concurrently on separate interpreters instead of queueing
+    behind one. The most recently used worker is reused first. The pool
+    tries to keep ``min_idle`` interpreters started and idle: ``prewarm``
+    starts them ahead of the first request, and whenever a borrow leaves
+    fewer warm workers idle, another one is started in the background so a
+    burst of calls does not pay interpreter start-up on the request path.
+    """
+    
+    def __init__(self, size: int = 4, min_idle: int = 2):
+        self.size = size
+        self.min_idle = min(min_idle, size)
+        self._workers = [AppleScriptWorker() for _ in range(size)]
+        self._idle: Optional[asyncio.LifoQueue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._busy: Set[AppleScriptWorker] = set()
+        self._warming: Dict[AppleScriptWorker, asyncio.Task] = {}
+    
+    @property
+    def available(self) -> bool:
+        """Whether any worker in the pool can still be used"""
+        return any(worker.available for worker in self._workers)
+    
+    def _idle_queue(self) -> asyncio.LifoQueue:
+        """Return the idle-worker queue for the running loop"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._idle = asyncio.LifoQueue()
+            self._busy = set()
+            self._warming = {}
+            for worker in reversed(self._workers):
+                self._idle.put_nowait(worker)
+        return self._idle
+    
+    def _refill(self) -> None:
+        """Start cold workers in the background until min_idle warm ones are idle"""
+        warm_idle = sum(
+            1 for worker in self._workers
+            if (worker.started or worker in self._warming) and worker not in self._busy
+        )
+        cold = [
+            worker for worker in self._workers
+            if worker.available and not worker.started
+            and worker not in self._busy and worker not in self._warming
+        ]
+        for worker in cold[:max(0, self.min_idle - warm_idle)]:
+            task = asyncio.get_running_loop().create_task(worker.warm())
+            self._warming[worker] = task
+            task.add_done_callback(lambda _, worker=worker: self._warming.pop(worker, None))
+    
+    async def prewarm(self) -> None:
+        """Start min_idle interpreters so the first scripts do not wait for one"""
+        if not self.available:
+            return
+        self._idle_queue()
+        await asyncio.gather(*(worker.warm() for worker in self._workers[:self.min_idle]))
+    
+    async def run(self, script: str, language: str = "AppleScript") -> str:
+        """
+        Execute a script on the next idle worker
+        
+        Args:
+            script: The script source to execute
+            language: OSA language of the script ("AppleScript" or "JavaScript")
+            
+        Returns:
+            The output of the script as a string
+            
+        Raises:
+            AppleScriptError: If the script fails, or its worker fails after
+                the script was sent
+            WorkerUnavailableError: If no worker could be used and the script
+                was not sent
+        """
+        if not self.available:
+            raise WorkerUnavailableError("no osascript worker is available")
+        
+        idle = self._idle_queue()
+        worker = await idle.get()
+        self._busy.add(worker)
+        self._refill()
+        try:
+            try:
+                return await worker.run(script, language)
+            except WorkerUnavailableError as e:
+                if not worker.available:
+                    raise
+                # The interpreter had died before the script was sent; retry once on a fresh one
+                logger.warning(f"Restarting osascript worker after failure: {e}")
+                return await worker.run(script, language)
+        finally:
+            self._busy.discard(worker)
+            idle.put_nowait(worker)
+    
+    def close(self) -> None:
+        """Terminate every worker process"""
+        for worker in self._workers:
+            worker.close()
+
+# Shared interpreters used by run_applescript_async
+_pool = AppleScriptPool()
+atexit.register(_pool.close)
+
+async def prewarm_applescript() -> None:
+    """Start the shared osascript interpreters before the first script needs them"""
+    await _pool.prewarm()
+
+async def _run_osascript(script: str, language: str = "AppleScript") -> str:
+    """Execute a script in a dedicated, one-shot osascript process"""
+    process = await asyncio.create_subprocess_exec(
+        "osascript", "-l", language, "-e", script,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(), AppleScriptWorker.SCRIPT_TIMEOUT)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        raise AppleScriptError(f"AppleScript timed out after {AppleScriptWorker.SCRIPT_TIMEOUT:.0f}s")
+    
+    if process.returncode != 0:
+        raise AppleScriptError(f"AppleScript error: {stderr.decode().strip()}")
+    
+    return stdout.decode().strip()
+
+async def run_applescript_async(script: str, language: str = "AppleScript") -> str:
     """
     Execute an AppleScript command asynchronously
     
+    Scripts run on a pool of persistent osascript interpreters so that the
+    process start-up cost is paid once per session and concurrent calls do
+    not wait on each other. If no interpreter is available, a one-shot
+    osascript process is used instead. A script that was already sent to an
+    interpreter is never run a second time, since it may have side effects.
+    
     Args:
         script: The AppleScript command to execute
+        language: OSA language of the script, "AppleScript" or "JavaScript"
+            (JXA, which can return JSON through ``JSON.stringify``)
         
     Returns:
         The output of the AppleScript command as a string
@@ -129,8 +526,6 @@ async def run_applescript_async(script: str) -> str:
     Raises:
         AppleScriptError: If the AppleScript command fails
     """
-    import asyncio
-    
     # Custom logging for async function since decorator doesn't work with async functions
     call_id = str(id(script))[:8]
     truncated_script = script[:200] + ("..." if len(script) > 200 else "")
@@ -139,27 +534,23 @@ async def run_applescript_async(script: str) -> str:
     
     start_time = time.time()
     try:
-        process = await asyncio.create_subprocess_exec(
-            "osascript", "-e", script,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
-        )
-        stdout, stderr = await process.communicate()
+        try:
+            output = await _pool.run(script, language)
+        except WorkerUnavailableError:
+            output = await _run_osascript(script, language)
         execution_time = time.time() - start_time
         
-        if process.returncode != 0:
-            error_msg = f"AppleScript error: {stderr.decode().strip()}"
-            logger.error(error_msg)
-            logger.error(f"[{call_id}] run_applescript_async raised AppleScriptError after {execution_time:.4f}s: {error_msg}")
-            raise AppleScriptError(error_msg)
-        
-        output = stdout.decode().strip()
         truncated_output = output[:200] + ("..." if len(output) > 200 else "")
         
         logger.debug(f"Output: {truncated_output}")
         logger.debug(f"[{call_id}] run_applescript_async returned in {execution_time:.4f}s: {truncated_output}")
         
         return output
+    except AppleScriptError as e:
+        execution_time = time.time() - start_time
+        logger.error(str(e))
+        logger.error(f"[{call_id}] run_applescript_async raised AppleScriptError after {execution_time:.4f}s: {e}")
+        raise
     except Exception as e:
         execution_time = time.time() - start_time
         error_msg = f"Error executing AppleScript: {str(e)}"
@@ -167,125 +558,800 @@ async def run_applescript_async(script: str) -> str:
         logger.error(f"[{call_id}] run_applescript_async raised {type(e).__name__} after {execution_time:.4f}s: {str(e)}")
         raise AppleScriptError(error_msg)
 
+async def batch_applescript(scripts: List[str]) -> List[Union[str, AppleScriptError]]:
+    """
+    Execute several independent AppleScript snippets in one round trip
+    
+    Each snippet runs with ``run script`` inside a single script, so a batch
+    costs one call on the worker pool however many snippets it holds. A
+    failing snippet does not stop the others.
+    
+    Args:
+        scripts: The AppleScript snippets to execute; their results are
+            coerced to text, so they should return text, numbers or booleans
+        
+    Returns:
+        One entry per snippet, in order: its result as a string, or an
+        AppleScriptError if it failed
+        
+    Raises:
+        AppleScriptError: If the batch itself could not be run
+    """
+    if not scripts:
+        return []
+    
+    # Each result is prefixed with "0" (success) or "1" (error) and the
+    # results are joined with a separator that cannot occur in them
+    separator = f"<<<BATCH:{uuid.uuid4().hex}>>>"
+    lines = ["set batchResults to {}"]
+    for script in scripts:
+        lines.extend([
+            "try",
+            f"    set end of batchResults to \"0\" & ((run script {_applescript_literal(script)}) as text)",
+            "on error errMsg",
+            "    set end of batchResults to \"1\" & errMsg",
+            "end try",
+        ])
+    lines.extend([
+        "set previousDelimiters to AppleScript's text item delimiters",
+        f"set AppleScript's text item delimiters to {_applescript_literal(separator)}",
+        "set batchOutput to batchResults as text",
+        "set AppleScript's text item delimiters to previousDelimiters",
+        "return batchOutput",
+    ])
+    
+    output = await run_applescript_async("\n".join(lines))
+    results: List[Union[str, AppleScriptError]] = []
+    for part in output.split(separator):
+        if part.startswith("0"):
+            results.append(part[1:])
+        else:
+            results.append(AppleScriptError(f"AppleScript error: {part[1:]}"))
+    return results
+
+# Directory holding compiled .scpt files, named by script name and source hash
+SCRIPT_CACHE_DIR = Path.home() / ".cache" / "macos-mcp"
+
+# Registered script sources, their languages and compiled paths (None if compilation failed)
+_registered_scripts: Dict[str, str] = {}
+_script_languages: Dict[str, str] = {}
+_compiled_scripts: Dict[str, Optional[Path]] = {}
+# Compilations in progress, shared by concurrent first calls of a script
+_compile_tasks: Dict[str, "asyncio.Task"] = {}
+
+def register_script(name: str, source: str, language: str = "AppleScript") -> None:
+    """
+    Register a reusable script under a name
+    
+    The source should read its inputs from ``argv`` in an ``on run argv``
+    handler (``function run(argv)`` in JavaScript). It is compiled to a .scpt
+    file on first use and the compiled file is reused for every later call,
+    so the script does not have to be parsed again.
+    
+    Args:
+        name: Unique name of the script (e.g. "calendar.search_events")
+        source: The script source
+        language: OSA language of the source ("AppleScript" or "JavaScript")
+    """
+    if _registered_scripts.get(name) != source or _script_languages.get(name) != language:
+        _registered_scripts[name] = source
+        _script_languages[name] = language
+        _compiled_scripts.pop(name, None)
+        _compile_tasks.pop(name, None)
+        _native_scripts.pop(name, None)
+
+async def _compile_script(name: str) -> Optional[Path]:
+    """Compile a registered script with osacompile, returning the .scpt path"""
+    source = _registered_scripts[name]
+    language = _script_languages[name]
+    digest = hashlib.sha1(f"{language}:{source}".encode()).hexdigest()[:12]
+    path = SCRIPT_CACHE_DIR / f"{name}-{digest}.scpt"
+    if path.exists():
+        return path
+    
+    try:
+        SCRIPT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        extension = "js" if language == "JavaScript" else "applescript"
+        source_path = path.with_suffix(f".{os.getpid()}.{extension}")
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp.scpt")
+        source_path.write_text(source, encoding="utf-8")
+        process = await asyncio.create_subprocess_exec(
+            "osacompile", "-l", language, "-o", str(tmp_path), str(source_path),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        _, stderr = await process.communicate()
+        source_path.unlink()
+        if process.returncode != 0:
+            logger.warning(f"Could not compile script {name}: {stderr.decode().strip()}")
+            return None
+        os.replace(tmp_path, path)
+        logger.debug(f"Compiled script {name} to {path}")
+        return path
+    except Exception as e:
+        logger.warning(f"Could not compile script {name}, running from source: {e}")
+        return None
+
+async def _compiled_path(name: str) -> Optional[Path]:
+    """Return the compiled .scpt path of a registered script, compiling it on first use"""
+    if name not in _registered_scripts:
+        raise AppleScriptError(f"Unknown script: {name}")
+    if name in _compiled_scripts:
+        return _compiled_scripts[name]
+    
+    # Concurrent first calls wait for one osacompile run; separate runs would
+    # share a source file name and could make each other fail
+    loop = asyncio.get_running_loop()
+    task = _compile_tasks.get(name)
+    if task is None or task.get_loop() is not loop:
+        task = loop.create_task(_compile_script(name))
+        _compile_tasks[name] = task
+    path = await asyncio.shield(task)
+    if _compile_tasks.get(name) is task:
+        del _compile_tasks[name]
+        _compiled_scripts[name] = path
+    return path
+
+async def run_compiled_script(name: str, *args: Any) -> str:
+    """
+    Execute a registered script, passing arguments through ``argv``
+    
+    User input never becomes part of the script source, so it does not need
+    to be escaped and cannot change what the script does.
+    
+    Args:
+        name: Name the script was registered under
+        *args: Values passed to the script's run handler (converted to text)
+        
+    Returns:
+        The output of the script as a string
+        
+    Raises:
+        AppleScriptError: If the script fails
+    """
+    return await run_applescript_async(await _compiled_invocation(name, args))
+
+async def _compiled_invocation(name: str, args: Tuple[Any, ...]) -> str:
+    """Build the ``run script`` command running a registered script with arguments"""
+    path = await _compiled_path(name)
+    parameters = "{" + ", ".join(_applescript_literal(str(arg)) for arg in args) + "}"
+    if path is not None:
+        target = f"(POSIX file {_applescript_literal(str(path))})"
+    else:
+        language = _applescript_literal(_script_languages[name])
+        target = f"{_applescript_literal(_registered_scripts[name])} in {language}"
+    return f"run script {target} with parameters {parameters}"
+
+async def batch_compiled_scripts(names: List[str]) -> List[Union[str, AppleScriptError]]:
+    """
+    Execute several registered scripts, without arguments, in one round trip
+    
+    Args:
+        names: Names the scripts were registered under
+        
+    Returns:
+        One entry per script, in order, as returned by batch_applescript
+        
+    Raises:
+        AppleScriptError: If the batch itself could not be run
+    """
+    return await batch_applescript([await _compiled_invocation(name, ()) for name in names])
+
+def _osascript_command(name: str, path: Optional[Path], args: Tuple[Any, ...], *options: str) -> List[str]:
+    """Build the osascript command line running a registered script in its own process"""
+    if path is not None:
+        command = ["osascript", *options, str(path)]
+    else:
+        command = ["osascript", *options, "-l", _script_languages[name], "-e", _registered_scripts[name]]
+    command.extend(str(arg) for arg in args)
+    return command
+
+async def run_source_script(name: str, *args: Any) -> str:
+    """
+    Execute a registered script and return its result in source form
+    
+    Text in the result stays quoted and escaped, so it can be parsed back
+    exactly with parse_applescript_record even when it contains commas or
+    braces. The human-readable output of run_compiled_script drops those
+    quotes. The script runs in a one-shot osascript process, since the
+    persistent interpreters only print the human-readable form.
+    
+    Args:
+        name: Name the script was registered under
+        *args: Values passed to the script's run handler (converted to text)
+        
+    Returns:
+        The script's result as AppleScript source text
+        
+    Raises:
+        AppleScriptError: If the script fails
+    """
+    path = await _compiled_path(name)
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *_osascript_command(name, path, args, "-s", "s"),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+    except OSError as e:
+        raise AppleScriptError(f"Error executing AppleScript: {e}")
+    
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(), AppleScriptWorker.SCRIPT_TIMEOUT)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        raise AppleScriptError(f"AppleScript timed out after {AppleScriptWorker.SCRIPT_TIMEOUT:.0f}s")
+    
+    if process.returncode != 0:
+        raise AppleScriptError(f"AppleScript error: {stderr.decode().strip()}")
+    
+    return stdout.decode().strip()
+
+async def stream_compiled_script(name: str, *args: Any) -> AsyncIterator[str]:
+    """
+    Execute a registered script and yield each line it logs as it is written
+    
+    The script runs in its own osascript process and reports results with
+    ``log`` (``console.log`` in JavaScript), which osascript writes to stderr
+    line by line. Lines are yielded
+    while the script is still running, so callers can start processing
+    before the whole result is available.
+    
+    Args:
+        name: Name the script was registered under
+        *args: Values passed to the script's run handler (converted to text)
+        
+    Yields:
+        Each logged line, without the trailing newline
+        
+    Raises:
+        AppleScriptError: If the script fails
+    """
+    path = await _compiled_path(name)
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *_osascript_command(name, path, args),
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+            limit=2 ** 20
+        )
+    except OSError as e:
+        raise AppleScriptError(f"Error executing AppleScript: {e}")
+    
+    last_line = ""
+    try:
+        async for raw in process.stderr:
+            last_line = raw.decode().rstrip("\n")
+            yield last_line
+        await process.wait()
+    finally:
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+    
+    if process.returncode != 0:
+        raise AppleScriptError(f"AppleScript error: {last_line}")
+
+# Characters that change the list splitter's state; an escape is taken with
+# the character it escapes, or alone at the end of a chunk
+_LIST_TOKEN_RE = re.compile(r'\\.|[{}",\\]', re.DOTALL)
+
+class _ListItemSplitter:
+    """
+    Split an AppleScript list into its top-level items as text arrives
+    
+    Text can be fed in chunks of any size; quotes, escapes and nesting are
+    tracked across chunk boundaries.
+    """
+    
+    def __init__(self):
+        self._depth = 0
+        self._in_string = False
+        self._escape_pending = False
+        self._pending: List[str] = []
+    
+    def feed(self, text: str) -> List[str]:
+        """
+        Add text and return the items it completed
+        
+        Args:
+            text: The next piece of the list's source text
+            
+        Returns:
+            The raw text of each completed top-level item
+        """
+        items = []
+        start = 0
+        scan_from = 0
+        if self._escape_pending and text:
+            # The previous chunk ended on a backslash; this character is escaped
+            self._escape_pending = False
+            scan_from = 1
+        for match in _LIST_TOKEN_RE.finditer(text, scan_from):
+            token = match.group()
+            if token[0] == '\\':
+                if len(token) == 1:
+                    self._escape_pending = True
+                continue
+            if self._in_string:
+                if token == '"':
+                    self._in_string = False
+            elif token == '"':
+                self._in_string = True
+            elif token == '{':
+                self._depth += 1
+                if self._depth == 1:
+                    # Opening brace of the list itself
+                    self._pending.clear()
+                    start = match.end()
+            elif token == '}':
+                self._depth -= 1
+                if self._depth == 0:
+                    self._pending.append(text[start:match.start()])
+                    item = "".join(self._pending)
+                    if item.strip():
+                        items.append(item)
+                    self._pending.clear()
+                    start = match.end()
+            elif self._depth == 1:
+                self._pending.append(text[start:match.start()])
+                items.append("".join(self._pending))
+                self._pending.clear()
+                start = match.end()
+        if self._depth:
+            self._pending.append(text[start:])
+        return items
+
+async def stream_script_list(
+    name: str,
+    *args: Any,
+    parse: Optional[Callable[[str], Any]] = None
+) -> AsyncIterator[Any]:
+    """
+    Execute a registered script returning a list and yield each item as it is read
+    
+    The result is read from osascript in chunks and split as it arrives, so
+    callers parse each item while the rest is still being transferred and
+    the whole result is never held as one string.
+    
+    Args:
+        name: Name the script was registered under
+        *args: Values passed to the script's run handler (converted to text)
+        parse: Optional parser applied to each item; the items completed by
+            each chunk are parsed together in a worker thread so large
+            results do not block the event loop
+        
+    Yields:
+        Each top-level item, as parse_applescript_list would return it, or
+        its parsed value if a parser is given
+        
+    Raises:
+        AppleScriptError: If the script fails
+    """
+    path = await _compiled_path(name)
+    try:
+        # "-s s" prints the result as source text, so item boundaries are unambiguous
+        process = await asyncio.create_subprocess_exec(
+            *_osascript_command(name, path, args, "-s", "s"),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+    except OSError as e:
+        raise AppleScriptError(f"Error executing AppleScript: {e}")
+    
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    splitter = _ListItemSplitter()
+    try:
+        while True:
+            chunk = await process.stdout.read(2 ** 16)
+            items = [_clean_list_item(item) for item in splitter.feed(decoder.decode(chunk, final=not chunk))]
+            if parse is not None and items:
+                items = await asyncio.to_thread(lambda batch=items: [parse(item) for item in batch])
+            for item in items:
+                yield item
+            if not chunk:
+                break
+        error = await process.stderr.read()
+        await process.wait()
+    finally:
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+    
+    if process.returncode != 0:
+        raise AppleScriptError(f"AppleScript error: {error.decode().strip()}")
+
+# Whether scripts can run in-process through NSAppleScript (PyObjC is installed)
+NATIVE_SCRIPTS_AVAILABLE = NSAppleScript is not None
+
+# NSAppleScript is not thread-safe, so every native call runs on this one thread.
+# Apple documents NSAppleScript as main-thread only, but here the main thread
+# runs the event loop, and a script waiting on an Apple Event would stall every
+# request. The OSA component it wraps works from a secondary thread as long as
+# calls never overlap, which a single worker thread guarantees.
+_native_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="nsapplescript")
+_native_scripts: Dict[str, Any] = {}
+
+# Record keys that AppleScript stores as keywords rather than as user fields
+_RECORD_KEYWORDS = {"pnam": "name", "ldt ": "date", "pcls": "class", "ID  ": "id"}
+
+def _fourcc(code: int) -> str:
+    """Convert an OSType code to its four-character string"""
+    return code.to_bytes(4, "big").decode("mac_roman")
+
+def _code(text: str) -> int:
+    """Convert a four-character string to an OSType code"""
+    return int.from_bytes(text.encode("mac_roman"), "big")
+
+def descriptor_to_python(descriptor: Any) -> Any:
+    """
+    Convert an NSAppleEventDescriptor returned by a script into Python values
+    
+    Lists become lists, records become dicts, and text, numbers, booleans,
+    dates and missing value become their Python counterparts, so results do
+    not have to be printed as text and parsed again.
+    
+    Args:
+        descriptor: The descriptor to convert
+        
+    Returns:
+        The equivalent Python value
+    """
+    kind = _fourcc(descriptor.descriptorType())
+    if kind == "list":
+        return [
+            descriptor_to_python(descriptor.descriptorAtIndex_(i))
+            for i in range(1, descriptor.numberOfItems() + 1)
+        ]
+    if kind == "reco":
+        record = {}
+        for i in range(1, descriptor.numberOfItems() + 1):
+            keyword = _fourcc(descriptor.keywordForDescriptorAtIndex_(i))
+            value = descriptor.descriptorAtIndex_(i)
+            if keyword == "usrf":
+                # User-defined fields arrive as one flat {key, value, key, value} list
+                fields = descriptor_to_python(value)
+                record.update(zip(map(sys.intern, fields[::2]), fields[1::2]))
+            else:
+                record[_RECORD_KEYWORDS.get(keyword, keyword)] = descriptor_to_python(value)
+        return record
+    if kind in ("true", "fals", "bool"):
+        return bool(descriptor.booleanValue())
+    if kind in ("shor", "long"):
+        return int(descriptor.int32Value())
+    if kind == "comp":
+        return int(descriptor.stringValue())
+    if kind in ("sing", "doub", "exte"):
+        return float(descriptor.doubleValue())
+    if kind == "ldt ":
+        return datetime.fromtimestamp(descriptor.dateValue().timeIntervalSince1970()).strftime("%Y-%m-%d %H:%M:%S")
+    if kind == "null" or (kind == "type" and _fourcc(descriptor.typeCodeValue()) == "msng"):
+        return None
+    return descriptor.stringValue()
+
+def _load_native(name: str, path: Optional[Path]) -> Any:
+    """
+    Return the resident NSAppleScript for a registered script, loading it once
+    
+    Scripts are loaded from their osacompile output when there is one, and
+    compiled from source otherwise. Either way the compiled object is kept
+    for the life of the process (until the script is registered again), so
+    later calls only build an Apple Event and execute it.
+    """
+    script = _native_scripts.get(name)
+    if script is not None:
+        return script
+    
+    if path is not None:
+        script, error = NSAppleScript.alloc().initWithContentsOfURL_error_(NSURL.fileURLWithPath_(str(path)), None)
+    else:
+        script, error = NSAppleScript.alloc().initWithSource_(_registered_scripts[name]), None
+        if script is not None and not script.isCompiled():
+            compiled, error = script.compileAndReturnError_(None)
+            if not compiled:
+                script = None
+    if script is None:
+        raise AppleScriptError(f"AppleScript error: could not load {name}: {error}")
+    _native_scripts[name] = script
+    return script
+
+def _run_native(name: str, path: Optional[Path], args: tuple) -> Any:
+    """Execute a registered script with NSAppleScript (runs on the native thread)"""
+    script = _load_native(name, path)
+    
+    parameters = NSAppleEventDescriptor.listDescriptor()
+    for index, arg in enumerate(args, 1):
+        parameters.insertDescriptor_atIndex_(NSAppleEventDescriptor.descriptorWithString_(str(arg)), index)
+    # A "run" event (aevt/oapp) with the arguments as its direct parameter
+    event = NSAppleEventDescriptor.appleEventWithEventClass_eventID_targetDescriptor_returnID_transactionID_(
+        _code("aevt"), _code("oapp"), NSAppleEventDescriptor.nullDescriptor(), -1, 0
+    )
+    event.setParamDescriptor_forKeyword_(parameters, _code("----"))
+    
+    result, error = script.executeAppleEvent_error_(event, None)
+    if result is None:
+        message = error.get("NSAppleScriptErrorMessage", str(error)) if error else "unknown error"
+        raise AppleScriptError(f"AppleScript error: {message}")
+    return descriptor_to_python(result)
+
+async def run_native_script(name: str, *args: Any) -> Any:
+    """
+    Execute a registered AppleScript in-process and return its result as Python values
+    
+    The script runs through NSAppleScript and its result descriptor is
+    converted structurally with ``descriptor_to_python``, skipping the
+    text round trip and ``parse_applescript_list``. Only available when
+    ``NATIVE_SCRIPTS_AVAILABLE`` is true.
+    
+    A script that does not finish within ``AppleScriptWorker.SCRIPT_TIMEOUT``
+    raises AppleScriptError. The thread cannot be interrupted, so it finishes
+    the script in the background (Apple Events time out on their own) and
+    later native calls wait for it.
+    
+    Args:
+        name: Name the script was registered under
+        *args: Values passed to the script's run handler (converted to text)
+        
+    Returns:
+        The script's result as lists, dicts and scalars
+        
+    Raises:
+        AppleScriptError: If the script fails or times out
+    """
+    if not NATIVE_SCRIPTS_AVAILABLE:
+        raise AppleScriptError("NSAppleScript is not available")
+    path = await _compiled_path(name)
+    loop = asyncio.get_running_loop()
+    try:
+        return await asyncio.wait_for(
+            loop.run_in_executor(_native_executor, _run_native, name, path, args),
+            AppleScriptWorker.SCRIPT_TIMEOUT
+        )
+    except asyncio.TimeoutError:
+        raise AppleScriptError(f"AppleScript timed out after {AppleScriptWorker.SCRIPT_TIMEOUT:.0f}s")
+    except AppleScriptError:
+        raise
+    except Exception as e:
+        raise AppleScriptError(f"Error executing AppleScript: {e}")
+
+async def run_record_script(name: str, *args: Any) -> Dict[str, Any]:
+    """
+    Execute a registered script that returns a single record
+    
+    The record is converted in-process when NSAppleScript is available and
+    parsed from the script's source-form output otherwise.
+    
+    Args:
+        name: Name the script was registered under
+        *args: Values passed to the script's run handler (converted to text)
+        
+    Returns:
+        The record as a dictionary
+        
+    Raises:
+        AppleScriptError: If the script fails
+    """
+    if NATIVE_SCRIPTS_AVAILABLE:
+        return await run_native_script(name, *args)
+    return parse_applescript_record(await run_source_script(name, *args))
+
+def json_loads(data: Union[str, bytes]) -> Any:
+    """
+    Decode JSON written by a script (JXA ``JSON.stringify`` output)
+    
+    Uses orjson when it is installed and the standard library otherwise.
+    
+    Args:
+        data: The JSON text
+        
+    Returns:
+        The decoded value
+        
+    Raises:
+        ValueError: If the text is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+# Quoted string with backslash escapes
+_STRING_PATTERN = r'"[^"\\]*(?:\\.[^"\\]*)*"'
+# Balanced braces nested at most two deep, e.g. a record holding a list
+_GROUP_PATTERN = r'\{(?:[^{}"]|%s|\{(?:[^{}"]|%s)*\})*\}' % (_STRING_PATTERN, _STRING_PATTERN)
+# Structural tokens of AppleScript output. Strings and shallow groups are
+# matched whole so the scan skips them in C; a lone quote is an unterminated
+# string and lone braces are deeper nesting, tracked by depth.
+_STRUCTURE_RE = re.compile(r'[,:]|%s|%s|"|[{}]' % (_STRING_PATTERN, _GROUP_PATTERN))
+# One list item (a string, a shallow group or bare text) and the comma after it
+_LIST_ITEM_RE = re.compile(r'\s*(%s|%s|[^,{}"]*?)\s*(?:,|$)' % (_STRING_PATTERN, _GROUP_PATTERN))
+# One "key:value" or "key:=value" record field and the comma after it
+_RECORD_FIELD_RE = re.compile(
+    r'\s*([^:,{}"]+?)\s*:=?\s*(%s|%s|[^,{}"]*?)\s*(?:,|$)' % (_STRING_PATTERN, _GROUP_PATTERN)
+)
+
+def _top_level_indexes(text: str, targets: str) -> List[int]:
+    """
+    Find target characters that are outside quoted strings and braces
+    
+    The text is scanned once with a precompiled pattern, so only separators
+    and deeply nested braces are visited from Python.
+    
+    Args:
+        text: The text to scan
+        targets: The characters to look for (e.g. "," or ":")
+        
+    Returns:
+        The indexes of the matching characters, in order
+    """
+    indexes = []
+    depth = 0
+    for match in _STRUCTURE_RE.finditer(text):
+        token = match.group()
+        if len(token) != 1:
+            # A whole string or brace group
+            continue
+        if token == '{':
+            depth += 1
+        elif token == '}':
+            if depth:
+                depth -= 1
+        elif token == '"':
+            break
+        elif depth == 0 and token in targets:
+            indexes.append(match.start())
+    return indexes
+
+def _split_top_level(text: str) -> List[str]:
+    """Split text on commas that are outside quoted strings and braces"""
+    parts = []
+    start = 0
+    for index in _top_level_indexes(text, ","):
+        parts.append(text[start:index])
+        start = index + 1
+    parts.append(text[start:])
+    return parts
+
+def _strip_braces(output: str) -> str:
+    """Remove the braces around an AppleScript list or record, if present"""
+    output = output.strip()
+    if output.startswith('{') and output.endswith('}'):
+        return output[1:-1]
+    return output
+
+# Backslash escapes AppleScript writes inside quoted text in source form
+_ESCAPE_RE = re.compile(r'\\(.)', re.DOTALL)
+_ESCAPED_CHARACTERS = {"n": "\n", "t": "\t", "r": "\r"}
+
+def _unquote(text: str) -> str:
+    """Remove the quotes around an AppleScript string literal and undo its escapes"""
+    text = text[1:-1]
+    if "\\" not in text:
+        return text
+    return _ESCAPE_RE.sub(lambda match: _ESCAPED_CHARACTERS.get(match.group(1), match.group(1)), text)
+
+def _clean_list_item(item: str) -> str:
+    """Strip whitespace and the quotes and escapes of a text item of a list"""
+    item = item.strip()
+    if len(item) > 1 and item.startswith('"') and item.endswith('"'):
+        item = _unquote(item)
+    return item
+
+def _is_record(inner: str) -> bool:
+    """Whether the contents of a braced value form a record rather than a list"""
+    fields = _top_level_indexes(inner, ",:")
+    return bool(fields) and inner[fields[0]] == ':'
+
 @log_execution_time
 def parse_applescript_list(output: str) -> List[str]:
     """
     Parse an AppleScript list result into a Python list
     
+    Commas inside quoted strings and nested lists or records do not split
+    items, so a list of records yields one item per record.
+    
     Args:
         output: The AppleScript output string containing a list
         
     Returns:
         A Python list of strings parsed from the AppleScript output
     """
-    truncated_output = output[:50] + ("..." if len(output) > 50 else "")
-    logger.debug(f"Parsing AppleScript list: {truncated_output}")
+    if logger.isEnabledFor(logging.DEBUG):
+        truncated_output = output[:50] + ("..." if len(output) > 50 else "")
+        logger.debug(f"Parsing AppleScript list: {truncated_output}")
     
+    output = _strip_braces(output)
     if not output:
         logger.debug("Empty list input, returning empty list")
         return []
     
-    # Remove leading/trailing braces if present
-    output = output.strip()
-    if output.startswith('{') and output.endswith('}'):
-        output = output[1:-1]
-        logger.debug("Removed braces from list")
-    
-    # Split by commas, handling quoted items correctly
+    # Common case: every item matches the item pattern back to back
     result = []
-    current = ""
-    in_quotes = False
-    
-    for char in output:
-        if char == '"' and (not current or current[-1] != '\\'):
-            in_quotes = not in_quotes
-            current += char
-        elif char == ',' and not in_quotes:
-            result.append(current.strip())
-            current = ""
-        else:
-            current += char
+    position = 0
+    length = len(output)
+    while position < length:
+        match = _LIST_ITEM_RE.match(output, position)
+        if match is None or match.end() == position:
+            break
+        result.append(_clean_list_item(match.group(1)))
+        position = match.end()
+    else:
+        logger.debug(f"Parsed list with {len(result)} items")
+        return result
     
-    if current:
-        result.append(current.strip())
+    # Deep nesting or unterminated strings: split on top-level commas instead
+    items = _split_top_level(output)
+    # A trailing separator does not start another item
+    if not items[-1]:
+        items.pop()
     
-    # Clean up any quotes
-    cleaned_result = []
-    for item in result:
-        item = item.strip()
-        if item.startswith('"') and item.endswith('"'):
-            item = item[1:-1]
-        cleaned_result.append(item)
+    result = [_clean_list_item(item) for item in items]
     
-    logger.debug(f"Parsed list with {len(cleaned_result)} items")
+    logger.debug(f"Parsed list with {len(result)} items")
     
-    return cleaned_result
+    return result
 
 @log_execution_time
 def parse_applescript_record(output: str) -> Dict[str, Any]:
     """
     Parse an AppleScript record into a Python dictionary
     
+    Both ``key:value`` and ``key:=value`` pairs are accepted. Nested records
+    are kept as their string representation; nested lists are parsed. Keys
+    are interned, so the records of a long list share one string per key.
+    
     Args:
         output: The AppleScript output string containing a record
         
     Returns:
         A Python dictionary parsed from the AppleScript record
     """
-    truncated_output = output[:50] + ("..." if len(output) > 50 else "")
-    logger.debug(f"Parsing AppleScript record: {truncated_output}")
+    if logger.isEnabledFor(logging.DEBUG):
+        truncated_output = output[:50] + ("..." if len(output) > 50 else "")
+        logger.debug(f"Parsing AppleScript record: {truncated_output}")
     
+    output = _strip_braces(output)
     if not output:
         logger.debug("Empty record input, returning empty dictionary")
         return {}
     
-    # Remove leading/trailing braces if present
-    output = output.strip()
-    if output.startswith('{') and output.endswith('}'):
-        output = output[1:-1]
-        logger.debug("Removed braces from record")
-    
-    # Parse key-value pairs
+    # Common case: every field matches the field pattern back to back
     result = {}
-    current_key = None
-    current_value = ""
-    in_quotes = False
-    i = 0
-    
-    while i < len(output):
-        if output[i:i+2] == ':=' and not in_quotes and current_key is None:
-            # Key definition
-            current_key = current_value.strip()
-            current_value = ""
-            i += 2
-            logger.debug(f"Found key: {current_key}")
-        elif output[i] == ',' and not in_quotes and current_key is not None:
-            # End of key-value pair
-            parsed_value = parse_value(current_value.strip())
-            result[current_key] = parsed_value
-            logger.debug(f"Added key-value pair: {current_key}={type(parsed_value).__name__}")
-            current_key = None
-            current_value = ""
-            i += 1
-        elif output[i] == '"' and (not current_value or current_value[-1] != '\\'):
-            # Toggle quote state
-            in_quotes = not in_quotes
-            current_value += output[i]
-            i += 1
-        else:
-            current_value += output[i]
-            i += 1
+    position = 0
+    length = len(output)
+    while position < length:
+        match = _RECORD_FIELD_RE.match(output, position)
+        if match is None:
+            break
+        result[sys.intern(match.group(1))] = parse_value(match.group(2))
+        position = match.end()
+    else:
+        logger.debug(f"Parsed record with {len(result)} key-value pairs")
+        return result
     
-    # Add the last key-value pair
-    if current_key is not None:
-        parsed_value = parse_value(current_value.strip())
-        result[current_key] = parsed_value
-        logger.debug(f"Added final key-value pair: {current_key}={type(parsed_value).__name__}")
+    # Deep nesting or unusual values: split on top-level separators instead
+    result = {}
+    for field in _split_top_level(output):
+        separators = _top_level_indexes(field, ":")
+        if not separators:
+            continue
+        key = field[:separators[0]].strip()
+        value = field[separators[0] + 1:]
+        if value.startswith("="):
+            value = value[1:]
+        result[sys.intern(key)] = parse_value(value.strip())
     
     logger.debug(f"Parsed record with {len(result)} key-value pairs")
     
     return result
 
+# Numeric tokens in AppleScript output ("42", "-3.5", "1.0E+6")
+_INT_RE = re.compile(r"-?\d+")
+_FLOAT_RE = re.compile(r"-?\d+\.\d+(?:[eE][+-]?\d+)?")
+
+# Lower-cased keywords with a fixed Python value
+_KEYWORD_VALUES = {"true": True, "false": False, "missing value": None}
+
 def parse_value(value: str) -> Any:
     """
     Parse a value from AppleScript output into an appropriate Python type
@@ -296,62 +1362,55 @@ def parse_value(value: str) -> Any:
     Returns:
         The parsed value as an appropriate Python type
     """
-    original_value = value
     value = value.strip()
+    if not value:
+        return value
+    first = value[0]
     
     # Handle quoted strings
-    if value.startswith('"') and value.endswith('"'):
-        result = value[1:-1]
-        logger.debug(f"Parsed quoted string: '{result}'")
-        return result
+    if first == '"' and value.endswith('"') and len(value) > 1:
+        return _unquote(value)
     
-    # Handle numbers
-    try:
-        if '.' in value:
-            result = float(value)
-            logger.debug(f"Parsed float: {result}")
-            return result
-        result = int(value)
-        logger.debug(f"Parsed integer: {result}")
-        return result
-    except ValueError:
-        # Not a number, continue with other types
-        pass
-    
-    # Handle booleans
-    if value.lower() == 'true':
-        logger.debug("Parsed boolean: True")
-        return True
-    if value.lower() == 'false':
-        logger.debug("Parsed boolean: False")
-        return False
-    
-    # Handle missing values
-    if value.lower() == 'missing value':
-        logger.debug("Parsed missing value as None")
-        return None
+    # Handle numbers; only tokens that can be numeric reach the regexes
+    if first == '-' or first.isdigit():
+        if _INT_RE.fullmatch(value):
+            return int(value)
+        if _FLOAT_RE.fullmatch(value):
+            return float(value)
+        return value
     
-    # Handle lists
-    if value.startswith('{') and value.endswith('}'):
+    # Handle booleans and missing values
+    lowered = value.lower()
+    if lowered in _KEYWORD_VALUES:
+        return _KEYWORD_VALUES[lowered]
+    
+    if first == '{' and value.endswith('}'):
+        # Nested records are kept as strings
+        if _is_record(value[1:-1]):
+            logger.debug("Keeping nested record as string")
+            return value
         result = parse_applescript_list(value)
         logger.debug(f"Parsed nested list with {len(result)} items")
         return result
     
     # Return as string by default
-    logger.debug(f"No specific type detected, returning as string: '{value}'")
     return value
 
 def escape_string(s: str) -> str:
     """
     Escape special characters in a string for use in AppleScript
     
+    Backslashes are escaped first, so a trailing backslash in user input
+    cannot swallow the closing quote of the literal. Apostrophes need no
+    escape inside AppleScript's double-quoted strings and are left as they are.
+    
     Args:
         s: The string to escape
         
     Returns:
         The escaped string
     """
-    return s.replace('"', '\\"').replace("'", "\\'")
+    return s.replace("\\", "\\\\").replace('"', '\\"')
 
 def format_applescript_value(value: Any) -> str:
     """
@@ -385,7 +1444,7 @@ def format_applescript_value(value: Any) -> str:
         pairs = [f"{k}:{format_applescript_value(v)}" for k, v in value.items()]
         return "{" + ", ".join(pairs) + "}"
     else:
-        result = f'"{escape_string(str(value))}"'
+        result = _applescript_literal(str(value))
         logger.debug(f"Formatting string as {result}")
         return result
 
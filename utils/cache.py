@@ -0,0 +1,246 @@
+"""
+Cache utility module for read-only AppleScript queries.
+
+This module provides a small TTL cache shared by the application modules so
+that repeated reads (contacts, calendar searches, map lookups) do not pay for
+another AppleScript round trip, and a decorator to apply it to async methods.
+"""
+
+import asyncio
+import copy
+import functools
+import inspect
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Seconds a confirmed automation access is trusted before it is checked again
+ACCESS_MAX_AGE = 300
+
+# Calls currently loading a value, by cache key
+_inflight: Dict[Tuple[Hashable, ...], "asyncio.Task"] = {}
+
+class TTLCache:
+    """
+    A size-bounded cache whose entries expire after a per-entry TTL.
+
+    Keys are tuples whose first element is a namespace string such as
+    ``"cal:events:search"``, which lets writes drop every related entry with
+    ``invalidate_prefix``. Each invalidation bumps ``generation``, so a load
+    that started before it can tell that its result may be stale.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self.generation = 0
+        self._entries: "OrderedDict[Tuple[Hashable, ...], Tuple[Optional[float], Any]]" = OrderedDict()
+
+    def get(self, key: Tuple[Hashable, ...]) -> Any:
+        """
+        Look up a cached value
+
+        Args:
+            key: The cache key
+
+        Returns:
+            The cached value, or None if it is missing or expired
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Tuple[Hashable, ...], value: Any, ttl_seconds: Optional[float]) -> None:
+        """
+        Store a value
+
+        Args:
+            key: The cache key
+            value: The value to store
+            ttl_seconds: Lifetime of the entry in seconds, or None to keep it for the session
+        """
+        expires_at = None if ttl_seconds is None else time.monotonic() + ttl_seconds
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate_prefix(self, prefix: str) -> None:
+        """
+        Drop every entry whose namespace starts with the prefix
+
+        Loads of those keys that are still running are forgotten too, so later
+        calls read the application again instead of joining them.
+
+        Args:
+            prefix: Namespace prefix, e.g. "cal:events"
+        """
+        self.generation += 1
+        for key in [key for key in _inflight if str(key[0]).startswith(prefix)]:
+            del _inflight[key]
+        stale = [key for key in self._entries if str(key[0]).startswith(prefix)]
+        for key in stale:
+            del self._entries[key]
+        if stale:
+            logger.debug(f"Invalidated {len(stale)} cache entries for {prefix}")
+
+    def clear(self) -> None:
+        """Drop every entry"""
+        self.generation += 1
+        _inflight.clear()
+        self._entries.clear()
+
+# Cache shared by all application modules
+cache = TTLCache()
+
+class AccessCache:
+    """
+    Remembers that an application granted automation access.
+
+    Only a successful check is kept: a denied check is repeated on the next
+    call, so access granted in System Settings is picked up without a
+    restart. Modules call ``reset`` when an operation fails so the next
+    check asks the application again. Concurrent checks share one probe.
+    A confirmed access is also checked again once it is ``max_age`` seconds
+    old (never, if ``max_age`` is None).
+    """
+
+    def __init__(self, max_age: Optional[float] = ACCESS_MAX_AGE):
+        self.max_age = max_age
+        self._granted_at: Optional[float] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    @property
+    def granted(self) -> bool:
+        """True while a confirmed access is remembered and not older than max_age"""
+        if self._granted_at is None:
+            return False
+        if self.max_age is not None and time.monotonic() - self._granted_at >= self.max_age:
+            self._granted_at = None
+            return False
+        return True
+
+    @granted.setter
+    def granted(self, value: bool) -> None:
+        self._granted_at = time.monotonic() if value else None
+
+    async def check(self, probe: Callable[[], Awaitable[bool]]) -> bool:
+        """
+        Return True if access was already confirmed, otherwise run the probe
+
+        Args:
+            probe: Coroutine function asking the application for access
+
+        Returns:
+            True if the application is accessible, False otherwise
+        """
+        if self.granted:
+            return True
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if not self.granted:
+                self.granted = bool(await probe())
+            return self.granted
+
+    async def record(self, granted: bool) -> bool:
+        """
+        Store the result of a probe that was run elsewhere
+
+        Used when several applications are probed together. The result is
+        stored under the same lock as ``check``, so it cannot interleave with
+        a probe that is already running.
+
+        Args:
+            granted: Whether the probe found the application accessible
+
+        Returns:
+            True if the application is accessible, False otherwise
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if not self.granted:
+                self.granted = granted
+            return self.granted
+
+    def reset(self) -> None:
+        """Forget the confirmed access so the next check probes again"""
+        self.granted = False
+
+def ttl_cache(ttl: Optional[float], key: Callable[..., Tuple[Hashable, ...]]) -> Callable:
+    """
+    Decorator caching the result of an async method in the shared cache
+
+    Empty results and results with ``success`` set to False are not cached:
+    the modules report errors that way, so those calls are retried instead of
+    being served from the cache.
+
+    The cache is checked before anything is awaited, so a hit returns without
+    yielding to the event loop. Concurrent calls with the same key while the
+    value is loading share a single call of the method. Callers other than
+    the one that ran the method get their own deep copy, so changing a
+    returned list or dictionary does not change what later calls see. A
+    result is not cached if the cache was invalidated while it was loading.
+
+    Args:
+        ttl: Lifetime of cached results in seconds, or None for the session
+        key: Called with the method's arguments by name (defaults applied);
+            returns the cache key
+
+    Returns:
+        The decorator
+    """
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            cache_key = key(**bound.arguments)
+
+            value = cache.get(cache_key)
+            if value is not None:
+                logger.debug(f"Cache hit for {cache_key[0]}")
+                return copy.deepcopy(value)
+
+            loop = asyncio.get_running_loop()
+            task = _inflight.get(cache_key)
+            joined = task is not None and task.get_loop() is loop
+            if not joined:
+                generation = cache.generation
+
+                async def load() -> Any:
+                    result = await func(*args, **kwargs)
+                    if (
+                        result
+                        and not (isinstance(result, dict) and result.get("success") is False)
+                        and cache.generation == generation
+                    ):
+                        cache.set(cache_key, copy.deepcopy(result), ttl)
+                    return result
+
+                task = loop.create_task(load())
+                _inflight[cache_key] = task
+                task.add_done_callback(
+                    lambda done: _inflight.pop(cache_key, None) if _inflight.get(cache_key) is done else None
+                )
+            else:
+                logger.debug(f"Joining in-flight call for {cache_key[0]}")
+
+            # Shielded so one caller being cancelled does not cancel the others
+            result = await asyncio.shield(task)
+            return copy.deepcopy(result) if joined else result
+
+        return wrapper
+
+    return decorator
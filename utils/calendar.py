@@ -1,177 +1,564 @@
 """Calendar module for interacting with Apple Calendar."""
 
+import asyncio
 import logging
-from typing import Dict, List, Any, Optional
+import re
+import threading
+import time
+from typing import AsyncIterator, Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
 
 from .applescript import (
-    run_applescript_async, 
-    AppleScriptError, 
-    format_applescript_value,
-    parse_applescript_record,
-    parse_applescript_list
+    run_compiled_script,
+    stream_compiled_script,
+    register_script,
+    json_loads,
+    AppleScriptError
 )
+from .cache import cache, ttl_cache, AccessCache
+
+try:
+    from EventKit import (
+        EKEventStore,
+        EKEvent,
+        EKEntityTypeEvent,
+        EKSpanThisEvent,
+    )
+    from Foundation import NSDate
+except ImportError:
+    EKEventStore = None
 
 logger = logging.getLogger(__name__)
 
+# EKAuthorizationStatus values that allow reading and writing events
+# (3 is "authorized", 4 is "full access" on macOS 14 and later)
+EVENTKIT_AUTHORIZED_STATUSES = (3, 4)
+
+# Date ranges longer than this are queried as concurrent windows of this size
+EVENT_QUERY_WINDOW = timedelta(days=7)
+
+# Windows queried at the same time; each runs its own osascript process, so
+# this matches the size of the shared AppleScript interpreter pool
+MAX_CONCURRENT_WINDOWS = 4
+
+# Dates read by the event script's parseDate: YYYY-MM-DD with an optional time
+_DATE_RE = re.compile(r"(\d{4})-(\d{2})-(\d{2})(?:[ T](\d{2}):(\d{2})(?::(\d{2}))?)?")
+# Common spellings parseDate leaves to JavaScript's Date parser
+_FALLBACK_DATE_FORMATS = (
+    "%m/%d/%Y", "%m/%d/%Y %H:%M", "%m/%d/%Y %H:%M:%S",
+    "%B %d, %Y", "%b %d, %Y", "%d %B %Y", "%d %b %Y",
+)
+
+def _parse_date(text: str, end_of_day: bool = False) -> Optional[datetime]:
+    """
+    Parse a date bound the way the event script's parseDate does
+    
+    Args:
+        text: "YYYY-MM-DD", "YYYY-MM-DD HH:MM[:SS]" or a common spelling such
+            as "4/1/2025" or "April 1, 2025"
+        end_of_day: Return 23:59:59 for a YYYY-MM-DD date without a time
+        
+    Returns:
+        The date in local time, or None if the text is not recognized
+    """
+    text = text.strip()
+    match = _DATE_RE.fullmatch(text)
+    if match:
+        year, month, day, hour, minute, second = match.groups()
+        try:
+            if hour is None:
+                if end_of_day:
+                    return datetime(int(year), int(month), int(day), 23, 59, 59)
+                return datetime(int(year), int(month), int(day))
+            return datetime(int(year), int(month), int(day), int(hour), int(minute), int(second or 0))
+        except ValueError:
+            return None
+    for date_format in _FALLBACK_DATE_FORMATS:
+        try:
+            return datetime.strptime(text, date_format)
+        except ValueError:
+            continue
+    return None
+
+def _split_date_range(from_date: str, to_date: str) -> List[tuple]:
+    """
+    Split a date range into consecutive windows of EVENT_QUERY_WINDOW
+    
+    Args:
+        from_date: Start of the range, in any form _parse_date accepts
+        to_date: End of the range, in any form _parse_date accepts
+        
+    Returns:
+        A list of (start, end) date strings covering the range without
+        overlap; the range unsplit if either end is not recognized
+    """
+    start = _parse_date(from_date)
+    end = _parse_date(to_date)
+    if start is None or end is None or end - start <= EVENT_QUERY_WINDOW:
+        return [(from_date, to_date)]
+    
+    windows = []
+    while start + EVENT_QUERY_WINDOW < end:
+        window_end = start + EVENT_QUERY_WINDOW - timedelta(seconds=1)
+        windows.append((start.strftime("%Y-%m-%d %H:%M:%S"), window_end.strftime("%Y-%m-%d %H:%M:%S")))
+        start += EVENT_QUERY_WINDOW
+    windows.append((start.strftime("%Y-%m-%d %H:%M:%S"), to_date))
+    return windows
+
+# Default range returned by _default_date_range and when it was computed
+_last_range_ts = float("-inf")
+_last_range: Optional[Tuple[str, str]] = None
+
+def _default_date_range() -> Tuple[str, str]:
+    """
+    Return the default query range: today through seven days from now
+    
+    Both ends come from a single clock reading, so they cannot straddle
+    midnight. The result is reused for one second.
+    
+    Returns:
+        A (from_date, to_date) pair of YYYY-MM-DD strings
+    """
+    global _last_range_ts, _last_range
+    now = time.monotonic()
+    if _last_range is None or now - _last_range_ts > 1:
+        today = datetime.now()
+        _last_range = (today.strftime("%Y-%m-%d"), (today + timedelta(days=7)).strftime("%Y-%m-%d"))
+        _last_range_ts = now
+    return _last_range
+
+def _resolve_date_range(from_date: Optional[str], to_date: Optional[str]) -> Tuple[str, str]:
+    """Fill in whichever end of a date range was omitted from _default_date_range"""
+    if from_date and to_date:
+        return from_date, to_date
+    default_from, default_to = _default_date_range()
+    return from_date or default_from, to_date or default_to
+
+# Scripts registered by CalendarModule; inputs are passed through argv
+CHECK_ACCESS_SCRIPT = '''
+on run argv
+    try
+        tell application "Calendar"
+            get name
+            return true
+        end tell
+    on error
+        return false
+    end try
+end run
+'''
+
+# The event script is JXA and logs one JSON object per event with console.log.
+# Dates are passed as "YYYY-MM-DD" or "YYYY-MM-DD HH:MM:SS" in local time; a
+# date-only end bound covers the whole day. The last argument caps the number
+# of events logged (0 for no cap).
+EVENT_JXA_HELPERS = '''
+function parseDate(text, endOfDay) {
+    var m = /^(\\d{4})-(\\d{2})-(\\d{2})(?:[ T](\\d{2}):(\\d{2})(?::(\\d{2}))?)?$/.exec(text);
+    if (!m) return new Date(text);
+    if (m[4] === undefined) {
+        return endOfDay ? new Date(+m[1], m[2] - 1, +m[3], 23, 59, 59) : new Date(+m[1], m[2] - 1, +m[3]);
+    }
+    return new Date(+m[1], m[2] - 1, +m[3], +m[4], +m[5], +(m[6] || 0));
+}
+
+function pad(n) {
+    return (n < 10 ? "0" : "") + n;
+}
+
+function formatDate(d) {
+    if (!d) return null;
+    return d.getFullYear() + "-" + pad(d.getMonth() + 1) + "-" + pad(d.getDate()) +
+        " " + pad(d.getHours()) + ":" + pad(d.getMinutes()) + ":" + pad(d.getSeconds());
+}
+
+function logEvents(searchText, start, end, limit) {
+    var Calendar = Application("Calendar");
+    var conditions = [{startDate: {_greaterThanEquals: start}}, {startDate: {_lessThanEquals: end}}];
+    if (searchText) conditions.push({summary: {_contains: searchText}});
+    var remaining = limit > 0 ? limit : Infinity;
+    var calendars = Calendar.calendars();
+    for (var c = 0; c < calendars.length && remaining > 0; c++) {
+        var cal = calendars[c];
+        var events = cal.events.whose({_and: conditions});
+        var titles = events.summary();
+        if (!titles.length) continue;
+        // One Apple event per property instead of one per property per event
+        var starts = events.startDate();
+        var ends = events.endDate();
+        var locations = events.location();
+        var notes = events.description();
+        var calendarName = cal.name();
+        var count = Math.min(titles.length, remaining);
+        remaining -= count;
+        for (var i = 0; i < count; i++) {
+            console.log(JSON.stringify({
+                title: titles[i],
+                start_date: formatDate(starts[i]),
+                end_date: formatDate(ends[i]),
+                location: locations[i] || null,
+                notes: notes[i] || null,
+                calendar: calendarName
+            }));
+        }
+    }
+}
+'''
+
+# argv: search text (empty for every event), start, end, limit
+EVENTS_SCRIPT = EVENT_JXA_HELPERS + '''
+function run(argv) {
+    logEvents(argv[0], parseDate(argv[1], false), parseDate(argv[2], true), +argv[3]);
+}
+'''
+
+def _parse_event_line(line: str) -> Optional[Dict[str, Any]]:
+    """
+    Parse one event line logged by the event scripts
+    
+    Args:
+        line: A line of JSON
+        
+    Returns:
+        The event as a dictionary, or None if the line is not an event
+    """
+    if not line.startswith("{"):
+        return None
+    try:
+        return json_loads(line)
+    except ValueError:
+        return None
+
+OPEN_EVENT_SCRIPT = '''
+on run argv
+    set eventId to item 1 of argv
+    tell application "Calendar"
+        try
+            set theEvent to first event whose uid is eventId
+            show theEvent
+            return "Opened event: " & summary of theEvent
+        on error
+            return "ERROR: Event not found"
+        end try
+    end tell
+end run
+'''
+
+CREATE_EVENT_SCRIPT = '''
+on run argv
+    set eventTitle to item 1 of argv
+    set eventStart to date (item 2 of argv)
+    set eventEnd to date (item 3 of argv)
+    tell application "Calendar"
+        try
+            tell (first calendar whose name is "Calendar")
+                make new event at end with properties {summary:eventTitle, start date:eventStart, end date:eventEnd}
+                return "SUCCESS:Event created successfully"
+            end tell
+        on error errMsg
+            return "ERROR:" & errMsg
+        end try
+    end tell
+end run
+'''
+
 class CalendarModule:
     """Module for interacting with Apple Calendar"""
     
-    async def check_calendar_access(self) -> bool:
-        """Check if Calendar app is accessible"""
+    def __init__(self):
+        # Confirmed access for check_calendar_access, reset when an operation fails
+        self._access = AccessCache()
+        
+        register_script("calendar.check_access", CHECK_ACCESS_SCRIPT)
+        register_script("calendar.events", EVENTS_SCRIPT, language="JavaScript")
+        register_script("calendar.open_event", OPEN_EVENT_SCRIPT)
+        register_script("calendar.create_event", CREATE_EVENT_SCRIPT)
+        
+        # EventKit talks to the calendar store in-process; AppleScript is the fallback
+        self.store = EKEventStore.alloc().init() if EKEventStore is not None else None
+    
+    def _request_eventkit_access(self) -> bool:
+        """Ask for calendar access through EventKit, blocking until the user answers"""
+        status = EKEventStore.authorizationStatusForEntityType_(EKEntityTypeEvent)
+        if status in EVENTKIT_AUTHORIZED_STATUSES:
+            return True
+        if status != 0:
+            # Access was denied or restricted; asking again would not prompt
+            return False
+        
+        answered = threading.Event()
+        granted = []
+        
+        def completion(ok, error):
+            granted.append(bool(ok))
+            answered.set()
+        
+        if hasattr(self.store, "requestFullAccessToEventsWithCompletion_"):
+            self.store.requestFullAccessToEventsWithCompletion_(completion)
+        else:
+            self.store.requestAccessToEntityType_completion_(EKEntityTypeEvent, completion)
+        answered.wait(60)
+        return bool(granted and granted[0])
+    
+    async def _eventkit_ready(self) -> bool:
+        """Whether calendar operations can go through EventKit"""
+        if self.store is None:
+            return False
         try:
-            script = '''
-            try
-                tell application "Calendar"
-                    get name
-                    return true
-                end tell
-            on error
-                return false
-            end try
-            '''
+            return await asyncio.to_thread(self._request_eventkit_access)
+        except Exception as e:
+            logger.warning(f"EventKit unavailable, using AppleScript: {e}")
+            return False
+    
+    @staticmethod
+    def _to_nsdate(value: datetime) -> "NSDate":
+        """Convert a datetime to an NSDate"""
+        return NSDate.dateWithTimeIntervalSince1970_(value.timestamp())
+    
+    @staticmethod
+    def _from_nsdate(value: Optional["NSDate"]) -> Optional[str]:
+        """Format an NSDate the way event dates are returned by this module"""
+        if value is None:
+            return None
+        return datetime.fromtimestamp(value.timeIntervalSince1970()).strftime("%Y-%m-%d %H:%M:%S")
+    
+    def _fetch_events_eventkit(self, search_text: str, from_date: str, to_date: str, limit: Optional[int]) -> List[Dict[str, Any]]:
+        """
+        Fetch events with EventKit, optionally filtering on the title
+        
+        Raises:
+            ValueError: If either end of the range is not a date _parse_date reads
+        """
+        start = _parse_date(from_date)
+        end = _parse_date(to_date, end_of_day=True)
+        if start is None or end is None:
+            raise ValueError(f"Unrecognized date range: {from_date} to {to_date}")
+        # EventKit's end is exclusive; the event script includes events starting at the end
+        end += timedelta(seconds=1)
+        predicate = self.store.predicateForEventsWithStartDate_endDate_calendars_(
+            self._to_nsdate(start), self._to_nsdate(end), None
+        )
+        
+        needle = search_text.lower()
+        events = []
+        for event in self.store.eventsMatchingPredicate_(predicate) or []:
+            title = event.title() or ""
+            if needle and needle not in title.lower():
+                continue
+            events.append({
+                "title": title,
+                "start_date": self._from_nsdate(event.startDate()),
+                "end_date": self._from_nsdate(event.endDate()),
+                "location": event.location(),
+                "notes": event.notes(),
+                "calendar": event.calendar().title() if event.calendar() else None
+            })
+            if limit and len(events) >= limit:
+                break
+        return events
+    
+    def _create_event_eventkit(self, title: str, start_date: datetime, end_date: datetime, location: Optional[str], notes: Optional[str], calendar_name: Optional[str]) -> Dict[str, Any]:
+        """Create and save an event with EventKit"""
+        calendar = self.store.defaultCalendarForNewEvents()
+        if calendar_name:
+            for candidate in self.store.calendarsForEntityType_(EKEntityTypeEvent):
+                if candidate.title() == calendar_name:
+                    calendar = candidate
+                    break
+        
+        event = EKEvent.eventWithEventStore_(self.store)
+        event.setTitle_(title)
+        event.setStartDate_(self._to_nsdate(start_date))
+        event.setEndDate_(self._to_nsdate(end_date))
+        if location:
+            event.setLocation_(location)
+        if notes:
+            event.setNotes_(notes)
+        event.setCalendar_(calendar)
+        
+        ok, error = self.store.saveEvent_span_error_(event, EKSpanThisEvent, None)
+        if not ok:
+            return {
+                "success": False,
+                "message": str(error.localizedDescription()) if error else "Could not save event"
+            }
+        return {
+            "success": True,
+            "message": "Event created successfully"
+        }
+    
+    async def _stream_events(self, search_text: str, from_date: str, to_date: str, limit: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Yield events from the event script as Calendar reports them"""
+        async for line in stream_compiled_script("calendar.events", search_text, from_date, to_date, limit or 0):
+            event = _parse_event_line(line)
+            if event is not None:
+                yield event
+    
+    async def _query_event_windows(self, search_text: str, from_date: str, to_date: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Run the event script over each window of the date range
+        
+        At most MAX_CONCURRENT_WINDOWS windows run at once. Windows start in
+        order, and once the windows run so far have returned ``limit`` events
+        no further windows are started.
+        """
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_WINDOWS)
+        found = 0
+        
+        async def collect(start: str, end: str) -> List[Dict[str, Any]]:
+            nonlocal found
+            async with semaphore:
+                if limit and found >= limit:
+                    return []
+                remaining = limit - found if limit else None
+                events = [event async for event in self._stream_events(search_text, start, end, remaining)]
+                found += len(events)
+                return events
+        
+        results = await asyncio.gather(*(
+            collect(start, end) for start, end in _split_date_range(from_date, to_date)
+        ))
+        # Each window stops at the limit on its own; keep the earliest windows' events
+        events = [event for window in results for event in window]
+        return events[:limit] if limit else events
+    
+    async def _query_events(self, search_text: str, from_date: Optional[str], to_date: Optional[str], limit: Optional[int]) -> List[Dict[str, Any]]:
+        """
+        Fetch events in a date range through EventKit or the event script
+        
+        Args:
+            search_text: Only return events whose title contains this text (empty for all)
+            from_date: Start of the range (YYYY-MM-DD, default today)
+            to_date: End of the range (YYYY-MM-DD, default a week from today)
+            limit: Maximum number of events to return (None for all)
+            
+        Returns:
+            A list of event dictionaries
             
-            result = await run_applescript_async(script)
+        Raises:
+            AppleScriptError: If the event script fails
+            ValueError: If EventKit is used and a date is not recognized
+        """
+        from_date, to_date = _resolve_date_range(from_date, to_date)
+        
+        if await self._eventkit_ready():
+            return await asyncio.to_thread(self._fetch_events_eventkit, search_text, from_date, to_date, limit)
+        
+        return await self._query_event_windows(search_text, from_date, to_date, limit)
+    
+    async def iter_events(self, search_text: str = "", from_date: Optional[str] = None, to_date: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield calendar events in a date range as they are found
+        
+        Events are produced while Calendar is still walking the range, so the
+        first results are available before the whole query completes.
+        
+        Args:
+            search_text: Only yield events whose title contains this text (empty for all)
+            from_date: Start of the range (YYYY-MM-DD, default today)
+            to_date: End of the range (YYYY-MM-DD, default a week from today)
+        """
+        from_date, to_date = _resolve_date_range(from_date, to_date)
+        
+        if await self._eventkit_ready():
+            for event in await asyncio.to_thread(self._fetch_events_eventkit, search_text, from_date, to_date, None):
+                yield event
+            return
+        
+        for start, end in _split_date_range(from_date, to_date):
+            async for event in self._stream_events(search_text, start, end):
+                yield event
+    
+    async def check_calendar_access(self) -> bool:
+        """
+        Check if Calendar app is accessible
+        
+        A successful check is kept for five minutes, or until an operation
+        fails; a failed check is repeated on every call.
+        
+        Returns:
+            True if Calendar app is accessible, False otherwise
+        """
+        return await self._access.check(self._probe_calendar_access)
+    
+    async def _probe_calendar_access(self) -> bool:
+        """Ask Calendar whether it can be scripted, bypassing the cached answer"""
+        if await self._eventkit_ready():
+            return True
+        try:
+            result = await run_compiled_script("calendar.check_access")
             return result.lower() == 'true'
         except Exception as e:
             logger.error(f"Cannot access Calendar app: {e}")
             return False
     
+    @ttl_cache(ttl=30, key=lambda self, search_text, limit, from_date, to_date: ("cal:events:search", search_text, limit, from_date, to_date))
     async def search_events(self, search_text: str, limit: Optional[int] = None, from_date: Optional[str] = None, to_date: Optional[str] = None) -> List[Dict[str, Any]]:
         """Search for calendar events matching text"""
-        if not from_date:
-            from_date = datetime.now().strftime("%Y-%m-%d")
-        if not to_date:
-            to_date = (datetime.now().replace(hour=23, minute=59, second=59) + timedelta(days=7)).strftime("%Y-%m-%d")
-        
-        script = f'''
-            tell application "Calendar"
-                set matchingEvents to {{}}
-                set searchStart to date "{from_date}"
-                set searchEnd to date "{to_date}"
-                set foundEvents to every event whose summary contains "{search_text}" and start date is greater than or equal to searchStart and start date is less than or equal to searchEnd
-                repeat with e in foundEvents
-                    set end of matchingEvents to {{
-                        title:summary of e,
-                        start_date:start date of e,
-                        end_date:end date of e,
-                        location:location of e,
-                        notes:description of e,
-                        calendar:name of calendar of e
-                    }}
-                end repeat
-                return matchingEvents as text
-            end tell
-        '''
-        
         try:
-            result = await run_applescript_async(script)
-            events = parse_applescript_list(result)
-            
-            if limit:
-                events = events[:limit]
-                
-            return [parse_applescript_record(event) for event in events]
+            return await self._query_events(search_text, from_date, to_date, limit)
         except AppleScriptError as e:
+            self._access.reset()
+            logger.error(f"Error searching events: {e}")
+            return []
+        except ValueError as e:
             logger.error(f"Error searching events: {e}")
             return []
     
     async def open_event(self, event_id: str) -> Dict[str, Any]:
         """Open a specific calendar event"""
-        script = f'''
-            tell application "Calendar"
-                try
-                    set theEvent to first event whose uid is "{event_id}"
-                    show theEvent
-                    return "Opened event: " & summary of theEvent
-                on error
-                    return "ERROR: Event not found"
-                end try
-            end tell
-        '''
-        
         try:
-            result = await run_applescript_async(script)
+            result = await run_compiled_script("calendar.open_event", event_id)
             success = not result.startswith("ERROR:")
             return {
                 "success": success,
                 "message": result.replace("ERROR: ", "") if not success else result
             }
         except AppleScriptError as e:
+            self._access.reset()
             return {
                 "success": False,
                 "message": str(e)
             }
     
+    @ttl_cache(ttl=30, key=lambda self, limit, from_date, to_date: ("cal:events:range", limit, from_date, to_date))
     async def get_events(self, limit: Optional[int] = None, from_date: Optional[str] = None, to_date: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get calendar events in a date range"""
-        if not from_date:
-            from_date = datetime.now().strftime("%Y-%m-%d")
-        if not to_date:
-            to_date = (datetime.now().replace(hour=23, minute=59, second=59) + timedelta(days=7)).strftime("%Y-%m-%d")
-        
-        script = f'''
-            tell application "Calendar"
-                set allEvents to {{}}
-                set searchStart to date "{from_date}"
-                set searchEnd to date "{to_date}"
-                set foundEvents to every event whose start date is greater than or equal to searchStart and start date is less than or equal to searchEnd
-                repeat with e in foundEvents
-                    set end of allEvents to {{
-                        title:summary of e,
-                        start_date:start date of e,
-                        end_date:end date of e,
-                        location:location of e,
-                        notes:description of e,
-                        calendar:name of calendar of e
-                    }}
-                end repeat
-                return allEvents as text
-            end tell
-        '''
-        
         try:
-            result = await run_applescript_async(script)
-            events = parse_applescript_list(result)
-            
-            if limit:
-                events = events[:limit]
-                
-            return [parse_applescript_record(event) for event in events]
+            return await self._query_events("", from_date, to_date, limit)
         except AppleScriptError as e:
+            self._access.reset()
+            logger.error(f"Error getting events: {e}")
+            return []
+        except ValueError as e:
             logger.error(f"Error getting events: {e}")
             return []
     
     async def create_event(self, title: str, start_date: datetime, end_date: datetime, location: str = None, notes: str = None, calendar_name: str = None) -> Dict[str, Any]:
         """Create a new calendar event"""
+        if await self._eventkit_ready():
+            result = await asyncio.to_thread(
+                self._create_event_eventkit, title, start_date, end_date, location, notes, calendar_name
+            )
+            if result["success"]:
+                cache.invalidate_prefix("cal:events")
+            return result
+        
         # Using a simpler approach for Calendar that is more likely to work
         formatted_start = start_date.strftime("%Y-%m-%d %H:%M:%S")
         formatted_end = end_date.strftime("%Y-%m-%d %H:%M:%S")
         
-        # Create a simpler script that just adds an event to the default calendar
-        script = f'''
-            tell application "Calendar"
-                try
-                    tell application "Calendar"
-                        tell (first calendar whose name is "Calendar")
-                            make new event at end with properties {{summary:"{title}", start date:(date "{formatted_start}"), end date:(date "{formatted_end}")}}
-                            return "SUCCESS:Event created successfully"
-                        end tell
-                    end tell
-                on error errMsg
-                    return "ERROR:" & errMsg
-                end try
-            end tell
-        '''
-        
         try:
-            result = await run_applescript_async(script)
+            result = await run_compiled_script("calendar.create_event", title, formatted_start, formatted_end)
             success = result.startswith("SUCCESS:")
+            if success:
+                cache.invalidate_prefix("cal:events")
             return {
                 "success": success,
                 "message": result.replace("SUCCESS:", "").replace("ERROR:", "")
             }
         except AppleScriptError as e:
+            self._access.reset()
             logger.error(f"Error creating event: {e}")
             return {
                 "success": False,
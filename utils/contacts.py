@@ -1,120 +1,273 @@
 """Contacts module for interacting with Apple Contacts."""
 
+import asyncio
 import logging
+import threading
 from typing import Dict, List, Any, Optional
 
 from .applescript import (
-    run_applescript_async, 
+    run_compiled_script,
+    run_native_script,
+    run_record_script,
+    stream_script_list,
+    register_script,
+    NATIVE_SCRIPTS_AVAILABLE,
     AppleScriptError,
     parse_applescript_record,
     parse_applescript_list
 )
+from .cache import ttl_cache, AccessCache
+
+try:
+    from Contacts import (
+        CNContactStore,
+        CNContactFetchRequest,
+        CNContactFormatter,
+        CNContactFormatterStyleFullName,
+        CNContactPhoneNumbersKey,
+        CNEntityTypeContacts,
+    )
+except ImportError:
+    CNContactStore = None
 
 logger = logging.getLogger(__name__)
 
+# CNAuthorizationStatus values that allow reading contacts
+# (3 is "authorized", 4 is "limited" on macOS 15 and later)
+CONTACTS_AUTHORIZED_STATUSES = (3, 4)
+
+# Contacts rarely change during a session, so reads are cached for a few minutes
+CONTACTS_CACHE_TTL = 300
+
+# Number of people read by each of the concurrent get_all_numbers scripts
+CONTACTS_BATCH_SIZE = 250
+
+# Scripts registered by ContactsModule; inputs are passed through argv
+CHECK_ACCESS_SCRIPT = '''
+on run argv
+    try
+        tell application "Contacts"
+            get name
+            return true
+        end tell
+    on error
+        return false
+    end try
+end run
+'''
+
+# Names and phone values are read with one bulk Apple Event each, then
+# walked as local lists so the loops send no further events
+FIND_NUMBER_SCRIPT = '''
+on run argv
+    set searchName to item 1 of argv
+    tell application "Contacts"
+        set thePhones to value of phones of (every person whose name contains searchName)
+    end tell
+    set phoneNumbers to {}
+    repeat with personPhones in thePhones
+        set phoneNumbers to phoneNumbers & personPhones
+    end repeat
+    return phoneNumbers
+end run
+'''
+
+COUNT_PEOPLE_SCRIPT = '''
+on run argv
+    tell application "Contacts" to return count people
+end run
+'''
+
+# Records are built outside the tell block so their keys stay plain user fields
+NUMBERS_IN_RANGE_SCRIPT = '''
+on contactRecord(theName, thePhones)
+    return {name:theName, phones:thePhones}
+end contactRecord
+
+on run argv
+    set firstIndex to (item 1 of argv) as integer
+    set lastIndex to (item 2 of argv) as integer
+    tell application "Contacts"
+        set theNames to name of people firstIndex thru lastIndex
+        set thePhones to value of phones of people firstIndex thru lastIndex
+    end tell
+    set allContacts to {}
+    repeat with i from 1 to count of theNames
+        set personPhones to item i of thePhones
+        if (count of personPhones) > 0 then
+            set end of allContacts to contactRecord(item i of theNames, personPhones)
+        end if
+    end repeat
+    return allContacts
+end run
+'''
+
+FIND_BY_PHONE_SCRIPT = '''
+on run argv
+    set phoneNumber to item 1 of argv
+    tell application "Contacts"
+        set theNames to name of every person
+        set thePhones to value of phones of every person
+    end tell
+    repeat with i from 1 to count of theNames
+        repeat with phoneValue in item i of thePhones
+            if (contents of phoneValue) contains phoneNumber then
+                return {found:true, name:item i of theNames}
+            end if
+        end repeat
+    end repeat
+    return {found:false, name:""}
+end run
+'''
+
 class ContactsModule:
     """Module for interacting with Apple Contacts"""
     
+    def __init__(self):
+        # Confirmed access for check_contacts_access, reset when an operation fails
+        self._access = AccessCache()
+        
+        register_script("contacts.check_access", CHECK_ACCESS_SCRIPT)
+        register_script("contacts.find_number", FIND_NUMBER_SCRIPT)
+        register_script("contacts.count_people", COUNT_PEOPLE_SCRIPT)
+        register_script("contacts.numbers_in_range", NUMBERS_IN_RANGE_SCRIPT)
+        register_script("contacts.find_by_phone", FIND_BY_PHONE_SCRIPT)
+        
+        # The Contacts framework reads the address book in-process; AppleScript is the fallback
+        self.store = CNContactStore.alloc().init() if CNContactStore is not None else None
+    
+    def _request_framework_access(self) -> bool:
+        """Ask for contacts access through the Contacts framework, blocking until the user answers"""
+        status = CNContactStore.authorizationStatusForEntityType_(CNEntityTypeContacts)
+        if status in CONTACTS_AUTHORIZED_STATUSES:
+            return True
+        if status != 0:
+            # Access was denied or restricted; asking again would not prompt
+            return False
+        
+        answered = threading.Event()
+        granted = []
+        
+        def completion(ok, error):
+            granted.append(bool(ok))
+            answered.set()
+        
+        self.store.requestAccessForEntityType_completionHandler_(CNEntityTypeContacts, completion)
+        answered.wait(60)
+        return bool(granted and granted[0])
+    
+    async def _framework_ready(self) -> bool:
+        """Whether contacts can be read through the Contacts framework"""
+        if self.store is None:
+            return False
+        try:
+            return await asyncio.to_thread(self._request_framework_access)
+        except Exception as e:
+            logger.warning(f"Contacts framework unavailable, using AppleScript: {e}")
+            return False
+    
+    def _fetch_all_numbers_framework(self) -> Dict[str, List[str]]:
+        """Read every contact with a phone number in one Contacts framework enumeration"""
+        keys = [
+            CNContactFormatter.descriptorForRequiredKeysForStyle_(CNContactFormatterStyleFullName),
+            CNContactPhoneNumbersKey,
+        ]
+        request = CNContactFetchRequest.alloc().initWithKeysToFetch_(keys)
+        contact_dict = {}
+        
+        def handler(contact, stop):
+            phones = [number.value().stringValue() for number in contact.phoneNumbers()]
+            if phones:
+                name = CNContactFormatter.stringFromContact_style_(contact, CNContactFormatterStyleFullName)
+                if name:
+                    contact_dict[str(name)] = [str(phone) for phone in phones]
+        
+        ok, error = self.store.enumerateContactsWithFetchRequest_error_usingBlock_(request, None, handler)
+        if not ok:
+            raise RuntimeError(str(error.localizedDescription()) if error else "Could not read contacts")
+        return contact_dict
+    
     async def check_contacts_access(self) -> bool:
-        """Check if Contacts app is accessible"""
+        """
+        Check if Contacts app is accessible
+        
+        A successful check is kept for five minutes, or until an operation
+        fails; a failed check is repeated on every call.
+        
+        Returns:
+            True if Contacts app is accessible, False otherwise
+        """
+        return await self._access.check(self._probe_contacts_access)
+    
+    async def _probe_contacts_access(self) -> bool:
+        """Ask Contacts whether it can be scripted, bypassing the cached answer"""
         try:
-            script = '''
-            try
-                tell application "Contacts"
-                    get name
-                    return true
-                end tell
-            on error
-                return false
-            end try
-            '''
-            
-            result = await run_applescript_async(script)
+            result = await run_compiled_script("contacts.check_access")
             return result.lower() == 'true'
         except Exception as e:
             logger.error(f"Cannot access Contacts app: {e}")
             return False
     
+    @ttl_cache(ttl=CONTACTS_CACHE_TTL, key=lambda self, name: ("contacts:find", name))
     async def find_number(self, name: str) -> List[str]:
         """Find phone numbers for a contact"""
-        script = f'''
-            tell application "Contacts"
-                set matchingPeople to (every person whose name contains "{name}")
-                set phoneNumbers to {{}}
-                repeat with p in matchingPeople
-                    repeat with ph in phones of p
-                        copy value of ph to end of phoneNumbers
-                    end repeat
-                end repeat
-                return phoneNumbers as text
-            end tell
-        '''
-        
         try:
-            result = await run_applescript_async(script)
+            result = await run_compiled_script("contacts.find_number", name)
             return parse_applescript_list(result)
         except AppleScriptError as e:
+            self._access.reset()
             logger.error(f"Error finding phone numbers: {e}")
             return []
     
+    async def get_numbers_in_range(self, start: int, end: int) -> Dict[str, List[str]]:
+        """Get phone numbers for the people at positions start..end (1-based, inclusive)"""
+        if NATIVE_SCRIPTS_AVAILABLE:
+            # Records come back as dicts; no text to parse
+            contacts = await run_native_script("contacts.numbers_in_range", int(start), int(end))
+            return {contact["name"]: contact.get("phones", []) for contact in contacts}
+        
+        # Each person is parsed as soon as osascript has written it
+        contact_dict = {}
+        async for contact_data in stream_script_list(
+            "contacts.numbers_in_range", int(start), int(end), parse=parse_applescript_record
+        ):
+            contact_dict[contact_data['name']] = contact_data.get('phones', [])
+        
+        return contact_dict
+    
+    @ttl_cache(ttl=CONTACTS_CACHE_TTL, key=lambda self: ("contacts:all",))
     async def get_all_numbers(self) -> Dict[str, List[str]]:
         """Get all contacts with their phone numbers"""
-        script = '''
-            tell application "Contacts"
-                set allContacts to {}
-                repeat with p in every person
-                    set phones to {}
-                    repeat with ph in phones of p
-                        copy value of ph to end of phones
-                    end repeat
-                    if length of phones is greater than 0 then
-                        set end of allContacts to {name:name of p, phones:phones}
-                    end if
-                end repeat
-                return allContacts as text
-            end tell
-        '''
+        if await self._framework_ready():
+            try:
+                return await asyncio.to_thread(self._fetch_all_numbers_framework)
+            except Exception as e:
+                logger.warning(f"Contacts framework query failed, using AppleScript: {e}")
         
         try:
-            result = await run_applescript_async(script)
-            contacts = parse_applescript_list(result)
+            total = int(await run_compiled_script("contacts.count_people") or 0)
             
-            # Convert to dictionary format
-            contact_dict = {}
-            for contact in contacts:
-                contact_data = parse_applescript_record(contact)
-                contact_dict[contact_data['name']] = contact_data.get('phones', [])
+            # Read the address book in slices that run concurrently on the worker pool
+            batches = await asyncio.gather(*(
+                self.get_numbers_in_range(start, min(start + CONTACTS_BATCH_SIZE - 1, total))
+                for start in range(1, total + 1, CONTACTS_BATCH_SIZE)
+            ))
             
+            contact_dict = {}
+            for batch in batches:
+                contact_dict.update(batch)
             return contact_dict
-        except AppleScriptError as e:
+        except (AppleScriptError, ValueError) as e:
+            self._access.reset()
             logger.error(f"Error getting all contacts: {e}")
             return {}
     
     async def find_contact_by_phone(self, phone_number: str) -> Optional[str]:
         """Find a contact's name by phone number"""
-        script = f'''
-            tell application "Contacts"
-                set foundName to missing value
-                repeat with p in every person
-                    repeat with ph in phones of p
-                        if value of ph contains "{phone_number}" then
-                            set foundName to name of p
-                            exit repeat
-                        end if
-                    end repeat
-                    if foundName is not missing value then
-                        exit repeat
-                    end if
-                end repeat
-                return foundName
-            end tell
-        '''
-        
         try:
-            result = await run_applescript_async(script)
-            if result and result.lower() != "missing value":
-                return result
-            return None
+            match = await run_record_script("contacts.find_by_phone", phone_number)
+            return match["name"] if match.get("found") is True else None
         except AppleScriptError as e:
+            self._access.reset()
             logger.error(f"Error finding contact by phone: {e}")
             return None
\ No newline at end of file
@@ -1,215 +1,354 @@
 """Mail module for interacting with Apple Mail."""
 
 import logging
+import sys
 from typing import Dict, List, Any, Optional
 
 from .applescript import (
-    run_applescript_async, 
+    run_compiled_script,
+    run_native_script,
+    stream_script_list,
+    register_script,
+    NATIVE_SCRIPTS_AVAILABLE,
     AppleScriptError,
-    format_applescript_value,
     parse_applescript_record,
     parse_applescript_list
 )
+from .cache import AccessCache
 
 logger = logging.getLogger(__name__)
 
+# Scripts registered by MailModule; inputs are passed through argv
+CHECK_ACCESS_SCRIPT = '''
+on run argv
+    try
+        tell application "Mail"
+            get name
+            return true
+        end tell
+    on error
+        return false
+    end try
+end run
+'''
+
+# Message records are built by this handler, outside the tell block, so their
+# keys stay plain user fields instead of Mail's terminology codes
+# Listings leave out message bodies, which can be large and may have to be
+# downloaded from the server; "id" is the Message-ID header for get_mail_body
+MAIL_RECORD_HANDLER = '''
+on mailRecord(theId, theSubject, theSender, theDate, theMailbox, theAccount)
+    return {id:theId, subject:theSubject, sender:theSender, date:theDate, mailbox:theMailbox, account:theAccount}
+end mailRecord
+'''
+
+# argv: limit, unread only ("true"/"false"), search text, account, mailbox.
+# Empty search text matches every message; an empty account means the
+# unified inbox and an empty mailbox the account's inbox.
+INBOX_SNAPSHOT_SCRIPT = MAIL_RECORD_HANDLER + '''
+on run argv
+    set maxCount to (item 1 of argv) as integer
+    set unreadOnly to (item 2 of argv) is "true"
+    set searchTerm to item 3 of argv
+    set accountName to item 4 of argv
+    set mailboxName to item 5 of argv
+    tell application "Mail"
+        if accountName is "" then
+            set theMailbox to inbox
+        else if mailboxName is "" then
+            set theMailbox to inbox of account accountName
+        else
+            set theMailbox to mailbox mailboxName of account accountName
+        end if
+        if unreadOnly and searchTerm is not "" then
+            set msgs to a reference to (messages of theMailbox whose read status is false and (subject contains searchTerm or content contains searchTerm))
+        else if unreadOnly then
+            set msgs to a reference to (messages of theMailbox whose read status is false)
+        else if searchTerm is not "" then
+            set msgs to a reference to (messages of theMailbox whose subject contains searchTerm or content contains searchTerm)
+        else
+            set msgs to a reference to messages of theMailbox
+        end if
+        set msgCount to count of msgs
+        if msgCount > maxCount then set msgCount to maxCount
+        if msgCount is 0 then return {}
+        -- One Apple event per field for all the messages; "properties" would
+        -- also fetch every header and the raw source of each message
+        set theMessages to a reference to items 1 thru msgCount of msgs
+        set theIds to message id of theMessages
+        set theSubjects to subject of theMessages
+        set theSenders to sender of theMessages
+        set theDates to date received of theMessages
+        set theMailboxNames to name of mailbox of theMessages
+        set theAccountNames to name of account of mailbox of theMessages
+    end tell
+    set snapshot to {}
+    repeat with i from 1 to msgCount
+        set end of snapshot to mailRecord(item i of theIds, item i of theSubjects, item i of theSenders, item i of theDates, item i of theMailboxNames, item i of theAccountNames)
+    end repeat
+    return snapshot
+end run
+'''
+
+# argv: Message-ID, account, mailbox (same defaults as the inbox snapshot)
+MAIL_BODY_SCRIPT = '''
+on run argv
+    set messageId to item 1 of argv
+    set accountName to item 2 of argv
+    set mailboxName to item 3 of argv
+    tell application "Mail"
+        if accountName is "" then
+            set theMailbox to inbox
+        else if mailboxName is "" then
+            set theMailbox to inbox of account accountName
+        else
+            set theMailbox to mailbox mailboxName of account accountName
+        end if
+        set msgs to (messages of theMailbox whose message id is messageId)
+        if (count of msgs) is 0 then return missing value
+        return content of item 1 of msgs
+    end tell
+end run
+'''
+
+SEND_MAIL_SCRIPT = '''
+on run argv
+    set toAddress to item 1 of argv
+    set theSubject to item 2 of argv
+    set theBody to item 3 of argv
+    set ccAddress to item 4 of argv
+    set bccAddress to item 5 of argv
+    tell application "Mail"
+        set newMessage to make new outgoing message with properties {subject:theSubject, content:theBody, visible:true}
+        tell newMessage
+            make new to recipient with properties {address:toAddress}
+            if ccAddress is not "" then make new cc recipient with properties {address:ccAddress}
+            if bccAddress is not "" then make new bcc recipient with properties {address:bccAddress}
+            send
+        end tell
+    end tell
+end run
+'''
+
+MAILBOXES_FOR_ACCOUNT_SCRIPT = '''
+on run argv
+    set accountName to item 1 of argv
+    tell application "Mail"
+        set theMailboxes to {}
+        set theAccount to account accountName
+        repeat with m in mailboxes of theAccount
+            set end of theMailboxes to name of m
+        end repeat
+        return theMailboxes
+    end tell
+end run
+'''
+
+ACCOUNTS_SCRIPT = '''
+on run argv
+    tell application "Mail"
+        set theAccounts to {}
+        repeat with a in accounts
+            set end of theAccounts to name of a
+        end repeat
+        return theAccounts
+    end tell
+end run
+'''
+
+# Account and mailbox names are read with one bulk Apple Event each
+ACCOUNT_TREE_SCRIPT = '''
+on accountRecord(theName, theMailboxes)
+    return {name:theName, mailboxes:theMailboxes}
+end accountRecord
+
+on run argv
+    tell application "Mail"
+        set accountNames to name of every account
+        set mailboxNames to name of every mailbox of every account
+    end tell
+    set theAccounts to {}
+    repeat with i from 1 to count of accountNames
+        set end of theAccounts to accountRecord(item i of accountNames, item i of mailboxNames)
+    end repeat
+    return theAccounts
+end run
+'''
+
 class MailModule:
     """Module for interacting with Apple Mail"""
     
+    def __init__(self):
+        # Confirmed access for check_mail_access, reset when an operation fails
+        self._access = AccessCache()
+        
+        register_script("mail.check_access", CHECK_ACCESS_SCRIPT)
+        register_script("mail.inbox_snapshot", INBOX_SNAPSHOT_SCRIPT)
+        register_script("mail.body", MAIL_BODY_SCRIPT)
+        register_script("mail.send_mail", SEND_MAIL_SCRIPT)
+        register_script("mail.mailboxes_for_account", MAILBOXES_FOR_ACCOUNT_SCRIPT)
+        register_script("mail.accounts", ACCOUNTS_SCRIPT)
+        register_script("mail.account_tree", ACCOUNT_TREE_SCRIPT)
+    
     async def check_mail_access(self) -> bool:
-        """Check if Mail app is accessible"""
+        """
+        Check if Mail app is accessible
+        
+        A successful check is kept for five minutes, or until an operation
+        fails; a failed check is repeated on every call.
+        
+        Returns:
+            True if Mail app is accessible, False otherwise
+        """
+        return await self._access.check(self._probe_mail_access)
+    
+    async def _probe_mail_access(self) -> bool:
+        """Ask Mail whether it can be scripted, bypassing the cached answer"""
         try:
-            script = '''
-            try
-                tell application "Mail"
-                    get name
-                    return true
-                end tell
-            on error
-                return false
-            end try
-            '''
-            
-            result = await run_applescript_async(script)
+            result = await run_compiled_script("mail.check_access")
             return result.strip().lower() == "true"
         except Exception as e:
             logger.error(f"Error checking Mail access: {e}")
             return False
     
+    async def get_inbox_snapshot(self, limit: int = 10, unread_only: bool = False, search_term: Optional[str] = None, account: Optional[str] = None, mailbox: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Read messages from a mailbox in a single Mail query
+        
+        The unread, search and per-account methods are views over this one
+        script, so every message listing shares one tell block and one
+        properties fetch per message.
+        
+        Args:
+            limit: Maximum number of messages to return
+            unread_only: Only return unread messages
+            search_term: Only return messages whose subject or content contains this text
+            account: Account to read from (default: the unified inbox)
+            mailbox: Mailbox of the account to read from (default: its inbox)
+            
+        Returns:
+            A list of message dictionaries
+            
+        Raises:
+            AppleScriptError: If the script fails
+        """
+        args = (limit, "true" if unread_only else "false", search_term or "", account or "", mailbox or "")
+        if NATIVE_SCRIPTS_AVAILABLE:
+            emails = await run_native_script("mail.inbox_snapshot", *args)
+        else:
+            emails = [
+                email
+                async for email in stream_script_list("mail.inbox_snapshot", *args, parse=parse_applescript_record)
+            ]
+        
+        # Only a handful of mailbox and account names repeat across every message
+        for email in emails:
+            for field in ("mailbox", "account"):
+                if isinstance(email.get(field), str):
+                    email[field] = sys.intern(email[field])
+        return emails
+    
     async def get_unread_mails(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get unread emails"""
-        script = f'''
-            tell application "Mail"
-                set unreadMails to {{}}
-                set msgs to (messages of inbox whose read status is false)
-                repeat with i from 1 to {limit}
-                    if i > count of msgs then exit repeat
-                    set m to item i of msgs
-                    set end of unreadMails to {{
-                        subject:subject of m,
-                        sender:sender of m,
-                        content:content of m,
-                        date:date received of m,
-                        mailbox:"inbox"
-                    }}
-                end repeat
-                return unreadMails as text
-            end tell
-        '''
-        
         try:
-            result = await run_applescript_async(script)
-            emails = parse_applescript_list(result)
-            return [parse_applescript_record(email) for email in emails]
+            return await self.get_inbox_snapshot(limit, unread_only=True)
         except AppleScriptError as e:
+            self._access.reset()
             logger.error(f"Error getting unread emails: {e}")
             return []
     
     async def get_unread_mails_for_account(self, account: str, mailbox: Optional[str] = None, limit: int = 10) -> List[Dict[str, Any]]:
         """Get unread emails for a specific account"""
-        mailbox_part = f'mailbox "{mailbox}"' if mailbox else "inbox"
-        
-        script = f'''
-            tell application "Mail"
-                set unreadMails to {{}}
-                set theAccount to account "{account}"
-                set msgs to (messages of {mailbox_part} of theAccount whose read status is false)
-                repeat with i from 1 to {limit}
-                    if i > count of msgs then exit repeat
-                    set m to item i of msgs
-                    set end of unreadMails to {{
-                        subject:subject of m,
-                        sender:sender of m,
-                        content:content of m,
-                        date:date received of m,
-                        mailbox:name of mailbox of m,
-                        account:name of account of m
-                    }}
-                end repeat
-                return unreadMails as text
-            end tell
-        '''
-        
         try:
-            result = await run_applescript_async(script)
-            emails = parse_applescript_list(result)
-            return [parse_applescript_record(email) for email in emails]
+            return await self.get_inbox_snapshot(limit, unread_only=True, account=account, mailbox=mailbox)
         except AppleScriptError as e:
+            self._access.reset()
             logger.error(f"Error getting unread emails for account: {e}")
             return []
     
     async def search_mails(self, search_term: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Search emails"""
-        script = f'''
-            tell application "Mail"
-                set searchResults to {{}}
-                set msgs to messages of inbox whose subject contains "{search_term}" or content contains "{search_term}"
-                repeat with i from 1 to {limit}
-                    if i > count of msgs then exit repeat
-                    set m to item i of msgs
-                    set end of searchResults to {{
-                        subject:subject of m,
-                        sender:sender of m,
-                        content:content of m,
-                        date:date received of m,
-                        mailbox:name of mailbox of m,
-                        account:name of account of m
-                    }}
-                end repeat
-                return searchResults as text
-            end tell
-        '''
-        
         try:
-            result = await run_applescript_async(script)
-            emails = parse_applescript_list(result)
-            return [parse_applescript_record(email) for email in emails]
+            return await self.get_inbox_snapshot(limit, search_term=search_term)
         except AppleScriptError as e:
+            self._access.reset()
             logger.error(f"Error searching emails: {e}")
             return []
     
+    async def get_mail_body(self, message_id: str, account: Optional[str] = None, mailbox: Optional[str] = None) -> Optional[str]:
+        """
+        Get the body of one message
+        
+        Message listings do not include bodies; pass the "id", "account" and
+        "mailbox" of a listed message to read its content.
+        
+        Args:
+            message_id: The message's Message-ID header (the "id" of a listed message)
+            account: Account holding the message (default: the unified inbox)
+            mailbox: Mailbox of the account holding the message (default: its inbox)
+            
+        Returns:
+            The message content, or None if the message was not found
+        """
+        try:
+            if NATIVE_SCRIPTS_AVAILABLE:
+                return await run_native_script("mail.body", message_id, account or "", mailbox or "")
+            result = await run_compiled_script("mail.body", message_id, account or "", mailbox or "")
+            return None if result == "missing value" else result
+        except AppleScriptError as e:
+            self._access.reset()
+            logger.error(f"Error getting email body: {e}")
+            return None
+    
     async def send_mail(self, to: str, subject: str, body: str, cc: Optional[str] = None, bcc: Optional[str] = None) -> Dict:
         """Send an email"""
         try:
-            # Build the recipients part of the script
-            recipients = f'make new to recipient with properties {{address:"{to}"}}'
-            if cc:
-                recipients += f'\nmake new cc recipient with properties {{address:"{cc}"}}'
-            if bcc:
-                recipients += f'\nmake new bcc recipient with properties {{address:"{bcc}"}}'
-
-            script = f'''
-                tell application "Mail"
-                    set newMessage to make new outgoing message with properties {{subject:"{subject}", content:"{body}", visible:true}}
-                    tell newMessage
-                        {recipients}
-                        send
-                    end tell
-                end tell
-            '''
-            
-            await run_applescript_async(script)
+            await run_compiled_script("mail.send_mail", to, subject, body, cc or "", bcc or "")
             return {"success": True, "message": f"Email sent to {to}"}
         except AppleScriptError as e:
+            self._access.reset()
             logger.error(f"Error sending email: {e}")
             return {"success": False, "message": str(e)}
     
     async def get_mailboxes_for_account(self, account: str) -> List[str]:
         """Get mailboxes for a specific account"""
-        script = f'''
-            tell application "Mail"
-                set theMailboxes to {{}}
-                set theAccount to account "{account}"
-                repeat with m in mailboxes of theAccount
-                    set end of theMailboxes to name of m
-                end repeat
-                return theMailboxes as text
-            end tell
-        '''
-        
         try:
-            result = await run_applescript_async(script)
+            result = await run_compiled_script("mail.mailboxes_for_account", account)
             return parse_applescript_list(result)
         except AppleScriptError as e:
+            self._access.reset()
             logger.error(f"Error getting mailboxes: {e}")
             return []
     
-    async def get_mailboxes(self) -> List[str]:
-        """Get all mailboxes"""
-        script = '''
-            tell application "Mail"
-                set theMailboxes to {}
-                repeat with a in accounts
-                    repeat with m in mailboxes of a
-                        set end of theMailboxes to name of m
-                    end repeat
-                end repeat
-                return theMailboxes as text
-            end tell
-        '''
+    async def get_account_tree(self) -> List[Dict[str, Any]]:
+        """
+        Get every account with the names of its mailboxes in one Mail query
         
+        Returns:
+            A list of dictionaries with the account "name" and its "mailboxes"
+        """
         try:
-            result = await run_applescript_async(script)
-            return parse_applescript_list(result)
+            if NATIVE_SCRIPTS_AVAILABLE:
+                return await run_native_script("mail.account_tree")
+            return [
+                account
+                async for account in stream_script_list("mail.account_tree", parse=parse_applescript_record)
+            ]
         except AppleScriptError as e:
-            logger.error(f"Error getting all mailboxes: {e}")
+            self._access.reset()
+            logger.error(f"Error getting accounts and mailboxes: {e}")
             return []
     
+    async def get_mailboxes(self) -> List[str]:
+        """Get all mailboxes"""
+        return [mailbox for account in await self.get_account_tree() for mailbox in account.get("mailboxes", [])]
+    
     async def get_accounts(self) -> List[str]:
         """Get all email accounts"""
-        script = '''
-            tell application "Mail"
-                set theAccounts to {}
-                repeat with a in accounts
-                    set end of theAccounts to name of a
-                end repeat
-                return theAccounts as text
-            end tell
-        '''
-        
         try:
-            result = await run_applescript_async(script)
+            result = await run_compiled_script("mail.accounts")
             return parse_applescript_list(result)
         except AppleScriptError as e:
+            self._access.reset()
             logger.error(f"Error getting accounts: {e}")
             return []
\ No newline at end of file
@@ -5,91 +5,353 @@ This module provides functions to perform various operations with Apple Maps
 like searching for locations, saving locations, getting directions, etc.
 """
 
+import asyncio
 import logging
 import json
+import time
 import uuid
 from typing import Dict, List, Any, Optional, Tuple, Union
 
 from .applescript import (
-    run_applescript_async, 
+    run_compiled_script,
+    run_record_script,
+    register_script,
     AppleScriptError,
-    format_applescript_value,
-    parse_applescript_record,
-    parse_applescript_list
+    parse_applescript_record
 )
+from .cache import ttl_cache, AccessCache
 
 logger = logging.getLogger(__name__)
 
+# Seconds a searched address stays selected in Maps before it is searched again
+MAPS_SEARCH_REUSE_SECONDS = 30
+
+# Waits for a search to select a location instead of sleeping a fixed second:
+# a short settle delay, then polling for up to three seconds
+WAIT_FOR_SELECTION_HANDLER = '''
+on waitForSelection()
+    delay 0.3
+    repeat 27 times
+        tell application "Maps"
+            if selected location is not missing value then return true
+        end tell
+        delay 0.1
+    end repeat
+    return false
+end waitForSelection
+'''
+
+# Every Maps script returns {status:"ok" or "err", message:...}; records are
+# built outside the tell block so their keys stay plain user fields
+STATUS_RECORD_HANDLER = '''
+on statusRecord(theStatus, theMessage)
+    return {status:theStatus, message:theMessage}
+end statusRecord
+
+on locationsRecord(theLocations)
+    return {status:"ok", message:"", locations:theLocations}
+end locationsRecord
+'''
+
+# Scripts registered by MapsModule; inputs are passed through argv
+CHECK_ACCESS_SCRIPT = '''
+on run argv
+    try
+        tell application "Maps"
+            get name
+            return true
+        end tell
+    on error
+        return false
+    end try
+end run
+'''
+
+SEARCH_LOCATIONS_SCRIPT = WAIT_FOR_SELECTION_HANDLER + STATUS_RECORD_HANDLER + '''
+on run argv
+    set query to item 1 of argv
+    set maxCount to (item 2 of argv) as integer
+    tell application "Maps"
+        try
+            search query
+            my waitForSelection()
+            set locations to {}
+            set searchResults to selected location
+            if searchResults is not missing value and maxCount > 0 then
+                set locName to name of searchResults
+                set locAddress to formatted address of searchResults
+                if locAddress is missing value then
+                    set locAddress to "Unknown"
+                end if
+                set locationInfo to {name:locName, address:locAddress}
+                set end of locations to locationInfo
+            end if
+            return my locationsRecord(locations)
+        on error errMsg
+            return my statusRecord("err", errMsg)
+        end try
+    end tell
+end run
+'''
+
+# Searches for an address and reports whether Maps selected a location.
+# Searching does not need the window, so Maps is not brought to the front;
+# scripts that leave the user to finish in Maps activate it themselves.
+SEARCH_SCRIPT = WAIT_FOR_SELECTION_HANDLER + '''
+on run argv
+    set theAddress to item 1 of argv
+    tell application "Maps"
+        search theAddress
+    end tell
+    return my waitForSelection()
+end run
+'''
+
+# The scripts below act on the location selected by SEARCH_SCRIPT
+SAVE_LOCATION_SCRIPT = STATUS_RECORD_HANDLER + '''
+on run argv
+    set locationName to item 1 of argv
+    set locationAddress to item 2 of argv
+    set showWindow to (item 3 of argv) is "true"
+    tell application "Maps"
+        if showWindow then activate
+        set foundLocation to selected location
+        
+        if foundLocation is not missing value then
+            -- Add to favorites
+            add to favorites foundLocation with properties {name:locationName}
+            return my statusRecord("ok", "Added \\"" & locationName & "\\" to favorites")
+        else
+            return my statusRecord("err", "Could not find location for \\"" & locationAddress & "\\"")
+        end if
+    end tell
+end run
+'''
+
+GET_DIRECTIONS_SCRIPT = STATUS_RECORD_HANDLER + '''
+on run argv
+    set fromAddress to item 1 of argv
+    set toAddress to item 2 of argv
+    set transportType to item 3 of argv
+    tell application "Maps"
+        activate
+        
+        -- Ask for directions
+        get directions from fromAddress to toAddress by transportType
+        
+        return my statusRecord("ok", "Displaying directions from \\"" & fromAddress & "\\" to \\"" & toAddress & "\\" by " & transportType)
+    end tell
+end run
+'''
+
+DROP_PIN_SCRIPT = STATUS_RECORD_HANDLER + '''
+on run argv
+    set pinName to item 1 of argv
+    set pinAddress to item 2 of argv
+    tell application "Maps"
+        activate
+        set foundLocation to selected location
+        
+        if foundLocation is not missing value then
+            -- Drop pin (note: this is a user interface action)
+            return my statusRecord("ok", "Location found. Right-click and select 'Drop Pin' to create a pin named \\"" & pinName & "\\"")
+        else
+            return my statusRecord("err", "Could not find location for \\"" & pinAddress & "\\"")
+        end if
+    end tell
+end run
+'''
+
+LIST_GUIDES_SCRIPT = STATUS_RECORD_HANDLER + '''
+on run argv
+    tell application "Maps"
+        -- Opening the guides view brings Maps to the front
+        open location "maps://?show=guides"
+        
+        return my statusRecord("ok", "Opened guides view in Maps")
+    end tell
+end run
+'''
+
+ADD_TO_GUIDE_SCRIPT = STATUS_RECORD_HANDLER + '''
+on run argv
+    set locationAddress to item 1 of argv
+    set guideName to item 2 of argv
+    tell application "Maps"
+        activate
+        return my statusRecord("ok", "Location found. Click the location pin, then '...' button, and select 'Add to Guide' to add to \\"" & guideName & "\\"")
+    end tell
+end run
+'''
+
+CREATE_GUIDE_SCRIPT = STATUS_RECORD_HANDLER + '''
+on run argv
+    set guideName to item 1 of argv
+    tell application "Maps"
+        -- Opening the guides view brings Maps to the front
+        open location "maps://?show=guides"
+        
+        return my statusRecord("ok", "Opened guides view. Click '+' button and select 'New Guide' to create \\"" & guideName & "\\"")
+    end tell
+end run
+'''
+
 class MapsModule:
     """Module for interacting with Apple Maps"""
     
+    def __init__(self):
+        # Confirmed access for check_maps_access, reset when an operation fails
+        self._access = AccessCache()
+        
+        # Address selected by the last search and when it was searched; the
+        # lock keeps a search and the action on its result together
+        self._last_search: Optional[Tuple[str, float]] = None
+        self._selection_lock: Optional[asyncio.Lock] = None
+        
+        register_script("maps.check_access", CHECK_ACCESS_SCRIPT)
+        register_script("maps.search_locations", SEARCH_LOCATIONS_SCRIPT)
+        register_script("maps.search", SEARCH_SCRIPT)
+        register_script("maps.save_location", SAVE_LOCATION_SCRIPT)
+        register_script("maps.get_directions", GET_DIRECTIONS_SCRIPT)
+        register_script("maps.drop_pin", DROP_PIN_SCRIPT)
+        register_script("maps.list_guides", LIST_GUIDES_SCRIPT)
+        register_script("maps.add_to_guide", ADD_TO_GUIDE_SCRIPT)
+        register_script("maps.create_guide", CREATE_GUIDE_SCRIPT)
+    
     async def check_maps_access(self) -> bool:
         """
         Check if Maps app is accessible
         
+        A successful check is kept for five minutes, or until an operation
+        fails; a failed check is repeated on every call.
+        
+        Returns:
+            True if Maps app is accessible, False otherwise
+        """
+        return await self._access.check(self._probe_maps_access)
+    
+    async def _probe_maps_access(self) -> bool:
+        """
+        Ask Maps whether it can be scripted, bypassing the cached answer
+        
         Returns:
             True if Maps app is accessible, False otherwise
         """
         try:
-            script = '''
-            try
-                tell application "Maps"
-                    get name
-                    return true
-                end tell
-            on error
-                return false
-            end try
-            '''
-            
-            result = await run_applescript_async(script)
+            result = await run_compiled_script("maps.check_access")
             return result.lower() == 'true'
         except Exception as e:
             logger.error(f"Cannot access Maps app: {e}")
             return False
     
-    async def search_locations(self, query: str) -> Dict[str, Any]:
-        """Search for locations in Apple Maps"""
-        script = f'''
-            tell application "Maps"
-                try
-                    activate
-                    search "{query}"
-                    delay 1
-                    set locations to {{}}
-                    set searchResults to selected location
-                    if searchResults is not missing value then
-                        set locName to name of searchResults
-                        set locAddress to formatted address of searchResults
-                        if locAddress is missing value then
-                            set locAddress to "Unknown"
-                        end if
-                        set locationInfo to {{name:locName, address:locAddress}}
-                        set end of locations to locationInfo
-                    end if
-                    return locations
-                on error errMsg
-                    return "ERROR:" & errMsg
-                end try
-            end tell
-        '''
+    async def _ensure_searched(self, address: str) -> bool:
+        """
+        Make the address the selected location in Maps
+        
+        The search is skipped if the same address was searched in the last
+        MAPS_SEARCH_REUSE_SECONDS seconds, so chained calls for one address
+        wait for Maps only once.
         
+        Args:
+            address: The address to search for
+            
+        Returns:
+            True if Maps selected a location for the address, False otherwise
+        """
+        if self._last_search is not None:
+            last_address, searched_at = self._last_search
+            if last_address == address and time.monotonic() - searched_at < MAPS_SEARCH_REUSE_SECONDS:
+                logger.debug(f"Reusing Maps search for {address}")
+                return True
+        
+        self._last_search = None
+        result = await run_compiled_script("maps.search", address)
+        if result.strip().lower() != "true":
+            return False
+        self._last_search = (address, time.monotonic())
+        return True
+    
+    async def _run_status_script(self, name: str, *args: Any) -> Dict[str, Any]:
+        """
+        Run a registered Maps script and return its status record
+        
+        Args:
+            name: Name of the registered script
+            *args: Values passed to the script
+            
+        Returns:
+            A dictionary with "status" ("ok" or "err") and "message"
+            
+        Raises:
+            AppleScriptError: If the script fails
+        """
+        return await run_record_script(name, *args)
+    
+    async def _run_on_location(self, address: str, name: str, *args: Any) -> Dict[str, Any]:
+        """
+        Select the address in Maps and run a registered script acting on it
+        
+        Args:
+            address: The address to select
+            name: Name of the registered script
+            *args: Values passed to the script
+            
+        Returns:
+            The script's status record, or an "err" record if the address was not found
+        """
+        if self._selection_lock is None:
+            self._selection_lock = asyncio.Lock()
+        async with self._selection_lock:
+            try:
+                if not await self._ensure_searched(address):
+                    return {"status": "err", "message": f'Could not find location for "{address}"'}
+                result = await self._run_status_script(name, *args)
+            except AppleScriptError:
+                self._last_search = None
+                raise
+            if result.get("status") != "ok":
+                self._last_search = None
+            return result
+    
+    @ttl_cache(ttl=60, key=lambda self, query, limit: ("maps:search", query, limit))
+    async def search_locations(self, query: str, limit: int = 5) -> Dict[str, Any]:
+        """
+        Search for locations in Apple Maps
+        
+        Args:
+            query: Text to search for
+            limit: Maximum number of locations to return
+            
+        Returns:
+            A dictionary with the matching locations
+        """
         try:
-            result = await run_applescript_async(script)
-            if result.startswith("ERROR:"):
-                logger.error(f"Error in AppleScript: {result}")
+            if self._selection_lock is None:
+                self._selection_lock = asyncio.Lock()
+            async with self._selection_lock:
+                self._last_search = None
+                result = await self._run_status_script("maps.search_locations", query, limit)
+                locations = result.get("locations") or []
+                if locations:
+                    self._last_search = (query, time.monotonic())
+            if result.get("status") != "ok":
+                logger.error(f"Error in AppleScript: {result.get('message')}")
                 return {
                     "success": False,
-                    "message": result.replace("ERROR:", ""),
+                    "message": result.get("message", ""),
                     "locations": []
                 }
-                
-            locations = parse_applescript_list(result)
+            
             return {
                 "success": True,
-                "locations": [parse_applescript_record(loc) for loc in locations]
+                # The source-form path leaves nested records as strings
+                "locations": [
+                    loc if isinstance(loc, dict) else parse_applescript_record(loc)
+                    for loc in locations
+                ]
             }
         except AppleScriptError as e:
+            self._access.reset()
             logger.error(f"Error searching locations: {e}")
             return {
                 "success": False,
@@ -97,13 +359,14 @@ class MapsModule:
                 "locations": []
             }
     
-    async def save_location(self, name: str, address: str) -> Dict[str, Any]:
+    async def save_location(self, name: str, address: str, show_ui: bool = False) -> Dict[str, Any]:
         """
         Save a location to favorites
         
         Args:
             name: Name of the location
             address: Address to save
+            show_ui: Bring the Maps window to the front (default: save in the background)
             
         Returns:
             A dictionary containing the result of the operation
@@ -117,44 +380,17 @@ class MapsModule:
             
             logger.info(f"Saving location: {name} at {address}")
             
-            script = f'''
-                tell application "Maps"
-                    activate
-                    
-                    -- First search for the location
-                    search "{address}"
-                    
-                    -- Wait for search to complete
-                    delay 1
-                    
-                    -- Try to get the current location
-                    set foundLocation to selected location
-                    
-                    if foundLocation is not missing value then
-                        -- Add to favorites
-                        add to favorites foundLocation with properties {{name:"{name}"}}
-                        
-                        -- Return success with location details
-                        set locationAddress to formatted address of foundLocation
-                        if locationAddress is missing value then
-                            set locationAddress to "{address}"
-                        end if
-                        
-                        return "SUCCESS:Added \\"" & "{name}" & "\\" to favorites"
-                    else
-                        return "ERROR:Could not find location for \\"" & "{address}" & "\\""
-                    end if
-                end tell
-            '''
-            
-            result = await run_applescript_async(script)
-            success = result.startswith("SUCCESS:")
+            result = await self._run_on_location(
+                address, "maps.save_location", name, address, "true" if show_ui else "false"
+            )
+            success = result.get("status") == "ok"
             
             return {
                 "success": success,
-                "message": result.replace("SUCCESS:", "").replace("ERROR:", "")
+                "message": result.get("message", "")
             }
         except Exception as e:
+            self._access.reset()
             logger.error(f"Error saving location: {e}")
             return {
                 "success": False,
@@ -187,23 +423,14 @@ class MapsModule:
             
             logger.info(f"Getting directions from {from_address} to {to_address} by {transport_type}")
             
-            script = f'''
-                tell application "Maps"
-                    activate
-                    
-                    -- Ask for directions
-                    get directions from "{from_address}" to "{to_address}" by "{transport_type}"
-                    
-                    return "SUCCESS:Displaying directions from \\"" & "{from_address}" & "\\" to \\"" & "{to_address}" & "\\" by {transport_type}"
-                end tell
-            '''
-            
-            result = await run_applescript_async(script)
-            success = result.startswith("SUCCESS:")
+            # Changes what Maps shows, so the last search is no longer selected
+            self._last_search = None
+            result = await self._run_status_script("maps.get_directions", from_address, to_address, transport_type)
+            success = result.get("status") == "ok"
             
             return {
                 "success": success,
-                "message": result.replace("SUCCESS:", "").replace("ERROR:", ""),
+                "message": result.get("message", ""),
                 "route": {
                     "from": from_address,
                     "to": to_address,
@@ -211,6 +438,7 @@ class MapsModule:
                 } if success else None
             }
         except Exception as e:
+            self._access.reset()
             logger.error(f"Error getting directions: {e}")
             return {
                 "success": False,
@@ -237,36 +465,15 @@ class MapsModule:
             
             logger.info(f"Creating pin at {address} with name {name}")
             
-            script = f'''
-                tell application "Maps"
-                    activate
-                    
-                    -- Search for the location
-                    search "{address}"
-                    
-                    -- Wait for search to complete
-                    delay 1
-                    
-                    -- Try to get the current location
-                    set foundLocation to selected location
-                    
-                    if foundLocation is not missing value then
-                        -- Drop pin (note: this is a user interface action)
-                        return "SUCCESS:Location found. Right-click and select 'Drop Pin' to create a pin named \\"" & "{name}" & "\\""
-                    else
-                        return "ERROR:Could not find location for \\"" & "{address}" & "\\""
-                    end if
-                end tell
-            '''
-            
-            result = await run_applescript_async(script)
-            success = result.startswith("SUCCESS:")
+            result = await self._run_on_location(address, "maps.drop_pin", name, address)
+            success = result.get("status") == "ok"
             
             return {
                 "success": success,
-                "message": result.replace("SUCCESS:", "").replace("ERROR:", "")
+                "message": result.get("message", "")
             }
         except Exception as e:
+            self._access.reset()
             logger.error(f"Error dropping pin: {e}")
             return {
                 "success": False,
@@ -289,26 +496,18 @@ class MapsModule:
             
             logger.info("Listing guides from Maps")
             
-            script = '''
-                tell application "Maps"
-                    activate
-                    
-                    -- Open guides view
-                    open location "maps://?show=guides"
-                    
-                    return "SUCCESS:Opened guides view in Maps"
-                end tell
-            '''
-            
-            result = await run_applescript_async(script)
-            success = result.startswith("SUCCESS:")
+            # Changes what Maps shows, so the last search is no longer selected
+            self._last_search = None
+            result = await self._run_status_script("maps.list_guides")
+            success = result.get("status") == "ok"
             
             return {
                 "success": success,
-                "message": result.replace("SUCCESS:", "").replace("ERROR:", ""),
+                "message": result.get("message", ""),
                 "guides": []  # Note: Currently no direct AppleScript access to guides
             }
         except Exception as e:
+            self._access.reset()
             logger.error(f"Error listing guides: {e}")
             return {
                 "success": False,
@@ -335,28 +534,15 @@ class MapsModule:
             
             logger.info(f"Adding location {location_address} to guide {guide_name}")
             
-            script = f'''
-                tell application "Maps"
-                    activate
-                    
-                    -- Search for the location
-                    search "{location_address}"
-                    
-                    -- Wait for search to complete
-                    delay 1
-                    
-                    return "SUCCESS:Location found. Click the location pin, then '...' button, and select 'Add to Guide' to add to \\"" & "{guide_name}" & "\\""
-                end tell
-            '''
-            
-            result = await run_applescript_async(script)
-            success = result.startswith("SUCCESS:")
+            result = await self._run_on_location(location_address, "maps.add_to_guide", location_address, guide_name)
+            success = result.get("status") == "ok"
             
             return {
                 "success": success,
-                "message": result.replace("SUCCESS:", "").replace("ERROR:", "")
+                "message": result.get("message", "")
             }
         except Exception as e:
+            self._access.reset()
             logger.error(f"Error adding to guide: {e}")
             return {
                 "success": False,
@@ -382,25 +568,17 @@ class MapsModule:
             
             logger.info(f"Creating new guide: {guide_name}")
             
-            script = f'''
-                tell application "Maps"
-                    activate
-                    
-                    -- Open guides view
-                    open location "maps://?show=guides"
-                    
-                    return "SUCCESS:Opened guides view. Click '+' button and select 'New Guide' to create \\"" & "{guide_name}" & "\\""
-                end tell
-            '''
-            
-            result = await run_applescript_async(script)
-            success = result.startswith("SUCCESS:")
+            # Changes what Maps shows, so the last search is no longer selected
+            self._last_search = None
+            result = await self._run_status_script("maps.create_guide", guide_name)
+            success = result.get("status") == "ok"
             
             return {
                 "success": success,
-                "message": result.replace("SUCCESS:", "").replace("ERROR:", "")
+                "message": result.get("message", "")
             }
         except Exception as e:
+            self._access.reset()
             logger.error(f"Error creating guide: {e}")
             return {
                 "success": False,
@@ -1,153 +1,366 @@
 """Message module for interacting with Apple Messages."""
 
+import asyncio
 import logging
-from typing import Dict, List, Any
-from datetime import datetime
+import sqlite3
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+from datetime import datetime, timedelta, timezone
 
 from .applescript import (
-    run_applescript_async, 
+    run_compiled_script,
+    register_script,
     AppleScriptError,
-    parse_applescript_record,
-    parse_applescript_list
+    applescript_call
 )
+from .cache import AccessCache
 
 logger = logging.getLogger(__name__)
 
+# Messages keeps its history in this database; reading it needs Full Disk Access
+MESSAGES_DB_PATH = Path.home() / "Library" / "Messages" / "chat.db"
+
+# message.date counts from 2001-01-01 UTC, in nanoseconds since macOS 10.13
+MESSAGES_EPOCH = datetime(2001, 1, 1, tzinfo=timezone.utc)
+
+MESSAGE_COLUMNS = '''
+    SELECT message.text, message.attributedBody, handle.id, message.date, message.is_from_me
+    FROM message
+    LEFT JOIN handle ON handle.ROWID = message.handle_id
+'''
+
+READ_MESSAGES_QUERY = MESSAGE_COLUMNS + '''
+    JOIN chat_message_join ON chat_message_join.message_id = message.ROWID
+    JOIN chat ON chat.ROWID = chat_message_join.chat_id
+    WHERE same_handle(chat.chat_identifier, ?)
+    ORDER BY message.date DESC
+    LIMIT ?
+'''
+
+UNREAD_MESSAGES_QUERY = MESSAGE_COLUMNS + '''
+    WHERE message.is_read = 0 AND message.is_from_me = 0
+    ORDER BY message.date DESC
+    LIMIT ?
+'''
+
+def _message_date(value: Optional[int]) -> Optional[str]:
+    """Convert a chat.db message date to local time, formatted as YYYY-MM-DD HH:MM:SS"""
+    if not value:
+        return None
+    seconds = value / 1e9 if value > 1e11 else value
+    return (MESSAGES_EPOCH + timedelta(seconds=seconds)).astimezone().strftime("%Y-%m-%d %H:%M:%S")
+
+def _handle_key(handle: str) -> str:
+    """Normalize a phone number to its digits and an email address to lower case"""
+    handle = handle.strip()
+    if "@" in handle:
+        return handle.lower()
+    digits = "".join(character for character in handle if character.isdigit())
+    return digits or handle.lower()
+
+def _same_handle(identifier: Optional[str], wanted: str) -> bool:
+    """Whether a chat identifier belongs to the handle with key ``wanted`` (see _handle_key)"""
+    if identifier is None:
+        return False
+    key = _handle_key(identifier)
+    if key == wanted:
+        return True
+    # chat.db stores numbers with their country code, which callers often leave out
+    if key.isdigit() and wanted.isdigit() and min(len(key), len(wanted)) >= 7:
+        return key.endswith(wanted) or wanted.endswith(key)
+    return False
+
+def _attributed_body_text(blob: Optional[bytes]) -> Optional[str]:
+    """
+    Extract the plain text of a message.attributedBody value
+    
+    Recent macOS versions often leave message.text empty and keep the body
+    only in attributedBody, an NSAttributedString archived as a typedstream.
+    Its string follows the NSString class name and a five byte preamble,
+    prefixed with its length: one byte, or 0x81/0x82 followed by a 2 or 4
+    byte little-endian length.
+    
+    Args:
+        blob: The attributedBody column value
+        
+    Returns:
+        The message text, or None if it cannot be found
+    """
+    if not blob:
+        return None
+    _, found, rest = bytes(blob).partition(b"NSString")
+    if not found or len(rest) < 6:
+        return None
+    rest = rest[5:]
+    if rest[0] == 0x81:
+        length, start = int.from_bytes(rest[1:3], "little"), 3
+    elif rest[0] == 0x82:
+        length, start = int.from_bytes(rest[1:5], "little"), 5
+    else:
+        length, start = rest[0], 1
+    return rest[start:start + length].decode("utf-8", errors="replace")
+
+def _query_messages(query: str, parameters: tuple) -> List[Dict[str, Any]]:
+    """
+    Run a message query against chat.db, opened read-only
+    
+    Args:
+        query: A query selecting text, attributedBody, sender, date and is_from_me
+        parameters: Values for the query's placeholders; a handle compared
+            with same_handle must already be normalized with _handle_key
+        
+    Returns:
+        One dictionary per message, shaped like the AppleScript results
+        
+    Raises:
+        sqlite3.Error: If the database cannot be opened or queried
+    """
+    connection = sqlite3.connect(f"{MESSAGES_DB_PATH.as_uri()}?mode=ro", uri=True)
+    connection.create_function("same_handle", 2, _same_handle, deterministic=True)
+    try:
+        rows = connection.execute(query, parameters).fetchall()
+    finally:
+        connection.close()
+    return [
+        {
+            "content": text if text is not None else _attributed_body_text(attributed_body) or "",
+            "sender": sender,
+            "date": _message_date(date),
+            "is_from_me": bool(is_from_me)
+        }
+        for text, attributed_body, sender, date, is_from_me in rows
+    ]
+
+# Fields of each row returned by the read scripts. The first and last fields
+# are never empty, so an empty message text cannot sit at the end of a row.
+MESSAGE_FIELDS = ("is_from_me", "sender", "content", "date")
+
+def _parse_message_rows(output: str) -> List[Dict[str, Any]]:
+    """
+    Split the rows returned by the read scripts into message dictionaries
+    
+    Args:
+        output: The number of rows followed by the rows, all separated by
+            \\x1e; fields are separated by \\x1f
+        
+    Returns:
+        One dictionary per message, keyed by MESSAGE_FIELDS
+        
+    Raises:
+        ValueError: If the output does not hold the announced rows
+    """
+    total, *rows = output.split("\x1e")
+    if int(total) == 0:
+        return []
+    if len(rows) != int(total):
+        raise ValueError(f"Expected {total} messages in the script output, got {len(rows)}")
+    messages = []
+    for row in rows:
+        fields = row.split("\x1f")
+        if len(fields) != len(MESSAGE_FIELDS):
+            raise ValueError(f"Expected {len(MESSAGE_FIELDS)} message fields, got {len(fields)}")
+        message = dict(zip(MESSAGE_FIELDS, fields))
+        message["is_from_me"] = message["is_from_me"] == "true"
+        messages.append(message)
+    return messages
+
+# Scripts registered by MessageModule; inputs are passed through argv
+CHECK_ACCESS_SCRIPT = '''
+on run argv
+    try
+        tell application "Messages"
+            get name
+            return true
+        end tell
+    on error
+        return false
+    end try
+end run
+'''
+
+SEND_MESSAGE_SCRIPT = '''
+on run argv
+    set phoneNumber to item 1 of argv
+    set messageText to item 2 of argv
+    tell application "Messages"
+        set targetService to 1st service whose service type = iMessage
+        set targetBuddy to buddy phoneNumber of targetService
+        send messageText to targetBuddy
+        return "SUCCESS:Message sent"
+    end tell
+end run
+'''
+
+# The read scripts return one row per message: the MESSAGE_FIELDS joined by
+# the unit separator (character id 31). The row count and the rows are joined
+# by the record separator (character id 30), so Python splits them without a
+# record parser and can check that none were lost.
+MESSAGE_ROW_HANDLER = '''
+on messageRow(isFromMe, senderHandle, sentDate, theText)
+    set fieldSeparator to character id 31
+    return (isFromMe as text) & fieldSeparator & (senderHandle as text) & fieldSeparator & (theText as text) & fieldSeparator & (sentDate as text)
+end messageRow
+
+on joinRows(theRows)
+    set savedDelimiters to AppleScript's text item delimiters
+    set AppleScript's text item delimiters to character id 30
+    set theText to ({count of theRows} & theRows) as text
+    set AppleScript's text item delimiters to savedDelimiters
+    return theText
+end joinRows
+'''
+
+# Only the first maxCount messages are requested, and each property is read
+# for all of them with one Apple Event
+READ_MESSAGES_SCRIPT = MESSAGE_ROW_HANDLER + '''
+on run argv
+    set phoneNumber to item 1 of argv
+    set maxCount to (item 2 of argv) as integer
+    tell application "Messages"
+        set targetService to 1st service whose service type = iMessage
+        set targetBuddy to buddy phoneNumber of targetService
+        set theChat to chat targetBuddy
+        set messageCount to count of messages of theChat
+        if messageCount < maxCount then set maxCount to messageCount
+        if maxCount < 1 then return my joinRows({})
+        set theMessages to a reference to messages 1 thru maxCount of theChat
+        set theTexts to text of theMessages
+        set theSenders to sender of theMessages
+        set theHandles to handle of sender of theMessages
+        set theDates to date sent of theMessages
+    end tell
+    set msgs to {}
+    repeat with i from 1 to maxCount
+        set end of msgs to messageRow(item i of theSenders = me, item i of theHandles, item i of theDates, item i of theTexts)
+    end repeat
+    return joinRows(msgs)
+end run
+'''
+
+SCHEDULE_MESSAGE_SCRIPT = '''
+on run argv
+    set phoneNumber to item 1 of argv
+    set messageText to item 2 of argv
+    set scheduledText to item 3 of argv
+    tell application "Messages"
+        set targetService to 1st service whose service type = iMessage
+        set targetBuddy to buddy phoneNumber of targetService
+        set scheduledTime to date scheduledText
+        send messageText to targetBuddy at scheduledTime
+        return "SUCCESS:Message scheduled for " & scheduledText
+    end tell
+end run
+'''
+
+# Only chats with unread messages are visited, and reading stops at the limit
+UNREAD_MESSAGES_SCRIPT = MESSAGE_ROW_HANDLER + '''
+on run argv
+    set maxCount to (item 1 of argv) as integer
+    set unreadMsgs to {}
+    if maxCount < 1 then return joinRows({})
+    tell application "Messages"
+        repeat with c in (every chat whose unread count > 0)
+            repeat with m in (messages of c whose read status is false)
+                set end of unreadMsgs to my messageRow(sender of m = me, handle of sender of m, date sent of m, text of m)
+                if (count of unreadMsgs) >= maxCount then exit repeat
+            end repeat
+            if (count of unreadMsgs) >= maxCount then exit repeat
+        end repeat
+    end tell
+    return joinRows(unreadMsgs)
+end run
+'''
+
 class MessageModule:
     """Module for interacting with Apple Messages"""
+
+    def __init__(self):
+        # Confirmed access for check_messages_access, reset when an operation fails
+        self._access = AccessCache()
+        
+        register_script("messages.check_access", CHECK_ACCESS_SCRIPT)
+        register_script("messages.send", SEND_MESSAGE_SCRIPT)
+        register_script("messages.read", READ_MESSAGES_SCRIPT)
+        register_script("messages.schedule", SCHEDULE_MESSAGE_SCRIPT)
+        register_script("messages.unread", UNREAD_MESSAGES_SCRIPT)
+
+    @property
+    def access_confirmed(self) -> bool:
+        """Whether a confirmed Messages access is remembered, without probing"""
+        return self._access.granted
     
-    async def check_messages_access(self) -> bool:
-        """Check if Messages app is accessible"""
+    async def check_messages_access(self, probe_result: Optional[bool] = None) -> bool:
+        """
+        Check if Messages app is accessible
+        
+        A successful check is kept for five minutes, or until an operation
+        fails; a failed check is repeated on every call.
+        
+        Args:
+            probe_result: Result of the "messages.check_access" script when the
+                caller already ran it, e.g. batched with other applications;
+                it is stored instead of probing again
+        
+        Returns:
+            True if Messages app is accessible, False otherwise
+        """
+        if probe_result is not None:
+            return await self._access.record(probe_result)
+        return await self._access.check(self._probe_messages_access)
+    
+    async def _probe_messages_access(self) -> bool:
+        """Ask Messages whether it can be scripted, bypassing the cached answer"""
         try:
-            script = '''
-            try
-                tell application "Messages"
-                    get name
-                    return true
-                end tell
-            on error
-                return false
-            end try
-            '''
-            
-            result = await run_applescript_async(script)
+            result = await run_compiled_script("messages.check_access")
             return result.lower() == 'true'
         except Exception as e:
             logger.error(f"Cannot access Messages app: {e}")
             return False
-    
+
+    @applescript_call(lambda e: False, "Error sending message")
     async def send_message(self, phone_number: str, message: str) -> bool:
         """Send a message to a phone number"""
-        script = f'''
-            tell application "Messages"
-                set targetService to 1st service whose service type = iMessage
-                set targetBuddy to buddy "{phone_number}" of targetService
-                send "{message}" to targetBuddy
-                return "SUCCESS:Message sent"
-            end tell
-        '''
-        
-        try:
-            result = await run_applescript_async(script)
-            return result.startswith("SUCCESS:")
-        except AppleScriptError as e:
-            logger.error(f"Error sending message: {e}")
-            return False
-    
+        result = await run_compiled_script("messages.send", phone_number, message)
+        return result.startswith("SUCCESS:")
+
+    @applescript_call(lambda e: [], "Error reading messages", errors=(AppleScriptError, ValueError))
     async def read_messages(self, phone_number: str, limit: int = 10) -> List[Dict[str, Any]]:
-        """Read messages from a specific contact"""
-        script = f'''
-            tell application "Messages"
-                set targetService to 1st service whose service type = iMessage
-                set targetBuddy to buddy "{phone_number}" of targetService
-                set msgs to {{}}
-                set convMessages to messages of chat targetBuddy
-                repeat with i from 1 to {limit}
-                    if i > count of convMessages then exit repeat
-                    set m to item i of convMessages
-                    set end of msgs to {{
-                        content:text of m,
-                        sender:sender of m,
-                        date:date sent of m,
-                        is_from_me:(sender of m = me)
-                    }}
-                end repeat
-                return msgs as text
-            end tell
-        '''
-        
+        """Read messages from a specific contact, newest first"""
         try:
-            result = await run_applescript_async(script)
-            messages = parse_applescript_list(result)
-            return [parse_applescript_record(msg) for msg in messages]
-        except AppleScriptError as e:
-            logger.error(f"Error reading messages: {e}")
-            return []
-    
+            messages = await asyncio.to_thread(_query_messages, READ_MESSAGES_QUERY, (_handle_key(phone_number), limit))
+            if messages:
+                return messages
+            # Messages resolves handles the database spells differently
+            logger.info(f"No messages for {phone_number} in the Messages database, using AppleScript")
+        except sqlite3.Error as e:
+            logger.warning(f"Messages database unavailable, using AppleScript: {e}")
+        
+        result = await run_compiled_script("messages.read", phone_number, limit)
+        return _parse_message_rows(result)
+
+    @applescript_call(lambda e: {"success": False, "message": str(e), "scheduled": None}, "Error scheduling message")
     async def schedule_message(self, phone_number: str, message: str, scheduled_time: str) -> Dict[str, Any]:
         """Schedule a message to be sent later"""
-        script = f'''
-            tell application "Messages"
-                set targetService to 1st service whose service type = iMessage
-                set targetBuddy to buddy "{phone_number}" of targetService
-                set scheduledTime to date "{scheduled_time}"
-                send "{message}" to targetBuddy at scheduledTime
-                return "SUCCESS:Message scheduled for {scheduled_time}"
-            end tell
-        '''
-        
-        try:
-            result = await run_applescript_async(script)
-            success = result.startswith("SUCCESS:")
-            
-            return {
-                "success": success,
-                "message": result.replace("SUCCESS:", "").replace("ERROR:", ""),
-                "scheduled": {
-                    "to": phone_number,
-                    "content": message,
-                    "scheduled_time": scheduled_time
-                } if success else None
-            }
-        except AppleScriptError as e:
-            logger.error(f"Error scheduling message: {e}")
-            return {
-                "success": False,
-                "message": str(e),
-                "scheduled": None
-            }
-    
+        result = await run_compiled_script("messages.schedule", phone_number, message, scheduled_time)
+        success = result.startswith("SUCCESS:")
+
+        return {
+            "success": success,
+            "message": result.replace("SUCCESS:", "").replace("ERROR:", ""),
+            "scheduled": {
+                "to": phone_number,
+                "content": message,
+                "scheduled_time": scheduled_time
+            } if success else None
+        }
+
+    @applescript_call(lambda e: [], "Error getting unread messages", errors=(AppleScriptError, ValueError))
     async def get_unread_messages(self, limit: int = 10) -> List[Dict[str, Any]]:
-        """Get unread messages"""
-        script = f'''
-            tell application "Messages"
-                set unreadMsgs to {{}}
-                set allChats to every chat
-                repeat with c in allChats
-                    if unread count of c > 0 then
-                        set msgs to messages of c
-                        repeat with i from 1 to {limit}
-                            if i > count of msgs then exit repeat
-                            set m to item i of msgs
-                            if read status of m is false then
-                                set end of unreadMsgs to {{
-                                    content:text of m,
-                                    sender:sender of m,
-                                    date:date sent of m,
-                                    is_from_me:(sender of m = me)
-                                }}
-                            end if
-                        end repeat
-                    end if
-                end repeat
-                return unreadMsgs as text
-            end tell
-        '''
-        
+        """Get unread messages, newest first"""
         try:
-            result = await run_applescript_async(script)
-            messages = parse_applescript_list(result)
-            return [parse_applescript_record(msg) for msg in messages]
-        except AppleScriptError as e:
-            logger.error(f"Error getting unread messages: {e}")
-            return []
\ No newline at end of file
+            return await asyncio.to_thread(_query_messages, UNREAD_MESSAGES_QUERY, (limit,))
+        except sqlite3.Error as e:
+            logger.warning(f"Messages database unavailable, using AppleScript: {e}")
+        
+        result = await run_compiled_script("messages.unread", limit)
+        return _parse_message_rows(result)
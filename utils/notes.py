@@ -1,134 +1,190 @@
 """Notes module for interacting with Apple Notes."""
 
 import logging
-from typing import Dict, List, Any
+from typing import AsyncIterator, Dict, List, Any, Optional
 
 from .applescript import (
-    run_applescript_async, 
+    run_compiled_script,
+    run_record_script,
+    stream_compiled_script,
+    register_script,
     AppleScriptError,
-    format_applescript_value,
-    parse_applescript_record,
-    parse_applescript_list
+    applescript_call,
+    json_loads
 )
+from .cache import AccessCache
 
 logger = logging.getLogger(__name__)
 
+# Scripts registered by NotesModule; inputs are passed through argv
+CHECK_ACCESS_SCRIPT = '''
+on run argv
+    try
+        tell application "Notes"
+            get name
+            return true
+        end tell
+    on error
+        return false
+    end try
+end run
+'''
+
+# The lookup scripts are JXA and return their results as JSON. Each property
+# is read for every matching note with one Apple Event.
+# argv: search text
+FIND_NOTE_SCRIPT = '''
+function run(argv) {
+    var query = argv[0];
+    var matching = Application("Notes").notes.whose({_or: [{body: {_contains: query}}, {name: {_contains: query}}]});
+    var names = matching.name();
+    var bodies = matching.body();
+    var result = [];
+    for (var i = 0; i < names.length; i++) {
+        result.push({name: names[i], body: bodies[i]});
+    }
+    return JSON.stringify(result);
+}
+'''
+
+# Logs one JSON object per note with console.log, so notes can be consumed
+# while the script is still writing
+GET_ALL_NOTES_SCRIPT = '''
+function run(argv) {
+    var notes = Application("Notes").notes;
+    var titles = notes.name();
+    var contents = notes.body();
+    var folders = notes.container.name();
+    var creationDates = notes.creationDate();
+    var modificationDates = notes.modificationDate();
+    for (var i = 0; i < titles.length; i++) {
+        console.log(JSON.stringify({
+            title: titles[i],
+            content: contents[i],
+            folder: folders[i],
+            creation_date: creationDates[i],
+            modification_date: modificationDates[i]
+        }));
+    }
+}
+'''
+
+# Returns a record with the new note's id, built outside the tell block so
+# its keys stay plain user fields
+CREATE_NOTE_SCRIPT = '''
+on resultRecord(isSuccess, theMessage, theId)
+    return {success:isSuccess, message:theMessage, id:theId}
+end resultRecord
+
+on run argv
+    set noteTitle to item 1 of argv
+    set noteBody to item 2 of argv
+    set folderName to item 3 of argv
+    try
+        tell application "Notes"
+            tell account "iCloud"
+                if not (exists folder folderName) then
+                    make new folder with properties {name:folderName}
+                end if
+                set noteId to id of (make new note at folder folderName with properties {name:noteTitle, body:noteBody})
+            end tell
+        end tell
+    on error errMsg
+        return resultRecord(false, errMsg, "")
+    end try
+    return resultRecord(true, "Created note '" & noteTitle & "' in folder '" & folderName & "'", noteId)
+end run
+'''
+
 class NotesModule:
     """Module for interacting with Apple Notes"""
+
+    def __init__(self):
+        # Confirmed access for check_notes_access, reset when an operation fails
+        self._access = AccessCache()
+        
+        register_script("notes.check_access", CHECK_ACCESS_SCRIPT)
+        register_script("notes.find", FIND_NOTE_SCRIPT, language="JavaScript")
+        register_script("notes.all", GET_ALL_NOTES_SCRIPT, language="JavaScript")
+        register_script("notes.create", CREATE_NOTE_SCRIPT)
+
+    @property
+    def access_confirmed(self) -> bool:
+        """Whether a confirmed Notes access is remembered, without probing"""
+        return self._access.granted
+    
+    async def check_notes_access(self, probe_result: Optional[bool] = None) -> bool:
+        """
+        Check if Notes app is accessible
+        
+        A successful check is kept for five minutes, or until an operation
+        fails; a failed check is repeated on every call.
+        
+        Args:
+            probe_result: Result of the "notes.check_access" script when the
+                caller already ran it, e.g. batched with other applications;
+                it is stored instead of probing again
+        
+        Returns:
+            True if Notes app is accessible, False otherwise
+        """
+        if probe_result is not None:
+            return await self._access.record(probe_result)
+        return await self._access.check(self._probe_notes_access)
     
-    async def check_notes_access(self) -> bool:
-        """Check if Notes app is accessible"""
+    async def _probe_notes_access(self) -> bool:
+        """Ask Notes whether it can be scripted, bypassing the cached answer"""
         try:
-            script = '''
-            try
-                tell application "Notes"
-                    get name
-                    return true
-                end tell
-            on error
-                return false
-            end try
-            '''
-            
-            result = await run_applescript_async(script)
+            result = await run_compiled_script("notes.check_access")
             return result.lower() == 'true'
         except Exception as e:
             logger.error(f"Cannot access Notes app: {e}")
             return False
-    
+
+    @applescript_call(lambda e: [], "Error finding notes", errors=(AppleScriptError, ValueError))
     async def find_note(self, search_text: str) -> List[Dict[str, Any]]:
         """Find notes containing the search text"""
-        script = f'''
-            tell application "Notes"
-                set matchingNotes to {{}}
-                repeat with n in every note
-                    if (body of n contains "{search_text}") or (name of n contains "{search_text}") then
-                        set noteData to {{name:name of n, body:body of n}}
-                        copy noteData to end of matchingNotes
-                    end if
-                end repeat
-                return matchingNotes
-            end tell
-        '''
+        notes = json_loads(await run_compiled_script("notes.find", search_text))
+        for note in notes:
+            # Normalize keys to ensure consistency with create_note return
+            note["title"] = note["name"]
+            note["content"] = note["body"]
+        return notes
+
+    async def iter_all_notes(self) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield every note as soon as Notes has written it
         
-        try:
-            result = await run_applescript_async(script)
-            notes = parse_applescript_list(result)
-            parsed_notes = []
-            
-            for note in notes:
-                note_dict = parse_applescript_record(note)
-                # Normalize keys to ensure consistency with create_note return
-                if "name" in note_dict:
-                    note_dict["title"] = note_dict["name"]
-                if "body" in note_dict:
-                    note_dict["content"] = note_dict["body"]
-                parsed_notes.append(note_dict)
+        Yields:
+            One dictionary per note with its title, content, folder and dates
             
-            return parsed_notes
-        except AppleScriptError as e:
-            logger.error(f"Error finding notes: {e}")
-            return []
-    
+        Raises:
+            AppleScriptError: If the script fails, possibly after some notes
+                were yielded
+            ValueError: If a note is not valid JSON
+        """
+        async for line in stream_compiled_script("notes.all"):
+            if line.startswith("{"):
+                yield json_loads(line)
+
+    @applescript_call(lambda e: [], "Error getting all notes", errors=(AppleScriptError, ValueError))
     async def get_all_notes(self) -> List[Dict[str, Any]]:
         """Get all notes"""
-        script = '''
-            tell application "Notes"
-                set allNotes to {}
-                repeat with n in every note
-                    set end of allNotes to {
-                        title:name of n,
-                        content:body of n,
-                        folder:name of container of n,
-                        creation_date:creation date of n,
-                        modification_date:modification date of n
-                    }
-                end repeat
-                return allNotes as text
-            end tell
-        '''
-        
-        try:
-            result = await run_applescript_async(script)
-            notes = parse_applescript_list(result)
-            return [parse_applescript_record(note) for note in notes]
-        except AppleScriptError as e:
-            logger.error(f"Error getting all notes: {e}")
-            return []
-    
+        return [note async for note in self.iter_all_notes()]
+
+    @applescript_call(lambda e: {"success": False, "message": str(e), "note": None}, "Error creating note")
     async def create_note(self, title: str, body: str, folder_name: str = 'Claude') -> Dict[str, Any]:
         """Create a new note"""
-        script = f'''
-            tell application "Notes"
-                tell account "iCloud"
-                    if not (exists folder "{folder_name}") then
-                        make new folder with properties {{name:"{folder_name}"}}
-                    end if
-                    tell folder "{folder_name}"
-                        make new note with properties {{name:"{title}", body:"{body}"}}
-                        return "SUCCESS:Created note '{title}' in folder '{folder_name}'"
-                    end tell
-                end tell
-            end tell
-        '''
-        
-        try:
-            result = await run_applescript_async(script)
-            success = result.startswith("SUCCESS:")
-            
-            return {
-                "success": success,
-                "message": result.replace("SUCCESS:", "").replace("ERROR:", ""),
-                "note": {
-                    "title": title,
-                    "content": body,
-                    "folder": folder_name
-                } if success else None
-            }
-        except AppleScriptError as e:
-            logger.error(f"Error creating note: {e}")
-            return {
-                "success": False,
-                "message": str(e),
-                "note": None
-            }
\ No newline at end of file
+        result = await run_record_script("notes.create", title, body, folder_name)
+        success = result.get("success") is True
+
+        return {
+            "success": success,
+            "message": result.get("message", ""),
+            "note": {
+                "id": result.get("id"),
+                "title": title,
+                "content": body,
+                "folder": folder_name
+            } if success else None
+        }
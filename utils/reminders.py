@@ -1,316 +1,744 @@
 """Reminders module for interacting with Apple Reminders."""
 
+import asyncio
 import logging
+import threading
+from collections import Counter
 from typing import Dict, List, Any, Optional
-from datetime import datetime
+from datetime import datetime, timezone
 
 from .applescript import (
-    run_applescript_async, 
+    run_compiled_script,
+    run_native_script,
+    run_record_script,
+    run_source_script,
+    register_script,
+    NATIVE_SCRIPTS_AVAILABLE,
     AppleScriptError,
-    format_applescript_value,
+    applescript_call,
+    json_loads,
     parse_applescript_record,
     parse_applescript_list
 )
+from .cache import cache, ttl_cache, AccessCache
+
+try:
+    from EventKit import EKEventStore, EKEntityTypeReminder
+    from Foundation import NSCalendar
+except ImportError:
+    EKEventStore = None
 
 logger = logging.getLogger(__name__)
 
+# Read results are reused for a few seconds, so repeated queries while the
+# user is looking at their reminders skip the script; writes clear them
+REMINDERS_CACHE_TTL = 5
+
+# Reminder properties that the EventKit path can return
+EVENTKIT_REMINDER_FIELDS = ("name", "id", "notes", "due_date", "completed")
+
+# EKAuthorizationStatus values that allow reading reminders
+# (3 is "authorized", 4 is "full access" on macOS 14 and later)
+EVENTKIT_AUTHORIZED_STATUSES = (3, 4)
+
+# Python names of reminder properties that differ from their JXA names; other
+# snake_case names map to camelCase (creation_date -> creationDate)
+REMINDER_PROPERTIES = {"notes": "body"}
+
+# Scripts registered by RemindersModule; inputs are passed through argv.
+# An empty list name selects the default list.
+CHECK_ACCESS_SCRIPT = '''
+on run argv
+    try
+        tell application "Reminders"
+            get name
+            return true
+        end tell
+    on error
+        return false
+    end try
+end run
+'''
+
+# Returns three parallel columns: list names, list ids and reminder counts. Each
+# property is read for every list with one Apple Event; only the counting of
+# the fetched ids runs in the script. Items are separated by character 30 and
+# columns by character 29, which do not occur in list names.
+GET_ALL_LISTS_SCRIPT = '''
+on run argv
+    tell application "Reminders"
+        set listNames to name of every list
+        set listIds to id of every list
+        set reminderIds to id of reminders of every list
+    end tell
+    set reminderCounts to {}
+    repeat with idsOfList in reminderIds
+        set end of reminderCounts to count of idsOfList
+    end repeat
+    set savedDelimiters to AppleScript's text item delimiters
+    set AppleScript's text item delimiters to character id 30
+    set theColumns to {count of listNames, listNames as text, listIds as text, reminderCounts as text}
+    set AppleScript's text item delimiters to character id 29
+    set output to theColumns as text
+    set AppleScript's text item delimiters to savedDelimiters
+    return output
+end run
+'''
+
+# The reminder scripts are JXA and return their results as JSON. Each property
+# is read for every matching reminder with one Apple Event.
+# argv: limit, list name, "true" to include completed reminders
+GET_ALL_REMINDERS_SCRIPT = '''
+function run(argv) {
+    var Reminders = Application("Reminders");
+    var list = argv[1] ? Reminders.lists.byName(argv[1]) : Reminders.defaultList;
+    var reminders = argv[2] === "true" ? list.reminders : list.reminders.whose({completed: false});
+    // JXA has no range specifiers, so properties are read for every match and
+    // sliced; a count first skips those reads when nothing will be returned
+    if (+argv[0] < 1 || reminders.length === 0) {
+        return "[]";
+    }
+    var names = reminders.name();
+    var ids = reminders.id();
+    var bodies = reminders.body();
+    var dueDates = reminders.dueDate();
+    var completed = reminders.completed();
+    var count = Math.min(names.length, +argv[0]);
+    var result = [];
+    for (var i = 0; i < count; i++) {
+        result.push({name: names[i], id: ids[i], notes: bodies[i], due_date: dueDates[i], completed: completed[i]});
+    }
+    return JSON.stringify(result);
+}
+'''
+
+# Everything snapshot() returns, read in one script: every list with its
+# reminder counts, and the first incomplete reminders of the default list
+# argv: limit
+SNAPSHOT_SCRIPT = '''
+function run(argv) {
+    var Reminders = Application("Reminders");
+    var names = Reminders.lists.name();
+    var ids = Reminders.lists.id();
+    var completedFlags = Reminders.lists.reminders.completed();
+    var lists = [];
+    for (var i = 0; i < names.length; i++) {
+        var completed = completedFlags[i].filter(Boolean).length;
+        lists.push({name: names[i], id: ids[i], reminder_count: completedFlags[i].length,
+                    completed: completed, incomplete: completedFlags[i].length - completed});
+    }
+    var pending = Reminders.defaultList.reminders.whose({completed: false});
+    var reminderNames = pending.name();
+    var reminderIds = pending.id();
+    var bodies = pending.body();
+    var dueDates = pending.dueDate();
+    var count = Math.min(reminderNames.length, +argv[0]);
+    var reminders = [];
+    for (var j = 0; j < count; j++) {
+        reminders.push({name: reminderNames[j], id: reminderIds[j], notes: bodies[j], due_date: dueDates[j], completed: false});
+    }
+    return JSON.stringify({lists: lists, reminders: reminders});
+}
+'''
+
+# Returns one array per field (a column), keyed by the field's Python name, so
+# the keys are written once instead of once per reminder
+# argv: list id, then one "key:property" pair per field to return
+LIST_REMINDERS_SCRIPT = '''
+function run(argv) {
+    var reminders = Application("Reminders").lists.byId(argv[0]).reminders;
+    var columns = {};
+    // An empty list needs one count instead of a read per field
+    if (reminders.length === 0) {
+        return JSON.stringify(columns);
+    }
+    argv.slice(1).forEach(function (pair) {
+        var split = pair.indexOf(":");
+        columns[pair.slice(0, split)] = reminders[pair.slice(split + 1)]();
+    });
+    return JSON.stringify(columns);
+}
+'''
+
+# Use the whose clause for server-side filtering - much faster than iterating
+# argv: search text, limit
+SEARCH_REMINDERS_SCRIPT = '''
+function run(argv) {
+    var text = argv[0];
+    var matching = Application("Reminders").reminders.whose({_or: [{name: {_contains: text}}, {body: {_contains: text}}]});
+    return JSON.stringify(matching.name().slice(0, +argv[1]).map(function (name) {
+        return {name: name};
+    }));
+}
+'''
+
+# The id of the opened reminder follows the message on a second line
+OPEN_REMINDER_SCRIPT = '''
+on run argv
+    set searchText to item 1 of argv
+    tell application "Reminders"
+        try
+            set foundReminder to first reminder whose name contains searchText
+        on error
+            set foundReminder to missing value
+        end try
+        
+        if foundReminder is not missing value then
+            show foundReminder
+            return "SUCCESS:Opened reminder: " & name of foundReminder & linefeed & id of foundReminder
+        else
+            return "ERROR:No reminder found matching '" & searchText & "'"
+        end if
+    end tell
+end run
+'''
+
+OPEN_REMINDER_BY_ID_SCRIPT = '''
+on run argv
+    tell application "Reminders"
+        try
+            set foundReminder to reminder id (item 1 of argv)
+            show foundReminder
+            return "SUCCESS:Opened reminder: " & name of foundReminder
+        on error errMsg
+            return "ERROR:" & errMsg
+        end try
+    end tell
+end run
+'''
+
+# Creates one reminder and returns a record with its id. Notes and due date
+# are optional and left out of the properties when empty.
+CREATE_REMINDER_HANDLER = '''
+on resultRecord(isSuccess, theMessage, theId)
+    return {success:isSuccess, message:theMessage, id:theId}
+end resultRecord
+
+on createReminder(reminderName, listName, reminderNotes, dueDateText)
+    try
+        tell application "Reminders"
+            tell list listName
+                set reminderProperties to {name:reminderName}
+                if reminderNotes is not "" then set reminderProperties to reminderProperties & {body:reminderNotes}
+                if dueDateText is not "" then set reminderProperties to reminderProperties & {due date:date dueDateText}
+                set reminderId to id of (make new reminder with properties reminderProperties)
+            end tell
+        end tell
+    on error errMsg
+        return resultRecord(false, errMsg, "")
+    end try
+    return resultRecord(true, "Reminder created successfully in list '" & listName & "'", reminderId)
+end createReminder
+'''
+
+# argv: name, list name, notes, due date
+CREATE_REMINDER_SCRIPT = CREATE_REMINDER_HANDLER + '''
+on run argv
+    return createReminder(item 1 of argv, item 2 of argv, item 3 of argv, item 4 of argv)
+end run
+'''
+
+# argv: the four create_reminder arguments for each reminder in turn
+CREATE_REMINDERS_BATCH_SCRIPT = CREATE_REMINDER_HANDLER + '''
+on run argv
+    set results to {}
+    repeat with i from 1 to (count of argv) by 4
+        set end of results to createReminder(item i of argv, item (i + 1) of argv, item (i + 2) of argv, item (i + 3) of argv)
+    end repeat
+    return results
+end run
+'''
+
+DELETE_COMPLETED_SCRIPT = '''
+on run argv
+    set listName to item 1 of argv
+    set deleteCount to (item 2 of argv) as integer
+    tell application "Reminders"
+        try
+            if listName is "" then
+                set theList to default list
+            else
+                set theList to list listName
+            end if
+            -- Ids stay valid as reminders are deleted, unlike index references,
+            -- so the completed reminders are looked up only once
+            set completedIds to id of (reminders of theList whose completed is true)
+            set totalCount to count of completedIds
+            if totalCount < deleteCount then set deleteCount to totalCount
+
+            if deleteCount = totalCount and deleteCount > 0 then
+                delete (reminders of theList whose completed is true)
+            else if deleteCount > 0 then
+                set deleteIds to items 1 thru deleteCount of completedIds
+                try
+                    -- One Apple Event for the whole batch
+                    delete (reminders of theList whose id is in deleteIds)
+                on error
+                    repeat with deleteId in deleteIds
+                        delete reminder id (contents of deleteId) of theList
+                    end repeat
+                end try
+            end if
+
+            return "SUCCESS:" & deleteCount & " deleted, " & (totalCount - deleteCount) & " remaining"
+        on error errMsg
+            return "ERROR:" & errMsg
+        end try
+    end tell
+end run
+'''
+
+COMPLETED_COUNT_SCRIPT = '''
+on run argv
+    set listName to item 1 of argv
+    tell application "Reminders"
+        try
+            if listName is "" then
+                set theList to default list
+            else
+                set theList to list listName
+            end if
+            -- One scan of the list; the flags are counted locally
+            set completedFlags to completed of reminders of theList
+            set completedCount to 0
+            repeat with isCompleted in completedFlags
+                if contents of isCompleted then set completedCount to completedCount + 1
+            end repeat
+            return "completed:" & completedCount & ",incomplete:" & ((count of completedFlags) - completedCount)
+        on error errMsg
+            return "ERROR:" & errMsg
+        end try
+    end tell
+end run
+'''
+
+def _jxa_property(prop: str) -> str:
+    """The JXA accessor for a Python reminder property name"""
+    if prop in REMINDER_PROPERTIES:
+        return REMINDER_PROPERTIES[prop]
+    first, *rest = prop.split("_")
+    return first + "".join(word.capitalize() for word in rest)
+
 class RemindersModule:
     """Module for interacting with Apple Reminders"""
     
-    async def check_reminders_access(self) -> bool:
-        """Check if Reminders app is accessible"""
+    def __init__(self):
+        # Confirmed access for check_reminders_access, reset when an operation fails
+        self._access = AccessCache()
+        
+        # Id of the reminder last opened for each search text
+        self._open_cache: Dict[str, str] = {}
+        
+        register_script("reminders.check_access", CHECK_ACCESS_SCRIPT)
+        register_script("reminders.all_lists", GET_ALL_LISTS_SCRIPT)
+        register_script("reminders.all_reminders", GET_ALL_REMINDERS_SCRIPT, language="JavaScript")
+        register_script("reminders.search", SEARCH_REMINDERS_SCRIPT, language="JavaScript")
+        register_script("reminders.list_reminders", LIST_REMINDERS_SCRIPT, language="JavaScript")
+        register_script("reminders.snapshot", SNAPSHOT_SCRIPT, language="JavaScript")
+        register_script("reminders.open", OPEN_REMINDER_SCRIPT)
+        register_script("reminders.open_by_id", OPEN_REMINDER_BY_ID_SCRIPT)
+        register_script("reminders.create", CREATE_REMINDER_SCRIPT)
+        register_script("reminders.create_batch", CREATE_REMINDERS_BATCH_SCRIPT)
+        register_script("reminders.delete_completed", DELETE_COMPLETED_SCRIPT)
+        register_script("reminders.completed_count", COMPLETED_COUNT_SCRIPT)
+        
+        # EventKit reads the reminder store in-process; AppleScript is the fallback
+        self.store = EKEventStore.alloc().init() if EKEventStore is not None else None
+    
+    def _request_eventkit_access(self) -> bool:
+        """Ask for reminders access through EventKit, blocking until the user answers"""
+        status = EKEventStore.authorizationStatusForEntityType_(EKEntityTypeReminder)
+        if status in EVENTKIT_AUTHORIZED_STATUSES:
+            return True
+        if status != 0:
+            # Access was denied or restricted; asking again would not prompt
+            return False
+        
+        answered = threading.Event()
+        granted = []
+        
+        def completion(ok, error):
+            granted.append(bool(ok))
+            answered.set()
+        
+        if hasattr(self.store, "requestFullAccessToRemindersWithCompletion_"):
+            self.store.requestFullAccessToRemindersWithCompletion_(completion)
+        else:
+            self.store.requestAccessToEntityType_completion_(EKEntityTypeReminder, completion)
+        answered.wait(60)
+        return bool(granted and granted[0])
+    
+    async def _eventkit_ready(self) -> bool:
+        """Whether reminders can be read through EventKit"""
+        if self.store is None:
+            return False
         try:
-            script = '''
-            try
-                tell application "Reminders"
-                    get name
-                    return true
-                end tell
-            on error
-                return false
-            end try
-            '''
-            
-            result = await run_applescript_async(script)
+            return await asyncio.to_thread(self._request_eventkit_access)
+        except Exception as e:
+            logger.warning(f"EventKit unavailable, using AppleScript: {e}")
+            return False
+    
+    def _fetch_reminders_eventkit(self, predicate: Any) -> List[Any]:
+        """Fetch the EKReminder objects matching a predicate, blocking until EventKit answers"""
+        fetched = threading.Event()
+        reminders = []
+        
+        def completion(result):
+            reminders.extend(result or [])
+            fetched.set()
+        
+        self.store.fetchRemindersMatchingPredicate_completion_(predicate, completion)
+        fetched.wait(60)
+        return reminders
+    
+    def _calendars_eventkit(self, list_name: Optional[str]) -> List[Any]:
+        """The reminder lists named list_name, or the default list when no name is given"""
+        if not list_name:
+            return [self.store.defaultCalendarForNewReminders()]
+        return [
+            calendar for calendar in self.store.calendarsForEntityType_(EKEntityTypeReminder)
+            if calendar.title() == list_name
+        ]
+    
+    @staticmethod
+    def _reminder_record(reminder: Any) -> Dict[str, Any]:
+        """Convert an EKReminder to the record returned by get_all_reminders"""
+        due_date = None
+        components = reminder.dueDateComponents()
+        if components is not None:
+            date = NSCalendar.currentCalendar().dateFromComponents_(components)
+            if date is not None:
+                due_date = datetime.fromtimestamp(date.timeIntervalSince1970(), timezone.utc).isoformat()
+        return {
+            "name": reminder.title(),
+            "id": reminder.calendarItemIdentifier(),
+            "notes": reminder.notes(),
+            "due_date": due_date,
+            "completed": bool(reminder.isCompleted())
+        }
+    
+    def _get_all_lists_eventkit(self) -> List[Dict[str, Any]]:
+        """Read every reminder list and its reminder count with EventKit"""
+        predicate = self.store.predicateForRemindersInCalendars_(None)
+        counts = Counter(reminder.calendar().calendarIdentifier() for reminder in self._fetch_reminders_eventkit(predicate))
+        return [
+            {
+                "name": calendar.title(),
+                "id": calendar.calendarIdentifier(),
+                "reminder_count": counts[calendar.calendarIdentifier()]
+            }
+            for calendar in self.store.calendarsForEntityType_(EKEntityTypeReminder)
+        ]
+    
+    def _get_list_reminders_eventkit(self, list_id: str) -> Optional[List[Dict[str, Any]]]:
+        """Read the reminders of the list with an EventKit identifier, or None if there is no such list"""
+        calendar = self.store.calendarWithIdentifier_(list_id)
+        if calendar is None:
+            return None
+        predicate = self.store.predicateForRemindersInCalendars_([calendar])
+        return [self._reminder_record(reminder) for reminder in self._fetch_reminders_eventkit(predicate)]
+    
+    def _get_all_reminders_eventkit(self, limit: int, list_name: Optional[str], include_completed: bool) -> List[Dict[str, Any]]:
+        """Read the reminders of one list with EventKit"""
+        calendars = self._calendars_eventkit(list_name)
+        if not calendars:
+            return []
+        if include_completed:
+            predicate = self.store.predicateForRemindersInCalendars_(calendars)
+        else:
+            predicate = self.store.predicateForIncompleteRemindersWithDueDateStarting_ending_calendars_(None, None, calendars)
+        return [self._reminder_record(reminder) for reminder in self._fetch_reminders_eventkit(predicate)[:limit]]
+    
+    def _snapshot_eventkit(self, limit: int) -> Dict[str, Any]:
+        """Read every list with its counts and the first incomplete reminders of the default list with EventKit"""
+        totals = Counter()
+        completed = Counter()
+        for reminder in self._fetch_reminders_eventkit(self.store.predicateForRemindersInCalendars_(None)):
+            list_id = reminder.calendar().calendarIdentifier()
+            totals[list_id] += 1
+            completed[list_id] += bool(reminder.isCompleted())
+        lists = [
+            {
+                "name": calendar.title(),
+                "id": calendar.calendarIdentifier(),
+                "reminder_count": totals[calendar.calendarIdentifier()],
+                "completed": completed[calendar.calendarIdentifier()],
+                "incomplete": totals[calendar.calendarIdentifier()] - completed[calendar.calendarIdentifier()]
+            }
+            for calendar in self.store.calendarsForEntityType_(EKEntityTypeReminder)
+        ]
+        return {"lists": lists, "reminders": self._get_all_reminders_eventkit(limit, None, False)}
+    
+    def _search_reminders_eventkit(self, search_text: str, limit: int) -> List[Dict[str, Any]]:
+        """Find reminders whose title or notes contain the text with EventKit"""
+        needle = search_text.lower()
+        matches = []
+        for reminder in self._fetch_reminders_eventkit(self.store.predicateForRemindersInCalendars_(None)):
+            if needle in (reminder.title() or "").lower() or needle in (reminder.notes() or "").lower():
+                matches.append({"name": reminder.title()})
+                if len(matches) >= limit:
+                    break
+        return matches
+    
+    @property
+    def access_confirmed(self) -> bool:
+        """Whether a confirmed Reminders access is remembered, without probing"""
+        return self._access.granted
+    
+    async def check_reminders_access(self, probe_result: Optional[bool] = None) -> bool:
+        """
+        Check if Reminders app is accessible
+        
+        A successful check is kept for five minutes, or until an operation
+        fails; a failed check is repeated on every call.
+        
+        Args:
+            probe_result: Result of the "reminders.check_access" script when the
+                caller already ran it, e.g. batched with other applications;
+                it is stored instead of probing again
+        
+        Returns:
+            True if Reminders app is accessible, False otherwise
+        """
+        if probe_result is not None:
+            return await self._access.record(probe_result)
+        return await self._access.check(self._probe_reminders_access)
+    
+    async def _probe_reminders_access(self) -> bool:
+        """Ask Reminders whether it can be scripted, bypassing the cached answer"""
+        try:
+            result = await run_compiled_script("reminders.check_access")
             return result.lower() == 'true'
         except Exception as e:
             logger.error(f"Cannot access Reminders app: {e}")
             return False
     
+    @ttl_cache(ttl=REMINDERS_CACHE_TTL, key=lambda self: ("reminders:lists",))
+    @applescript_call(lambda e: [], "Error getting reminder lists", errors=(AppleScriptError, ValueError))
     async def get_all_lists(self) -> List[Dict[str, Any]]:
         """Get all reminder lists"""
-        script = '''
-            tell application "Reminders"
-                set output to "["
-                set isFirst to true
-                repeat with l in every list
-                    set listName to name of l
-                    set listId to id of l
-                    set reminderCount to count of (reminders in l)
-                    if not isFirst then
-                        set output to output & ","
-                    end if
-                    set output to output & "{\\"name\\":\\"" & listName & "\\",\\"id\\":\\"" & listId & "\\",\\"reminder_count\\":" & reminderCount & "}"
-                    set isFirst to false
-                end repeat
-                set output to output & "]"
-                return output
-            end tell
-        '''
-
-        try:
-            import json
-            result = await run_applescript_async(script)
-            return json.loads(result)
-        except AppleScriptError as e:
-            logger.error(f"Error getting reminder lists: {e}")
-            return []
-        except json.JSONDecodeError as e:
-            logger.error(f"Error parsing reminder lists JSON: {e}")
+        if await self._eventkit_ready():
+            return await asyncio.to_thread(self._get_all_lists_eventkit)
+        
+        # The list count comes first, so an empty name cannot shift the columns
+        total, *columns = (await run_compiled_script("reminders.all_lists")).split("\x1d")
+        if int(total) == 0:
             return []
+        names, ids, counts = (column.split("\x1e") for column in columns)
+        if not len(names) == len(ids) == len(counts) == int(total):
+            raise ValueError(f"Expected {total} reminder lists in the script output")
+        return [
+            {"name": name, "id": list_id, "reminder_count": int(count)}
+            for name, list_id, count in zip(names, ids, counts)
+        ]
     
+    @applescript_call(lambda e: [], "Error getting all reminders", errors=(AppleScriptError, ValueError))
     async def get_all_reminders(self, limit: int = 50, list_name: Optional[str] = None, include_completed: bool = False) -> List[Dict[str, Any]]:
-        """Get reminders. Filters to incomplete by default for performance."""
-        target_list = f'list "{list_name}"' if list_name else 'default list'
-        completed_filter = "" if include_completed else " whose completed is false"
-        # Batch fetch names in single Apple event
-        script = f'''
-            tell application "Reminders"
-                set theList to {target_list}
-                set allNames to name of (reminders of theList{completed_filter})
-                set maxItems to {limit}
-                if (count of allNames) < maxItems then set maxItems to (count of allNames)
-                set resultList to items 1 thru maxItems of allNames
-                return resultList
-            end tell
-        '''
-
-        try:
-            result = await run_applescript_async(script)
-            # Parse AppleScript list format: "item1, item2, item3"
-            if not result.strip():
-                return []
-            names = parse_applescript_list(result)
-            return [{"name": name.strip()} for name in names if name.strip()]
-        except AppleScriptError as e:
-            logger.error(f"Error getting all reminders: {e}")
-            return []
+        """
+        Get reminders. Filters to incomplete by default for performance.
+        
+        Returns:
+            Records with the name, id, notes, due_date and completed state of each reminder
+        """
+        if await self._eventkit_ready():
+            return await asyncio.to_thread(self._get_all_reminders_eventkit, limit, list_name, include_completed)
+        
+        result = await run_compiled_script(
+            "reminders.all_reminders", limit, list_name or "", "true" if include_completed else "false"
+        )
+        return json_loads(result)
     
+    @ttl_cache(ttl=REMINDERS_CACHE_TTL, key=lambda self, search_text, limit: ("reminders:search", search_text, limit))
+    @applescript_call(lambda e: [], "Error searching reminders", errors=(AppleScriptError, ValueError))
     async def search_reminders(self, search_text: str, limit: int = 50) -> List[Dict[str, Any]]:
         """Search for reminders matching text using server-side filtering (faster)."""
-        # Use 'whose' clause for server-side filtering - much faster than AppleScript iteration
-        from .applescript import escape_string
-        escaped_text = escape_string(search_text)
-        script = f'''
-            tell application "Reminders"
-                try
-                    set matchingNames to name of (reminders whose name contains "{escaped_text}")
-                    set maxItems to {limit}
-                    if (count of matchingNames) < maxItems then set maxItems to (count of matchingNames)
-                    if maxItems = 0 then return ""
-                    set resultList to items 1 thru maxItems of matchingNames
-                    return resultList
-                on error errMsg
-                    return "ERROR:" & errMsg
-                end try
-            end tell
-        '''
-
-        try:
-            result = await run_applescript_async(script)
-            if result.startswith("ERROR:"):
-                logger.error(f"Error in AppleScript: {result}")
-                return []
-            if not result.strip():
-                return []
-            names = parse_applescript_list(result)
-            return [{"name": name.strip()} for name in names if name.strip()]
-        except AppleScriptError as e:
-            logger.error(f"Error searching reminders: {e}")
-            return []
+        if await self._eventkit_ready():
+            return await asyncio.to_thread(self._search_reminders_eventkit, search_text, limit)
+        
+        result = await run_compiled_script("reminders.search", search_text, limit)
+        return json_loads(result)
     
+    @applescript_call(lambda e: {"success": False, "message": str(e), "reminder": None}, "Error opening reminder")
     async def open_reminder(self, search_text: str) -> Dict[str, Any]:
         """Open a reminder matching text"""
-        script = f'''
-            tell application "Reminders"
-                set foundReminder to missing value
-                repeat with r in every reminder
-                    if name of r contains "{search_text}" then
-                        set foundReminder to r
-                        exit repeat
-                    end if
-                end repeat
-                
-                if foundReminder is not missing value then
-                    show foundReminder
-                    return "SUCCESS:Opened reminder: " & name of foundReminder
-                else
-                    return "ERROR:No reminder found matching '{search_text}'"
-                end if
-            end tell
-        '''
+        # A reminder opened before for the same text is shown by id, without searching
+        reminder_id = self._open_cache.get(search_text)
+        if reminder_id is not None:
+            result = await run_compiled_script("reminders.open_by_id", reminder_id)
+            if result.startswith("SUCCESS:"):
+                return {
+                    "success": True,
+                    "message": result[len("SUCCESS:"):],
+                    "reminder": None
+                }
+            del self._open_cache[search_text]
         
-        try:
-            result = await run_applescript_async(script)
-            success = result.startswith("SUCCESS:")
-            
-            return {
-                "success": success,
-                "message": result.replace("SUCCESS:", "").replace("ERROR:", ""),
-                "reminder": None  # Note: We could parse the reminder details if needed
-            }
-        except AppleScriptError as e:
-            logger.error(f"Error opening reminder: {e}")
-            return {
-                "success": False,
-                "message": str(e),
-                "reminder": None
-            }
+        result = await run_compiled_script("reminders.open", search_text)
+        success = result.startswith("SUCCESS:")
+        if success:
+            result, _, reminder_id = result.partition("\n")
+            self._open_cache[search_text] = reminder_id
+        
+        return {
+            "success": success,
+            "message": result.replace("SUCCESS:", "").replace("ERROR:", ""),
+            "reminder": None  # Note: We could parse the reminder details if needed
+        }
     
+    @applescript_call(lambda e: {"success": False, "message": str(e)}, "Error creating reminder")
     async def create_reminder(self, name: str, list_name: str = None, notes: str = None, due_date: datetime = None) -> Dict[str, Any]:
-        """Create a new reminder"""
+        """
+        Create a new reminder
+        
+        Returns:
+            A dictionary with "success", "message" and the new reminder's "id"
+        """
         # Format date for AppleScript if provided
         due_date_str = due_date.strftime("%Y-%m-%d %H:%M:%S") if due_date else None
         
-        # Build the properties string
-        properties = [f'name:"{name}"']
-        if notes:
-            properties.append(f'body:"{notes}"')
-        if due_date_str:
-            properties.append(f'due date:date "{due_date_str}"')
+        result = await run_record_script(
+            "reminders.create", name, list_name or "Reminders", notes or "", due_date_str or ""
+        )
+        success = result.get("success") is True
+        if success:
+            cache.invalidate_prefix("reminders:")
+        return {
+            "success": success,
+            "message": result.get("message", ""),
+            "id": result.get("id") if success else None
+        }
+    
+    async def create_reminders_batch(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Create several reminders with a single script
+        
+        Args:
+            items: One dictionary per reminder with "name" and optionally
+                "list_name", "notes" and "due_date" (a datetime), as taken
+                by create_reminder
             
-        properties_str = ", ".join(properties)
+        Returns:
+            One dictionary per item, in input order, with "success",
+            "message" and the new reminder's "id"
+        """
+        if not items:
+            return []
         
-        # Use default "Reminders" list if none specified
-        list_to_use = list_name or 'Reminders'
-        
-        script = f'''
-            tell application "Reminders"
-                try
-                    tell list "{list_to_use}"
-                        make new reminder with properties {{{properties_str}}}
-                        return "SUCCESS:Reminder created successfully in list '{list_to_use}'"
-                    end tell
-                on error errMsg
-                    return "ERROR:" & errMsg
-                end try
-            end tell
-        '''
+        args = []
+        for item in items:
+            due_date = item.get("due_date")
+            args.extend([
+                item["name"],
+                item.get("list_name") or "Reminders",
+                item.get("notes") or "",
+                due_date.strftime("%Y-%m-%d %H:%M:%S") if due_date else ""
+            ])
         
         try:
-            result = await run_applescript_async(script)
-            success = result.startswith("SUCCESS:")
-            return {
-                "success": success,
-                "message": result.replace("SUCCESS:", "").replace("ERROR:", "")
-            }
+            if NATIVE_SCRIPTS_AVAILABLE:
+                results = await run_native_script("reminders.create_batch", *args)
+            else:
+                output = await run_source_script("reminders.create_batch", *args)
+                results = [parse_applescript_record(result) for result in parse_applescript_list(output)]
         except AppleScriptError as e:
-            logger.error(f"Error creating reminder: {e}")
-            return {
-                "success": False,
-                "message": str(e)
+            self._access.reset()
+            logger.error(f"Error creating reminders: {e}")
+            return [{"success": False, "message": str(e), "id": None} for _ in items]
+        
+        if any(result.get("success") is True for result in results):
+            cache.invalidate_prefix("reminders:")
+        
+        return [
+            {
+                "success": result.get("success") is True,
+                "message": result.get("message", ""),
+                "id": result.get("id") if result.get("success") is True else None
             }
+            for result in results
+        ]
     
+    @applescript_call(lambda e: {"success": False, "message": str(e)}, "Error deleting completed reminders")
     async def delete_completed_reminders(self, list_name: Optional[str] = None, batch_size: int = 10) -> Dict[str, Any]:
         """Delete completed reminders in batches. Returns count deleted."""
-        target_list = f'list "{list_name}"' if list_name else 'default list'
-        script = f'''
-            tell application "Reminders"
-                try
-                    set theList to {target_list}
-                    set completedOnes to (reminders of theList whose completed is true)
-                    set totalCount to count of completedOnes
-                    set deleteCount to {batch_size}
-                    if totalCount < deleteCount then set deleteCount to totalCount
-
-                    repeat with i from 1 to deleteCount
-                        delete item 1 of completedOnes
-                        -- Refresh the list after each delete
-                        set completedOnes to (reminders of theList whose completed is true)
-                    end repeat
-
-                    return "SUCCESS:" & deleteCount & " deleted, " & (totalCount - deleteCount) & " remaining"
-                on error errMsg
-                    return "ERROR:" & errMsg
-                end try
-            end tell
-        '''
-
-        try:
-            result = await run_applescript_async(script)
-            success = result.startswith("SUCCESS:")
-            return {
-                "success": success,
-                "message": result.replace("SUCCESS:", "").replace("ERROR:", "")
-            }
-        except AppleScriptError as e:
-            logger.error(f"Error deleting completed reminders: {e}")
-            return {"success": False, "message": str(e)}
-
+        result = await run_compiled_script("reminders.delete_completed", list_name or "", batch_size)
+        success = result.startswith("SUCCESS:")
+        if success:
+            cache.invalidate_prefix("reminders:")
+        return {
+            "success": success,
+            "message": result.replace("SUCCESS:", "").replace("ERROR:", "")
+        }
+    
+    @ttl_cache(ttl=REMINDERS_CACHE_TTL, key=lambda self, list_name: ("reminders:count", list_name))
+    @applescript_call(lambda e: {"success": False, "message": str(e)}, "Error getting completed count")
     async def get_completed_count(self, list_name: Optional[str] = None) -> Dict[str, Any]:
         """Get count of completed reminders in a list."""
-        target_list = f'list "{list_name}"' if list_name else 'default list'
-        script = f'''
-            tell application "Reminders"
-                try
-                    set theList to {target_list}
-                    set completedCount to count of (reminders of theList whose completed is true)
-                    set incompleteCount to count of (reminders of theList whose completed is false)
-                    return "completed:" & completedCount & ",incomplete:" & incompleteCount
-                on error errMsg
-                    return "ERROR:" & errMsg
-                end try
-            end tell
-        '''
-
-        try:
-            result = await run_applescript_async(script)
-            if result.startswith("ERROR:"):
-                return {"success": False, "message": result.replace("ERROR:", "")}
-            # Parse "completed:X,incomplete:Y"
-            parts = dict(p.split(":") for p in result.split(","))
-            return {
-                "success": True,
-                "completed": int(parts.get("completed", 0)),
-                "incomplete": int(parts.get("incomplete", 0))
-            }
-        except AppleScriptError as e:
-            logger.error(f"Error getting completed count: {e}")
-            return {"success": False, "message": str(e)}
-
+        result = await run_compiled_script("reminders.completed_count", list_name or "")
+        if result.startswith("ERROR:"):
+            return {"success": False, "message": result.replace("ERROR:", "")}
+        # Parse "completed:X,incomplete:Y"
+        parts = dict(p.split(":") for p in result.split(","))
+        return {
+            "success": True,
+            "completed": int(parts.get("completed", 0)),
+            "incomplete": int(parts.get("incomplete", 0))
+        }
+    
+    async def get_stats_for_all_lists(self) -> List[Dict[str, Any]]:
+        """
+        Get completed and incomplete counts for every reminder list
+        
+        The lists are counted concurrently, so the counts take about as long
+        as the slowest list rather than the sum of all of them.
+        
+        Returns:
+            One dictionary per list with its "name" and "id" and the fields
+            returned by get_completed_count
+        """
+        lists = await self.get_all_lists()
+        stats = await asyncio.gather(*(self.get_completed_count(reminder_list["name"]) for reminder_list in lists))
+        return [
+            {"name": reminder_list["name"], "id": reminder_list["id"], **list_stats}
+            for reminder_list, list_stats in zip(lists, stats)
+        ]
+    
+    @applescript_call(lambda e: {"lists": [], "reminders": []}, "Error getting reminders snapshot", errors=(AppleScriptError, ValueError))
+    async def snapshot(self, limit: int = 10) -> Dict[str, Any]:
+        """
+        Get an overview of Reminders with one script
+        
+        Replaces calling get_all_lists, get_completed_count for each list
+        and get_all_reminders one after another.
+        
+        Args:
+            limit: Maximum number of reminders to return
+            
+        Returns:
+            A dictionary with "lists", one record per list with its name, id,
+            reminder_count, completed and incomplete counts, and "reminders",
+            the first incomplete reminders of the default list as returned by
+            get_all_reminders
+        """
+        if await self._eventkit_ready():
+            return await asyncio.to_thread(self._snapshot_eventkit, limit)
+        
+        return json_loads(await run_compiled_script("reminders.snapshot", limit))
+    
+    @applescript_call(lambda e: [], "Error getting reminders from list", errors=(AppleScriptError, ValueError))
     async def get_reminders_from_list_by_id(self, list_id: str, props: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         """Get reminders from a specific list by ID"""
         if not props:
             props = ["name", "id", "notes", "due_date", "completed"]
-            
-        props_str = ", ".join(props)
-        
-        script = f'''
-            tell application "Reminders"
-                set theList to list id "{list_id}"
-                set listReminders to {{}}
-                repeat with r in reminders in theList
-                    set reminderProps to {{}}
-                    {" ".join([f'set end of reminderProps to {{"{prop}":{prop} of r}}' for prop in props])}
-                    set end of listReminders to reminderProps
-                end repeat
-                return listReminders as text
-            end tell
-        '''
         
-        try:
-            result = await run_applescript_async(script)
-            reminders = parse_applescript_list(result)
-            
-            # Combine properties for each reminder
-            parsed_reminders = []
-            for reminder in reminders:
-                reminder_data = {}
-                for prop_dict in parse_applescript_list(reminder):
-                    reminder_data.update(parse_applescript_record(prop_dict))
-                parsed_reminders.append(reminder_data)
-                
-            return parsed_reminders
-        except AppleScriptError as e:
-            logger.error(f"Error getting reminders from list: {e}")
-            return []
\ No newline at end of file
+        # Lists returned by get_all_lists through EventKit carry EventKit identifiers
+        if await self._eventkit_ready() and set(props) <= set(EVENTKIT_REMINDER_FIELDS):
+            reminders = await asyncio.to_thread(self._get_list_reminders_eventkit, list_id)
+            if reminders is not None:
+                return [{prop: reminder[prop] for prop in props} for reminder in reminders]
+        
+        fields = [f"{prop}:{_jxa_property(prop)}" for prop in props]
+        columns = json_loads(await run_compiled_script("reminders.list_reminders", list_id, *fields))
+        
+        # One flat record per reminder, keyed by the Python property names
+        keys = list(columns)
+        return [dict(zip(keys, row)) for row in zip(*columns.values())]
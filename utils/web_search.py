@@ -1,20 +1,86 @@
 """Web Search module for performing web searches."""
 
+import asyncio
 import logging
-import json
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 
-from .applescript import run_applescript_async, AppleScriptError
+import httpx
+
+from .applescript import json_loads
 
 logger = logging.getLogger(__name__)
 
+DUCKDUCKGO_URL = "https://api.duckduckgo.com/"
+
+# Searches allowed to run at the same time
+MAX_CONCURRENT_SEARCHES = 4
+
+def _topic_results(topics: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Flatten DuckDuckGo related topics, which may be grouped under a category name"""
+    results = []
+    for topic in topics:
+        if "Topics" in topic:
+            results.extend(_topic_results(topic["Topics"]))
+        elif topic.get("FirstURL"):
+            results.append({"title": topic.get("Text", ""), "url": topic["FirstURL"]})
+    return results
+
 class WebSearchModule:
     """Module for performing web searches"""
-    
+
+    def __init__(self):
+        # One pooled client is reused so later searches skip the TCP and TLS setup
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared HTTP client, creating it on first use"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(timeout=10.0)
+        return self._client
+
     async def web_search(self, query: str) -> Dict[str, Any]:
-        """Search the web using DuckDuckGo"""
-        # This is a placeholder - implement the actual functionality
+        """
+        Search the web using DuckDuckGo
+
+        Args:
+            query: The text to search for
+
+        Returns:
+            A dictionary with the "query" and a list of "results", each with
+            a "title" and "url"
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(MAX_CONCURRENT_SEARCHES)
+
+        try:
+            async with self._semaphore:
+                response = await self._get_client().get(
+                    DUCKDUCKGO_URL,
+                    params={"q": query, "format": "json", "no_html": "1", "skip_disambig": "1"}
+                )
+                response.raise_for_status()
+            data = json_loads(response.content)
+        except (httpx.HTTPError, ValueError) as e:
+            logger.error(f"Error searching the web: {e}")
+            return {
+                "query": query,
+                "results": []
+            }
+
+        results = []
+        if data.get("AbstractURL"):
+            results.append({"title": data.get("Heading") or data.get("AbstractText", ""), "url": data["AbstractURL"]})
+        results.extend(_topic_results(data.get("Results", [])))
+        results.extend(_topic_results(data.get("RelatedTopics", [])))
+
         return {
             "query": query,
-            "results": []
-        }
\ No newline at end of file
+            "results": results
+        }
+
+    async def close(self) -> None:
+        """Close the shared HTTP client"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None